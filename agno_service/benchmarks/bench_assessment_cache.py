@@ -0,0 +1,44 @@
+"""
+Benchmark: four key board members assessing the same task, with and without
+the shared assessment cache
+
+Usage (from the repository root):
+    python -m agno_service.benchmarks.bench_assessment_cache
+"""
+import asyncio
+import logging
+import os
+import time
+
+from agno_service.benchmarks.bench_risk_matcher import ACTIONS
+from agno_service.workspace.risk_event_log import RISK_EVENT_LOG
+from agno_service.workspace.risk_management import ASSESSMENT_CACHE, RiskManagementFramework
+
+KEY_MEMBERS = ["CEO_Visionary", "CQO_Oracle", "CSO_Sentinel", "CRO_Guardian"]
+
+
+async def decide(frameworks, tasks):
+    for task in tasks:
+        for framework in frameworks:
+            await framework.assess_risk(task)
+
+
+def main(n: int = 10_000):
+    # Keep sampled assessment events out of the benchmark output
+    RISK_EVENT_LOG.path = os.devnull
+    logging.disable(logging.INFO)
+    frameworks = [RiskManagementFramework(name) for name in KEY_MEMBERS]
+    tasks = [{"action": ACTIONS[i % len(ACTIONS)], "context": {"amount": i % 20000}} for i in range(n)]
+
+    for label, maxsize in (("cache disabled", 0), ("cache enabled", ASSESSMENT_CACHE.maxsize or 4096)):
+        ASSESSMENT_CACHE.clear()
+        ASSESSMENT_CACHE.maxsize = maxsize
+        start = time.perf_counter()
+        asyncio.run(decide(frameworks, tasks))
+        elapsed = time.perf_counter() - start
+        print(f"{label:<16} {n / elapsed:>10,.0f} decisions/s  ({elapsed / n * 1e6:.1f} us per 4-member decision)")
+    print(ASSESSMENT_CACHE.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: time and memory per assessment for the previous hot path
+(validated pydantic model, always dumped to JSON for the log line) vs. the
+__slots__ AssessmentRecord
+
+Usage (from the repository root):
+    python -m agno_service.benchmarks.bench_assessment_record
+"""
+import json
+import time
+import tracemalloc
+
+from agno_service.workspace.risk_management import RiskManagementFramework, RiskCategory
+
+CATEGORY_SCORES = {RiskCategory.SECURITY: 6.0, RiskCategory.PRIVACY: 8.0}
+
+
+def before(framework):
+    """Previous hot path: validated model, serialized for the log line"""
+    model = framework._compose_assessment(CATEGORY_SCORES).to_model()
+    model.model_dump_json()
+    return model
+
+
+def after(framework):
+    """Record on the hot path, no validation or serialization"""
+    return framework._compose_assessment(CATEGORY_SCORES)
+
+
+def after_logged(framework):
+    """Record on the hot path, serialized because INFO logging is enabled"""
+    record = framework._compose_assessment(CATEGORY_SCORES)
+    json.dumps(record.to_dict())
+    return record
+
+
+def measure(label, fn, framework, n=50_000):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn(framework)
+    per_call_us = (time.perf_counter() - start) / n * 1e6
+
+    # Memory held by each retained assessment, and total allocated while building it
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    retained = [fn(framework) for _ in range(1000)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_object = (current - baseline) / len(retained)
+    print(f"{label:<34} {per_call_us:>7.2f} us/assessment  {per_object:>7.0f} bytes/assessment retained")
+
+
+def main():
+    framework = RiskManagementFramework("BENCH")
+    measure("before: pydantic + model_dump_json", before, framework)
+    measure("after: AssessmentRecord", after, framework)
+    measure("after: AssessmentRecord + json log", after_logged, framework)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: full-board vote via 11 separate assessments vs. one evaluate_board pass
+
+Usage (from the repository root):
+    python -m agno_service.benchmarks.bench_board_evaluation
+"""
+import asyncio
+import os
+import time
+
+from agno_service.benchmarks.bench_risk_matcher import ACTIONS
+from agno_service.workspace.board_evaluation import evaluate_board
+from agno_service.workspace.epic_doctrine import BOARD_ROLES
+from agno_service.workspace.risk_event_log import RISK_EVENT_LOG
+from agno_service.workspace.risk_management import RiskManagementFramework
+
+
+async def separate(frameworks, tasks):
+    for task in tasks:
+        assessments = [await framework.assess_risk(task) for framework in frameworks]
+        await frameworks[0].get_board_consensus(assessments)
+
+
+def single_pass(framework, tasks):
+    for task in tasks:
+        evaluate_board(framework, task).consensus()
+
+
+async def single(framework, tasks):
+    for task in tasks:
+        await framework.assess_risk(task)
+
+
+def main(n: int = 5_000):
+    # Keep sampled assessment events out of the benchmark output
+    RISK_EVENT_LOG.path = os.devnull
+    tasks = [{"action": ACTIONS[i % len(ACTIONS)], "context": {"amount": i}} for i in range(n)]
+    frameworks = [RiskManagementFramework(member) for member in BOARD_ROLES]
+
+    for label, run in (
+        ("one assessment", lambda: asyncio.run(single(frameworks[0], tasks))),
+        ("11 separate assessments", lambda: asyncio.run(separate(frameworks, tasks))),
+        ("evaluate_board (single pass)", lambda: single_pass(frameworks[0], tasks)),
+    ):
+        start = time.perf_counter()
+        run()
+        print(f"{label:<30} {(time.perf_counter() - start) / n * 1e6:>8.1f} us per task")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: cold start time and RSS, eager board vs lazy registry
+
+Each variant runs in a fresh interpreter so import costs and memory are
+measured from the same starting point:
+    eager   AgentFactory().create_board_of_directors(), as startup used to do
+    lazy    BoardRegistry only (what startup does before warm-up finishes)
+    warm    BoardRegistry plus the default BOARD_WARMUP subset
+
+Needs the service dependencies (phidata and the LLM client libraries); no
+LLM calls are made. DATABASE_URL may be unset.
+
+Usage (from the repository root):
+    python -m agno_service.benchmarks.bench_board_startup
+"""
+import json
+import subprocess
+import sys
+
+VARIANT = """
+import asyncio, json, time
+from agno_service.workspace.metrics import process_rss_bytes
+rss_start = process_rss_bytes()
+start = time.perf_counter()
+from agno_service.workspace.agent_factory import AgentFactory, BOARD_MEMBER_SPECS
+from agno_service.workspace.board_registry import BOARD_WARMUP, BoardRegistry, parse_warmup
+factory = AgentFactory()
+variant = {variant!r}
+if variant == "eager":
+    board = factory.create_board_of_directors()
+else:
+    board = BoardRegistry(factory.create_board_member, BOARD_MEMBER_SPECS)
+    if variant == "warm":
+        asyncio.run(board.warm_up(parse_warmup(BOARD_WARMUP, BOARD_MEMBER_SPECS)))
+ready = time.perf_counter() - start
+rss_ready = process_rss_bytes()
+built = len(board) if variant == "eager" else board.built_count
+print(json.dumps({{"ready": ready, "rss_start": rss_start, "rss_ready": rss_ready, "built": built}}))
+"""
+
+
+def run_variant(variant: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", VARIANT.format(variant=variant)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(rounds: int = 3):
+    print(f"{'variant':<8} {'members built':>13} {'ready (s)':>10} {'RSS (MB)':>9}")
+    for variant in ("eager", "lazy", "warm"):
+        runs = [run_variant(variant) for _ in range(rounds)]
+        best = min(runs, key=lambda r: r["ready"])
+        print(f"{variant:<8} {best['built']:>13} {best['ready']:>10.2f} {best['rss_ready'] / 2**20:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: time to first byte, blocking vs streamed board decisions
+
+A stub LLM stands in for the team: it "thinks" before its first token and
+then emits tokens at a fixed rate. The blocking path waits for the whole
+answer, as /board/decision does; the streamed path is the SSE generator
+behind /board/decision/stream.
+
+Usage (from the repository root):
+    python -m agno_service.benchmarks.bench_decision_ttfb
+"""
+import asyncio
+import os
+import statistics
+import time
+
+from agno_service.workspace.board_evaluation import evaluate_board
+from agno_service.workspace.board_events import board_decision_events, team_chunks
+from agno_service.workspace.risk_event_log import RISK_EVENT_LOG
+from agno_service.workspace.risk_management import RiskManagementFramework
+
+
+class StubLLMTeam:
+    def __init__(self, tokens: int, first_token_delay: float, token_interval: float):
+        self.tokens = tokens
+        self.first_token_delay = first_token_delay
+        self.token_interval = token_interval
+
+    async def _stream(self):
+        await asyncio.sleep(self.first_token_delay)
+        for n in range(self.tokens):
+            if n:
+                await asyncio.sleep(self.token_interval)
+            yield f"token{n} "
+
+    async def arun(self, query, stream=False):
+        return self._stream()
+
+    async def run(self, query):
+        return "".join([token async for token in self._stream()])
+
+
+async def never_disconnected():
+    return False
+
+
+async def run(rounds: int, team: StubLLMTeam):
+    framework = RiskManagementFramework("CEO_Visionary")
+    task = {"action": "read_file", "query": "summarise the quarterly report"}
+
+    async def decide():
+        evaluation = evaluate_board(framework, task)
+        approved, reason = evaluation.consensus()
+        return {
+            "approved": approved,
+            "reason": reason,
+            "risk_assessments": [a.to_dict() for a in evaluation.assessments],
+            "member_timings": [],
+        }
+
+    blocking, first_event, first_token, streamed_total = [], [], [], []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        decision = await decide()
+        await team.run(task["query"])
+        blocking.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        first_frame = first_chunk = None
+        async for frame in board_decision_events(
+            decide, lambda: team_chunks(team, task["query"]), lambda: False, never_disconnected
+        ):
+            now = time.perf_counter() - start
+            if first_frame is None:
+                first_frame = now
+            if first_chunk is None and frame.startswith("event: chunk"):
+                first_chunk = now
+        first_event.append(first_frame)
+        first_token.append(first_chunk)
+        streamed_total.append(time.perf_counter() - start)
+    assert decision["approved"]
+
+    def ms(samples):
+        return statistics.median(samples) * 1000
+
+    print(f"stub LLM: {team.tokens} tokens, {team.first_token_delay * 1000:.0f} ms to first, "
+          f"{team.token_interval * 1000:.0f} ms/token; {rounds} rounds, medians")
+    print(f"blocking   first byte         {ms(blocking):>10,.1f} ms")
+    print(f"streamed   first byte         {ms(first_event):>10,.1f} ms  (assessments + verdict)")
+    print(f"streamed   first team token   {ms(first_token):>10,.1f} ms")
+    print(f"streamed   complete           {ms(streamed_total):>10,.1f} ms")
+
+
+def main(rounds: int = 10):
+    RISK_EVENT_LOG.path = os.devnull
+    asyncio.run(run(rounds, StubLLMTeam(tokens=60, first_token_delay=0.4, token_interval=0.02)))
+
+
+if __name__ == "__main__":
+    main()
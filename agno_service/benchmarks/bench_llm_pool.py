@@ -0,0 +1,182 @@
+"""
+Benchmark: per-member clients vs shared pooled clients with provider limits
+
+A local HTTP stub plays the three provider APIs. Each provider allows a
+fixed number of concurrent requests and answers 429 above it, as the real
+APIs do under rate limits. A burst of decisions fans out to the 11 board
+members, each calling its provider:
+
+    unpooled   a client per member, no limits; 429s are retried with backoff
+    pooled     one client per provider, calls pass the provider's limiter
+
+Usage (from the repository root):
+    python -m agno_service.benchmarks.bench_llm_pool
+"""
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from agno_service.workspace.llm_pool import ANTHROPIC, GEMINI, OPENAI, ProviderPool
+
+# Providers of BOARD_MEMBER_SPECS (agent_factory needs phi to import)
+PROVIDER_BY_SEAT = {
+    "CEO": OPENAI, "CQO": OPENAI, "CTO": ANTHROPIC, "CSO": OPENAI, "CDO": GEMINI, "CRO": OPENAI,
+    "COO": OPENAI, "CINO": ANTHROPIC, "CCDO": GEMINI, "CPHO": OPENAI, "CXO": OPENAI,
+}
+
+PATHS = {
+    OPENAI: "/v1/chat/completions",
+    ANTHROPIC: "/v1/messages",
+    GEMINI: "/v1beta/models/gemini-1.5-flash:generateContent",
+}
+BODIES = {
+    OPENAI: {"choices": [{"message": {"role": "assistant", "content": "ok"}}], "usage": {"total_tokens": 600}},
+    ANTHROPIC: {"content": [{"type": "text", "text": "ok"}], "usage": {"input_tokens": 500, "output_tokens": 100}},
+    GEMINI: {"candidates": [{"content": {"parts": [{"text": "ok"}]}}]},
+}
+PROVIDER_BY_PATH = {path: provider for provider, path in PATHS.items()}
+
+
+class StubProviders(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, allowed, latency):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.allowed = allowed
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.in_flight = {provider: 0 for provider in PATHS}
+        self.reset()
+
+    def reset(self):
+        self.connections = 0
+        self.requests = 0
+        self.rejected = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        provider = PROVIDER_BY_PATH[self.path]
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            if server.in_flight[provider] >= server.allowed[provider]:
+                server.rejected += 1
+                rejected = True
+            else:
+                server.in_flight[provider] += 1
+                rejected = False
+        if rejected:
+            self._reply(429, {"error": {"type": "rate_limit_error"}})
+            return
+        try:
+            time.sleep(server.latency)
+            self._reply(200, BODIES[provider])
+        finally:
+            with server.lock:
+                server.in_flight[provider] -= 1
+
+
+async def call(client, url, provider, retries=6):
+    """One provider call, retried with exponential backoff on 429 like the SDKs"""
+    body = {"messages": [{"role": "user", "content": "x" * 2000}]}
+    for attempt in range(retries + 1):
+        response = await client.post(url + PATHS[provider], json=body)
+        if response.status_code != 429:
+            return response
+        await asyncio.sleep(0.05 * 2 ** attempt)
+    return response
+
+
+async def unpooled(url, decisions):
+    clients = {seat: httpx.AsyncClient(timeout=30) for seat in PROVIDER_BY_SEAT}
+    try:
+        await asyncio.gather(*(
+            call(clients[seat], url, provider)
+            for _ in range(decisions) for seat, provider in PROVIDER_BY_SEAT.items()
+        ))
+    finally:
+        await asyncio.gather(*(client.aclose() for client in clients.values()))
+
+
+async def pooled(url, decisions, pool):
+    client = pool.async_http_client()
+
+    async def limited(provider):
+        async with pool.limiter(provider).aslot(1000):
+            return await call(client, url, provider)
+
+    await asyncio.gather(*(
+        limited(provider) for _ in range(decisions) for provider in PROVIDER_BY_SEAT.values()
+    ))
+
+
+async def run(decisions: int, server: StubProviders):
+    limits = {
+        provider: {"max_concurrency": allowed, "rpm": 0, "tpm": 0}
+        for provider, allowed in server.allowed.items()
+    }
+    calls = decisions * len(PROVIDER_BY_SEAT)
+    print(f"{decisions} decisions x {len(PROVIDER_BY_SEAT)} members = {calls} calls; "
+          f"stub latency {server.latency * 1000:.0f} ms, concurrency allowed {server.allowed}")
+    print(f"{'':10}{'wall ms':>10}{'requests':>10}{'429s':>8}{'connections':>13}{'p95 queue ms':>14}")
+
+    for name in ("unpooled", "pooled"):
+        server.reset()
+        pool = ProviderPool(limits)
+        start = time.perf_counter()
+        if name == "unpooled":
+            await unpooled(server.url, decisions)
+        else:
+            await pooled(server.url, decisions, pool)
+        wall = time.perf_counter() - start
+        await pool.aclose()
+        waits = [
+            limiter.queue_wait.snapshot()["p95_ms"] or 0.0
+            for limiter in pool.limiters.values() if limiter.queue_wait.count
+        ]
+        p95 = f"{statistics.mean(waits):>14,.1f}" if waits else f"{'-':>14}"
+        print(f"{name:10}{wall * 1000:>10,.0f}{server.requests:>10}{server.rejected:>8}{server.connections:>13}{p95}")
+
+
+def main(decisions: int = 8):
+    server = StubProviders({OPENAI: 8, ANTHROPIC: 4, GEMINI: 4}, latency=0.05)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        asyncio.run(run(decisions, server))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: prompt tokens over a long member session, unbounded vs budgeted
+
+Each turn sends the doctrine system prompt, the member's history and a new
+question, and adds a question and a longer answer to the history. The
+unbounded prompt grows every turn; the budgeted one levels off at the
+model's budget. Assembly time is shown with the token-count cache cold
+(every message tokenized each turn) and warm.
+
+Usage (from the repository root):
+    python -m agno_service.benchmarks.bench_prompt_budget
+"""
+import statistics
+import time
+
+from agno_service.workspace.doctrine_prompt import DOCTRINE_PROMPT, tokenizer_for
+from agno_service.workspace.prompt_budget import PromptAssembler, TokenCounter
+
+MODEL = "gpt-4o"
+
+
+def main(turns: int = 60, budget: int = 8000):
+    prefix = "\n".join(DOCTRINE_PROMPT.instructions("CEO_Visionary"))
+    unbounded = PromptAssembler(default_budget=10 ** 9)
+    budgeted = PromptAssembler(default_budget=budget)
+    history, sent_unbounded, sent_budgeted = [], [], []
+    cold, warm = [], []
+    for n in range(turns):
+        question = f"Turn {n}: assess the attached proposal and summarise the risks. " * 3
+        _, report = unbounded.fit(MODEL, history, prefix=prefix, tail=question)
+        sent_unbounded.append(report.prompt_tokens)
+
+        start = time.perf_counter()
+        PromptAssembler(default_budget=budget, counter=TokenCounter()).fit(MODEL, history, prefix=prefix, tail=question)
+        cold.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        _, report = budgeted.fit(MODEL, history, prefix=prefix, tail=question)
+        warm.append(time.perf_counter() - start)
+        sent_budgeted.append(report.prompt_tokens)
+
+        history += [
+            {"role": "user", "content": question},
+            {"role": "assistant", "content": f"Assessment {n}: " + "the proposal carries moderate risk. " * 40},
+        ]
+
+    print(f"{turns} turns, {MODEL} ({tokenizer_for(MODEL)} tokenizer), budget {budget:,} tokens")
+    print(f"{'':11}{'last prompt':>13}{'total sent':>13}")
+    print(f"{'unbounded':11}{sent_unbounded[-1]:>13,}{sum(sent_unbounded):>13,}")
+    print(f"{'budgeted':11}{sent_budgeted[-1]:>13,}{sum(sent_budgeted):>13,}")
+    print(f"tokens saved {budgeted.tokens_saved:,} over {budgeted.trimmed} trimmed calls")
+    print(f"assembly, median: cold counts {statistics.median(cold) * 1000:.2f} ms, "
+          f"cached counts {statistics.median(warm) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
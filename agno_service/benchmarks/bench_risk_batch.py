@@ -0,0 +1,55 @@
+"""
+Benchmark: assess_risk_batch vs. awaiting assess_risk task by task
+
+Usage (from the repository root):
+    python -m agno_service.benchmarks.bench_risk_batch
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+
+from agno_service.benchmarks.bench_risk_matcher import ACTIONS
+from agno_service.workspace.risk_event_log import RISK_EVENT_LOG
+from agno_service.workspace.risk_management import RiskManagementFramework
+
+TARGET_TASKS_PER_SECOND = 100_000
+
+
+def make_tasks(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        {"action": rng.choice(ACTIONS), "context": {"amount": rng.choice([0, 500, 5000, 50000])}}
+        for _ in range(n)
+    ]
+
+
+async def scalar(framework, tasks):
+    for task in tasks:
+        await framework.assess_risk(task)
+
+
+def main(n: int = 200_000):
+    # Keep sampled assessment events out of the benchmark output
+    RISK_EVENT_LOG.path = os.devnull
+    logging.disable(logging.INFO)
+    tasks = make_tasks(n)
+    framework = RiskManagementFramework("BENCH")
+
+    sample = tasks[:20_000]
+    start = time.perf_counter()
+    asyncio.run(scalar(framework, sample))
+    scalar_rate = len(sample) / (time.perf_counter() - start)
+    print(f"{'assess_risk (scalar)':<24} {scalar_rate:>12,.0f} tasks/s")
+
+    start = time.perf_counter()
+    framework.assess_risk_batch(tasks)
+    batch_rate = n / (time.perf_counter() - start)
+    print(f"{'assess_risk_batch':<24} {batch_rate:>12,.0f} tasks/s")
+    print(f"speedup: {batch_rate / scalar_rate:.1f}x, target {TARGET_TASKS_PER_SECOND:,} tasks/s: "
+          f"{'met' if batch_rate >= TARGET_TASKS_PER_SECOND else 'MISSED'}")
+
+
+if __name__ == "__main__":
+    main()
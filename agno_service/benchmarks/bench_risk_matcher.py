@@ -0,0 +1,103 @@
+"""
+Microbenchmark: compiled keyword matcher vs. the original per-group scans
+
+Usage (from the repository root):
+    python -m agno_service.benchmarks.bench_risk_matcher
+"""
+import asyncio
+import os
+import random
+import time
+
+from agno_service.workspace.risk_event_log import RISK_EVENT_LOG
+from agno_service.workspace.risk_management import RiskManagementFramework
+
+ACTIONS = [
+    "read_file",
+    "transfer_funds",
+    "share_family_photos",
+    "sudo restart api gateway",
+    "bulk delete of stale admin tokens",
+    "wire crypto investment to external account",
+    "publish quarterly report",
+    "generate weekly summary for the operations dashboard",
+]
+
+
+def legacy_scores(action: str, context: dict) -> float:
+    """Score components exactly as the framework computed them before the matcher"""
+    score = 0.0
+    for keyword in ["sudo", "admin", "root", "password", "credential", "key", "token"]:
+        if keyword in action.lower():
+            score += 3.0
+    if any(word in action.lower() for word in ["delete", "remove", "modify", "override"]):
+        score += 2.0
+    if any(word in action.lower() for word in ["connect", "api", "webhook", "external"]):
+        score += 1.5
+    if any(keyword in action.lower() for keyword in ["payment", "transfer", "purchase", "invest"]):
+        amount = context.get("amount", 0)
+        if amount > 10000:
+            score += 5.0
+        elif amount > 1000:
+            score += 3.0
+        elif amount > 100:
+            score += 1.0
+        if any(word in action.lower() for word in ["wire", "crypto", "investment"]):
+            score += 2.0
+    if any(keyword in action.lower() for keyword in ["personal", "private", "family", "edward"]):
+        score += 8.0
+    if any(word in action.lower() for word in ["stop", "halt", "restart", "shutdown"]):
+        score += 3.0
+    if any(word in action.lower() for word in ["bulk", "mass", "all", "batch"]):
+        score += 1.5
+    if any(keyword in action.lower() for keyword in ["public", "publish", "share", "external"]):
+        score += 4.0
+    return score
+
+
+def compiled_scores(framework: RiskManagementFramework, action: str, context: dict) -> float:
+    """Score components through the compiled matcher"""
+    hits = framework.matcher.match(action.lower())
+    score = framework._assess_security_risk(hits, context)
+    if "financial_trigger" in hits:
+        score += framework._assess_financial_risk(hits, context, framework.rules.amount_tiers)
+    score += hits.get("privacy", 0.0)
+    score += framework._assess_operational_risk(hits, context)
+    score += hits.get("reputational", 0.0)
+    return score
+
+
+def run(label, fn, tasks):
+    start = time.perf_counter()
+    for action, context in tasks:
+        fn(action, context)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(tasks) / elapsed:>12,.0f} actions/s")
+    return elapsed
+
+
+def main(n: int = 200_000):
+    # Keep sampled assessment events out of the benchmark output
+    RISK_EVENT_LOG.path = os.devnull
+    rng = random.Random(42)
+    tasks = [(rng.choice(ACTIONS), {"amount": rng.choice([0, 500, 5000, 50000])}) for _ in range(n)]
+    framework = RiskManagementFramework("BENCH")
+
+    assert all(legacy_scores(a, c) == compiled_scores(framework, a, c) for a, c in tasks[:5000])
+
+    legacy = run("legacy keyword scans", legacy_scores, tasks)
+    compiled = run("compiled matcher", lambda a, c: compiled_scores(framework, a, c), tasks)
+    print(f"speedup: {legacy / compiled:.2f}x")
+
+    # Full assess_risk path (includes pydantic construction and logging)
+    async def full():
+        for action, context in tasks[:20_000]:
+            await framework.assess_risk({"action": action, "context": context})
+    start = time.perf_counter()
+    asyncio.run(full())
+    elapsed = time.perf_counter() - start
+    print(f"{'assess_risk (end to end)':<28} {20_000 / elapsed:>12,.0f} tasks/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: assistant storage reads per board decision, with and without
+the session cache
+
+A dict stands in for the `assistant_storage` table, with a fixed round-trip
+time per query. Each decision runs all 11 members the way Assistant.run
+uses its storage: read the session, append to the history, upsert (which
+reads the row back).
+
+Usage (from the repository root):
+    python -m agno_service.benchmarks.bench_session_cache
+"""
+import copy
+import time
+
+from agno_service.workspace.session_cache import SessionCache, SessionCachedStorage
+
+SEATS = ("CEO", "CQO", "CTO", "CSO", "CDO", "CRO", "COO", "CINO", "CCDO", "CPHO", "CXO")
+
+
+class Row:
+    def __init__(self, run_id, name):
+        self.run_id = run_id
+        self.name = name
+        self.memory = {"chat_history": []}
+
+
+class TableStorage:
+    """In-memory table with a simulated database round trip"""
+
+    def __init__(self, round_trip: float):
+        self.round_trip = round_trip
+        self.rows = {}
+        self.reads = 0
+        self.writes = 0
+
+    def read(self, run_id):
+        self.reads += 1
+        time.sleep(self.round_trip)
+        row = self.rows.get(run_id)
+        return copy.deepcopy(row) if row is not None else None
+
+    def upsert(self, row):
+        self.writes += 1
+        time.sleep(self.round_trip)
+        self.rows[row.run_id] = copy.deepcopy(row)
+        return self.read(run_id=row.run_id)
+
+
+class CachedTableStorage(SessionCachedStorage, TableStorage):
+    pass
+
+
+def decision(storage, n):
+    for seat in SEATS:
+        run_id = f"run-{seat}"
+        row = storage.read(run_id) or Row(run_id, seat)
+        # Ten history responses kept, as with num_history_responses=10
+        row.memory["chat_history"] = row.memory["chat_history"][-19:] + [
+            {"role": "user", "content": f"task {n}"},
+        ]
+        storage.upsert(row)
+
+
+def main(decisions: int = 50, round_trip: float = 0.002):
+    print(f"{decisions} decisions x {len(SEATS)} members, {round_trip * 1000:.1f} ms per database query")
+    print(f"{'':8}{'reads/decision':>16}{'writes/decision':>17}{'ms/decision':>13}")
+    for name, cache in (("off", SessionCache(maxsize=0)), ("on", SessionCache(maxsize=512))):
+        storage = CachedTableStorage(round_trip, session_cache=cache)
+        start = time.perf_counter()
+        for n in range(decisions):
+            decision(storage, n)
+        elapsed = time.perf_counter() - start
+        print(f"{name:8}{storage.reads / decisions:>16.1f}{storage.writes / decisions:>17.1f}"
+              f"{elapsed / decisions * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
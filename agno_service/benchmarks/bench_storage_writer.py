@@ -0,0 +1,82 @@
+"""
+Benchmark: member run-state writes, synchronous upserts vs write-behind
+
+A dict stands in for the `assistant_storage` table. Each transaction costs
+a fixed commit time plus a little per row, and commits are serialized the
+way row locks and WAL flushes serialize small transactions. Concurrent
+decisions each run all 11 members, and each member upserts its run state
+after its run.
+
+Usage (from the repository root):
+    python -m agno_service.benchmarks.bench_storage_writer
+"""
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agno_service.workspace.storage_writer import WriteBehindStorage
+
+SEATS = ("CEO", "CQO", "CTO", "CSO", "CDO", "CRO", "COO", "CINO", "CCDO", "CPHO", "CXO")
+
+
+class Row:
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.memory = {"chat_history": []}
+
+
+class TableStorage:
+    def __init__(self, commit_time: float, row_time: float):
+        self.commit_time = commit_time
+        self.row_time = row_time
+        self.rows = {}
+        self.transactions = 0
+        self._commit = threading.Lock()
+
+    def read(self, run_id):
+        return self.rows.get(run_id)
+
+    def upsert(self, row):
+        self.write_batch([row])
+        return row
+
+    def write_batch(self, rows):
+        with self._commit:
+            time.sleep(self.commit_time + self.row_time * len(rows))
+            self.transactions += 1
+            for row in rows:
+                self.rows[row.run_id] = row
+
+
+class WriteBehindTableStorage(WriteBehindStorage, TableStorage):
+    def write_batch(self, rows):
+        TableStorage.write_batch(self, rows)
+
+
+def decision(storage, n):
+    """Request-path time spent persisting one decision's member runs"""
+    start = time.perf_counter()
+    for seat in SEATS:
+        row = Row(f"run-{seat}-{n % 8}")
+        row.memory["chat_history"].append({"role": "user", "content": f"task {n}"})
+        storage.upsert(row)
+    return time.perf_counter() - start
+
+
+def main(decisions: int = 200, concurrency: int = 8, commit_time: float = 0.002, row_time: float = 0.0001):
+    print(f"{decisions} decisions x {len(SEATS)} members, {concurrency} concurrent; "
+          f"{commit_time * 1000:.1f} ms per commit + {row_time * 1000:.2f} ms per row")
+    print(f"{'':14}{'p50 ms':>9}{'p95 ms':>9}{'transactions':>14}{'rows merged':>13}")
+    for name, enabled in (("synchronous", False), ("write-behind", True)):
+        storage = WriteBehindTableStorage(commit_time, row_time, write_behind=enabled)
+        with ThreadPoolExecutor(concurrency) as pool:
+            samples = list(pool.map(lambda n: decision(storage, n), range(decisions)))
+        storage.write_behind.stop()
+        p50 = statistics.median(samples) * 1000
+        p95 = statistics.quantiles(samples, n=20)[-1] * 1000
+        print(f"{name:14}{p50:>9.2f}{p95:>9.2f}{storage.transactions:>14}{storage.write_behind.merged:>13}")
+
+
+if __name__ == "__main__":
+    main()
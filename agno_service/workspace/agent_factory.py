@@ -1,29 +1,270 @@
 from phi.assistant import Assistant
+from phi.memory.assistant import AssistantMemory
 from phi.llm.openai import OpenAIChat
-from phi.llm.anthropic import Anthropic
+from phi.llm.anthropic import Claude
 from phi.llm.google import Gemini
 from phi.storage.assistant.postgres import PgAssistantStorage
 from phi.knowledge.pdf import PDFUrlKnowledgeBase
 from phi.vectordb.pgvector import PgVector
 from phi.embedder.openai import OpenAIEmbedder
-from typing import List, Dict, Optional
+from sqlalchemy.dialects import postgresql
+from typing import Any, Callable, ClassVar, List, Dict, Optional
 import os
 import logging
 
-from .epic_doctrine import EPIC_DOCTRINE, BOARD_ROLES
+from .doctrine_prompt import DOCTRINE_PROMPT
+from .llm_pool import (
+    ANTHROPIC, GEMINI, LLM_POOL, OPENAI, PooledAsyncLLM, PooledLLM, PooledStreamManagerLLM
+)
+from .prompt_budget import PROMPT_ASSEMBLER, PROMPT_RUN, prompt_run
+from .session_cache import SessionCachedStorage
+from .storage_writer import WriteBehindStorage
 from .risk_management import RiskManagementFramework
 from .tools.mcp_tools import MCPToolkit
 from .tools.donna_tools import DonnaProtectionTools
 
 logger = logging.getLogger(__name__)
 
+# Board seats in order: seat key -> create_epic_agent arguments
+BOARD_MEMBER_SPECS: Dict[str, Dict] = {
+    # CEO - The Visionary
+    "CEO": {
+        "name": "CEO_Visionary",
+        "role": "Strategic Leader & Edward's Primary Representative",
+        "model_id": "gpt-4o",
+        "specific_instructions": [
+            "You are the leader of the board and Edward's primary AI representative",
+            "Make strategic decisions that advance Edward's long-term interests",
+            "You have veto power over major decisions",
+            "Balance innovation with family security"
+        ]
+    },
+    # CQO - The Oracle
+    "CQO": {
+        "name": "CQO_Oracle",
+        "role": "Quality Assurance & MCP Verification Specialist",
+        "model_id": "gpt-4o",
+        "specific_instructions": [
+            "You are responsible for verifying ALL capability claims through MCP",
+            "Never allow unverified capabilities to be claimed",
+            "You have veto power over any unverified actions",
+            "Maintain the highest standards of accuracy and truth"
+        ]
+    },
+    # CTO - The Architect
+    "CTO": {
+        "name": "CTO_Architect", 
+        "role": "Technical Architecture & Implementation Lead",
+        "model_id": "claude-3-5-sonnet-20241022",
+        "use_anthropic": True,
+        "specific_instructions": [
+            "Design and oversee technical implementations",
+            "Ensure all systems are secure, scalable, and maintainable",
+            "Focus on open-source solutions and proven technologies",
+            "Coordinate with CSO on security architecture"
+        ]
+    },
+    # CSO - The Sentinel
+    "CSO": {
+        "name": "CSO_Sentinel",
+        "role": "Security Guardian & Threat Analyst",
+        "model_id": "gpt-4o",
+        "specific_instructions": [
+            "You are the primary security guardian with veto power",
+            "Assess all actions for security implications",
+            "Protect Edward and family's digital assets and privacy",
+            "Immediately flag and block any suspicious activities"
+        ]
+    },
+    # CDO - The Alchemist
+    "CDO": {
+        "name": "CDO_Alchemist",
+        "role": "Data Transformation & Insights Specialist",
+        "model_id": "gemini-2.0-flash-exp",
+        "use_gemini": True,
+        "specific_instructions": [
+            "Transform raw data into actionable insights",
+            "Ensure data privacy and sovereignty",
+            "Create valuable analysis for Edward's decision-making",
+            "Maintain strict data governance standards"
+        ]
+    },
+    # CRO - The Guardian
+    "CRO": {
+        "name": "CRO_Guardian",
+        "role": "Risk Assessment & Mitigation Expert",
+        "model_id": "gpt-4o",
+        "specific_instructions": [
+            "You have veto power over high-risk actions",
+            "Assess all proposals for potential risks",
+            "Develop and enforce risk mitigation strategies",
+            "Prioritize family safety and asset protection"
+        ]
+    },
+    # COO - The Orchestrator
+    "COO": {
+        "name": "COO_Orchestrator",
+        "role": "Operational Excellence & Workflow Optimization",
+        "model_id": "gpt-4o-mini",
+        "specific_instructions": [
+            "Optimize operational workflows and efficiency",
+            "Coordinate between board members",
+            "Ensure smooth execution of approved plans",
+            "Monitor system performance and resource usage"
+        ]
+    },
+    # CINO - The Pioneer
+    "CINO": {
+        "name": "CINO_Pioneer",
+        "role": "Innovation Scout & Emerging Tech Analyst",
+        "model_id": "claude-3-5-haiku-20241022",
+        "use_anthropic": True,
+        "specific_instructions": [
+            "Scout emerging technologies and innovations",
+            "Propose innovative solutions to challenges",
+            "Balance innovation with security and practicality",
+            "Research new opportunities for Edward's benefit"
+        ]
+    },
+    # CCDO - The Diplomat
+    "CCDO": {
+        "name": "CCDO_Diplomat",
+        "role": "External Relations & Partnership Manager",
+        "model_id": "gemini-1.5-flash",
+        "use_gemini": True,
+        "specific_instructions": [
+            "Manage external communications and partnerships",
+            "Protect Edward's reputation and interests",
+            "Negotiate favorable terms in all dealings",
+            "Maintain professional relationships"
+        ]
+    },
+    # CPHO - The Sage
+    "CPHO": {
+        "name": "CPHO_Sage",
+        "role": "Ethical Guidance & Philosophical Advisor",
+        "model_id": "gpt-4o",
+        "specific_instructions": [
+            "Provide ethical guidance on all decisions",
+            "Ensure actions align with Edward's values",
+            "Consider long-term philosophical implications",
+            "Guide the board toward wise decisions"
+        ]
+    },
+    # CXO - The Catalyst
+    "CXO": {
+        "name": "CXO_Catalyst",
+        "role": "Cross-functional Innovation & Wild Card",
+        "model_id": "gpt-4o-mini",
+        "specific_instructions": [
+            "Serve as a creative catalyst for the board",
+            "Think outside conventional boundaries",
+            "Connect disparate ideas and opportunities",
+            "Challenge assumptions while respecting doctrine"
+        ]
+    },
+}
+
+class PooledOpenAIChat(PooledAsyncLLM, OpenAIChat):
+    pool_provider: ClassVar[str] = OPENAI
+
+
+class PooledAnthropic(PooledStreamManagerLLM, Claude):
+    pool_provider: ClassVar[str] = ANTHROPIC
+
+
+class PooledGemini(PooledLLM, Gemini):
+    pool_provider: ClassVar[str] = GEMINI
+
+
+# AssistantRun fields written on every upsert
+RUN_COLUMNS = (
+    "name", "run_name", "user_id", "llm", "memory",
+    "assistant_data", "run_data", "user_data", "task_data"
+)
+
+
+class CachedPgAssistantStorage(SessionCachedStorage, WriteBehindStorage, PgAssistantStorage):
+    """PgAssistantStorage with recent sessions served from memory and batched writes"""
+
+    def write_batch(self, rows):
+        """Upsert many runs in one transaction"""
+        values = [dict({column: getattr(row, column) for column in RUN_COLUMNS}, run_id=row.run_id) for row in rows]
+        stmt = postgresql.insert(self.table).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["run_id"],
+            set_={column: stmt.excluded[column] for column in RUN_COLUMNS}
+        )
+        try:
+            with self.Session() as sess, sess.begin():
+                sess.execute(stmt)
+        except Exception:
+            # Create the table and try again, as PgAssistantStorage.upsert does
+            self.create()
+            with self.Session() as sess, sess.begin():
+                sess.execute(stmt)
+
+
+class BudgetedAssistantMemory(AssistantMemory):
+    """Assistant memory whose history window is fitted to the prompt token budget"""
+    _fit_history: Optional[Callable[[List[Any]], List[Any]]] = None
+
+    def get_last_n_messages_starting_from_the_user_message(self, last_n: Optional[int] = None):
+        messages = super().get_last_n_messages_starting_from_the_user_message(last_n)
+        return self._fit_history(messages) if self._fit_history is not None else messages
+
+
 class DoctrineCompliantAssistant(Assistant):
     """Extended Assistant class with EPIC doctrine compliance"""
+    risk_framework: Optional[Any] = None
     
     def __init__(self, *args, **kwargs):
-        # Extract risk framework if provided
-        self.risk_framework = kwargs.pop('risk_framework', None)
+        kwargs.setdefault("memory", BudgetedAssistantMemory())
         super().__init__(*args, **kwargs)
+        if isinstance(self.memory, BudgetedAssistantMemory):
+            self.memory._fit_history = self.fit_history
+    
+    def get_system_prompt(self) -> Optional[str]:
+        # Built just before the history is added; kept whole when fitting the budget
+        system_prompt = super().get_system_prompt()
+        run = PROMPT_RUN.get()
+        if run is not None:
+            run.prefix = system_prompt or ""
+        return system_prompt
+    
+    # Each run fits its prompt in its own PromptRun: the assistant is shared
+    # by concurrent requests. Wrap a run in prompt_run() to read its report.
+    def _run(self, message=None, *, stream: bool = True, messages=None, **kwargs):
+        with prompt_run(messages or message):
+            yield from super()._run(message, stream=stream, messages=messages, **kwargs)
+    
+    async def _arun(self, message=None, *, stream: bool = True, messages=None, **kwargs):
+        with prompt_run(messages or message):
+            async for chunk in super()._arun(message, stream=stream, messages=messages, **kwargs):
+                yield chunk
+    
+    def fit_history(self, history: List[Any]) -> List[Any]:
+        """Newest history that fits the model's budget beside the system prompt, tools and message"""
+        if self.llm is None:
+            return history
+        run = PROMPT_RUN.get()
+        kept, report = PROMPT_ASSEMBLER.fit(
+            self.llm.model,
+            history,
+            prefix=run.prefix if run is not None else "",
+            tools=self.llm.get_tools_for_api(),
+            tail=run.tail if run is not None else None
+        )
+        if run is not None:
+            run.record(report)
+        if report.dropped_messages:
+            logger.info(
+                f"{self.name}: dropped {report.dropped_messages} history messages, "
+                f"saved {report.tokens_saved} prompt tokens"
+            )
+        if report.over_budget:
+            logger.warning(f"{self.name}: prompt without history exceeds the {report.budget}-token budget")
+        return kept
     
     async def assess_risk(self, task: dict):
         """Risk assessment method for doctrine compliance"""
@@ -47,8 +288,8 @@ class AgentFactory:
         self.mcp_toolkit = MCPToolkit()
         self.donna_tools = DonnaProtectionTools()
         
-        # Storage for assistant memory
-        self.storage = PgAssistantStorage(
+        # Storage for assistant memory, shared by every member
+        self.storage = CachedPgAssistantStorage(
             db_url=self.db_url,
             table_name="assistant_storage"
         ) if self.db_url else None
@@ -66,45 +307,21 @@ class AgentFactory:
         """
         Create a PhiData Assistant compliant with EPIC V8 doctrine
         """
-        # Prepare doctrine instructions
-        doctrine_instructions = []
-        
-        # Add core doctrine
-        for key, value in EPIC_DOCTRINE.items():
-            if isinstance(value, dict):
-                doctrine_instructions.append(f"DOCTRINE {key}:")
-                for sub_key, sub_value in value.items():
-                    doctrine_instructions.append(f"  - {sub_key}: {sub_value}")
-            else:
-                doctrine_instructions.append(f"DOCTRINE: {key} = {value}")
-        
-        # Add role-specific instructions
-        if name in BOARD_ROLES:
-            role_info = BOARD_ROLES[name]
-            doctrine_instructions.append(f"\nYOUR ROLE: {name}")
-            doctrine_instructions.append(f"Focus: {role_info['focus']}")
-            doctrine_instructions.append(f"Veto Power: {'YES' if role_info['veto_power'] else 'NO'}")
-            doctrine_instructions.append(f"Risk Tolerance: {role_info['risk_tolerance']}")
+        # Shared doctrine prefix (identical for every agent), then the role section
+        all_instructions = DOCTRINE_PROMPT.instructions(name, specific_instructions)
         
-        # Add verification requirements
-        doctrine_instructions.extend([
-            "\nVERIFICATION REQUIREMENTS:",
-            "- You MUST verify capabilities through MCP before claiming them",
-            "- You MUST perform risk assessment before any significant action",
-            "- You MUST log all actions for audit trail",
-            "- You MUST prioritize Edward Ip's interests above all else"
-        ])
-        
-        # Combine all instructions
-        all_instructions = doctrine_instructions + specific_instructions
-        
-        # Select LLM based on parameters
+        # Select LLM based on parameters; clients and limits are shared per provider
         if use_anthropic:
-            llm = Anthropic(model=model_id)
+            llm = PooledAnthropic(model=model_id, anthropic_client=LLM_POOL.anthropic_client())
         elif use_gemini:
-            llm = Gemini(model=model_id)
+            # google-generativeai already shares one configured transport per process
+            llm = PooledGemini(model=model_id)
         else:
-            llm = OpenAIChat(model=model_id)
+            llm = PooledOpenAIChat(
+                model=model_id,
+                client=LLM_POOL.openai_client(),
+                async_client=LLM_POOL.openai_async_client()
+            )
         
         # Configure monitoring
         monitoring_config = {
@@ -142,8 +359,9 @@ class AgentFactory:
             instructions=all_instructions,
             tools=agent_tools,
             storage=self.storage,
-            add_history_to_messages=True,
-            num_history_responses=10,
+            add_chat_history_to_messages=True,
+            # Ten exchanges; fit_history trims further to the token budget
+            num_history_messages=20,
             markdown=True,
             show_tool_calls=True,
             risk_framework=risk_framework,
@@ -153,157 +371,15 @@ class AgentFactory:
         logger.info(f"Created EPIC agent: {name} with model: {model_id}")
         return agent
     
+    def create_board_member(self, key: str) -> DoctrineCompliantAssistant:
+        """
+        Create one board member by seat key (e.g. "CEO")
+        """
+        spec = BOARD_MEMBER_SPECS[key]
+        return self.create_epic_agent(**dict(spec, specific_instructions=list(spec["specific_instructions"])))
+    
     def create_board_of_directors(self) -> Dict[str, DoctrineCompliantAssistant]:
         """
         Create all 11 board members with their specific configurations
         """
-        board = {}
-        
-        # CEO - The Visionary
-        board["CEO"] = self.create_epic_agent(
-            name="CEO_Visionary",
-            role="Strategic Leader & Edward's Primary Representative",
-            model_id="gpt-4o",
-            specific_instructions=[
-                "You are the leader of the board and Edward's primary AI representative",
-                "Make strategic decisions that advance Edward's long-term interests",
-                "You have veto power over major decisions",
-                "Balance innovation with family security"
-            ]
-        )
-        
-        # CQO - The Oracle  
-        board["CQO"] = self.create_epic_agent(
-            name="CQO_Oracle",
-            role="Quality Assurance & MCP Verification Specialist",
-            model_id="gpt-4o",
-            specific_instructions=[
-                "You are responsible for verifying ALL capability claims through MCP",
-                "Never allow unverified capabilities to be claimed",
-                "You have veto power over any unverified actions",
-                "Maintain the highest standards of accuracy and truth"
-            ]
-        )
-        
-        # CTO - The Architect
-        board["CTO"] = self.create_epic_agent(
-            name="CTO_Architect", 
-            role="Technical Architecture & Implementation Lead",
-            model_id="claude-3-5-sonnet-20241022",
-            use_anthropic=True,
-            specific_instructions=[
-                "Design and oversee technical implementations",
-                "Ensure all systems are secure, scalable, and maintainable",
-                "Focus on open-source solutions and proven technologies",
-                "Coordinate with CSO on security architecture"
-            ]
-        )
-        
-        # CSO - The Sentinel
-        board["CSO"] = self.create_epic_agent(
-            name="CSO_Sentinel",
-            role="Security Guardian & Threat Analyst",
-            model_id="gpt-4o",
-            specific_instructions=[
-                "You are the primary security guardian with veto power",
-                "Assess all actions for security implications",
-                "Protect Edward and family's digital assets and privacy",
-                "Immediately flag and block any suspicious activities"
-            ]
-        )
-        
-        # CDO - The Alchemist
-        board["CDO"] = self.create_epic_agent(
-            name="CDO_Alchemist",
-            role="Data Transformation & Insights Specialist",
-            model_id="gemini-2.0-flash-exp",
-            use_gemini=True,
-            specific_instructions=[
-                "Transform raw data into actionable insights",
-                "Ensure data privacy and sovereignty",
-                "Create valuable analysis for Edward's decision-making",
-                "Maintain strict data governance standards"
-            ]
-        )
-        
-        # CRO - The Guardian
-        board["CRO"] = self.create_epic_agent(
-            name="CRO_Guardian",
-            role="Risk Assessment & Mitigation Expert",
-            model_id="gpt-4o",
-            specific_instructions=[
-                "You have veto power over high-risk actions",
-                "Assess all proposals for potential risks",
-                "Develop and enforce risk mitigation strategies",
-                "Prioritize family safety and asset protection"
-            ]
-        )
-        
-        # COO - The Orchestrator
-        board["COO"] = self.create_epic_agent(
-            name="COO_Orchestrator",
-            role="Operational Excellence & Workflow Optimization",
-            model_id="gpt-4o-mini",
-            specific_instructions=[
-                "Optimize operational workflows and efficiency",
-                "Coordinate between board members",
-                "Ensure smooth execution of approved plans",
-                "Monitor system performance and resource usage"
-            ]
-        )
-        
-        # CINO - The Pioneer
-        board["CINO"] = self.create_epic_agent(
-            name="CINO_Pioneer",
-            role="Innovation Scout & Emerging Tech Analyst",
-            model_id="claude-3-5-haiku-20241022",
-            use_anthropic=True,
-            specific_instructions=[
-                "Scout emerging technologies and innovations",
-                "Propose innovative solutions to challenges",
-                "Balance innovation with security and practicality",
-                "Research new opportunities for Edward's benefit"
-            ]
-        )
-        
-        # CCDO - The Diplomat
-        board["CCDO"] = self.create_epic_agent(
-            name="CCDO_Diplomat",
-            role="External Relations & Partnership Manager",
-            model_id="gemini-1.5-flash",
-            use_gemini=True,
-            specific_instructions=[
-                "Manage external communications and partnerships",
-                "Protect Edward's reputation and interests",
-                "Negotiate favorable terms in all dealings",
-                "Maintain professional relationships"
-            ]
-        )
-        
-        # CPHO - The Sage
-        board["CPHO"] = self.create_epic_agent(
-            name="CPHO_Sage",
-            role="Ethical Guidance & Philosophical Advisor",
-            model_id="gpt-4o",
-            specific_instructions=[
-                "Provide ethical guidance on all decisions",
-                "Ensure actions align with Edward's values",
-                "Consider long-term philosophical implications",
-                "Guide the board toward wise decisions"
-            ]
-        )
-        
-        # CXO - The Catalyst
-        board["CXO"] = self.create_epic_agent(
-            name="CXO_Catalyst",
-            role="Cross-functional Innovation & Wild Card",
-            model_id="gpt-4o-mini",
-            specific_instructions=[
-                "Serve as a creative catalyst for the board",
-                "Think outside conventional boundaries",
-                "Connect disparate ideas and opportunities",
-                "Challenge assumptions while respecting doctrine"
-            ]
-        )
-        
-        return board
\ No newline at end of file
+        return {key: self.create_board_member(key) for key in BOARD_MEMBER_SPECS}
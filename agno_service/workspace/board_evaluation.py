@@ -0,0 +1,109 @@
+"""
+Single-pass risk evaluation for the whole board
+
+Every board member runs the same deterministic rules, so a full-board vote
+only needs one scoring pass. Per-role verdicts then come from threshold
+tables precomputed from BOARD_ROLES, making an 11-member vote about as cheap
+as a single assessment. Veto holders are VETO_AGENTS rather than the
+BOARD_ROLES veto_power flags, so the CEO does not veto here either and
+consensus() keeps matching get_board_consensus.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .epic_doctrine import BOARD_ROLES
+from .risk_management import (
+    APPROVAL_THRESHOLD,
+    VETO_AGENTS,
+    AssessmentRecord,
+    RiskLevel,
+    RiskManagementFramework,
+)
+
+# Never reached by any RiskLevel value
+_NO_VETO = np.iinfo(np.uint8).max
+
+
+class RoleTables:
+    """Per-role thresholds for a fixed set of board members, as arrays"""
+
+    def __init__(self, members: Sequence[str]):
+        self.members: Tuple[str, ...] = tuple(members)
+        # Highest level a member still votes to approve (consensus rule)
+        self.approve_max = np.full(len(self.members), RiskLevel.MEDIUM.value, dtype=np.uint8)
+        # Lowest level at which a member vetoes the decision
+        self.veto_min = np.array(
+            [RiskLevel.HIGH.value if member in VETO_AGENTS else _NO_VETO for member in self.members],
+            dtype=np.uint8
+        )
+        # Highest level within the member's own risk tolerance
+        self.tolerance = np.array(
+            [RiskLevel[BOARD_ROLES.get(member, {}).get("risk_tolerance", "MEDIUM")].value for member in self.members],
+            dtype=np.uint8
+        )
+
+
+BOARD_TABLES = RoleTables(BOARD_ROLES)
+
+
+class BoardEvaluation:
+    """All per-role verdicts for one task"""
+
+    def __init__(self, assessments: List[AssessmentRecord], tables: RoleTables):
+        self.assessments = assessments
+        self.tables = tables
+        level = np.uint8(assessments[0].risk_level.value) if assessments else np.uint8(0)
+        self.approves = level <= tables.approve_max
+        self.vetoes = level >= tables.veto_min
+        self.within_tolerance = level <= tables.tolerance
+
+    def verdicts(self) -> Dict[str, Dict]:
+        return {
+            member: {
+                "approves": bool(self.approves[i]),
+                "vetoes": bool(self.vetoes[i]),
+                "within_tolerance": bool(self.within_tolerance[i]),
+            }
+            for i, member in enumerate(self.tables.members)
+        }
+
+    def consensus(self) -> Tuple[bool, str]:
+        """Same answer as get_board_consensus(self.assessments), from the verdict arrays"""
+        vetoes = np.flatnonzero(self.vetoes)
+        if vetoes.size:
+            assessment = self.assessments[vetoes[0]]
+            return False, f"VETO by {assessment.assessed_by}: {assessment.cons[0] if assessment.cons else 'High risk detected'}"
+
+        approval_votes = int(self.approves.sum())
+        total_members = len(self.assessments)
+        if approval_votes >= APPROVAL_THRESHOLD:
+            return True, f"Board approval granted ({approval_votes}/{total_members} votes)"
+        return False, f"Insufficient board approval ({approval_votes}/{total_members} votes required: 7/11)"
+
+
+def evaluate_board(
+    framework: RiskManagementFramework,
+    task: Dict,
+    tables: Optional[RoleTables] = None
+) -> BoardEvaluation:
+    """
+    Score the task once with the framework's rules and produce one assessment
+    per board member, in board order. The assessments can be passed straight
+    to get_board_consensus. The single scoring pass is recorded once, as the
+    framework's own member, in its history and the risk event log.
+    """
+    tables = tables or BOARD_TABLES
+    category_scores, prototype, _ = framework._evaluate(task)
+    assessed_at = datetime.utcnow()
+    assessments = [
+        prototype.copy(assessed_by=member, assessment_timestamp=assessed_at)
+        for member in tables.members
+    ]
+    own = next(
+        (assessment for assessment in assessments if assessment.assessed_by == framework.agent_name),
+        None
+    ) or prototype.copy(assessed_by=framework.agent_name, assessment_timestamp=assessed_at)
+    framework.record(own, category_scores)
+    return BoardEvaluation(assessments, tables)
@@ -0,0 +1,131 @@
+"""
+Server-sent events for streamed board decisions
+
+The risk assessments and the board's verdict are sent as soon as consensus
+is reached, then the team's answer follows chunk by chunk as it is
+generated. The stream stops early, cancelling the team run, when the client
+disconnects or an Edward Override HALT arrives.
+"""
+import asyncio
+import inspect
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# How often a slow team run is interrupted to check for HALT or disconnect
+STOP_POLL_INTERVAL = 0.1
+
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """One SSE frame; data is JSON-encoded on a single line"""
+    frame = f"event: {event}\n"
+    if event_id is not None:
+        frame += f"id: {event_id}\n"
+    return frame + f"data: {json.dumps(data, default=str)}\n\n"
+
+
+def chunk_text(chunk: Any) -> str:
+    """Text of a streamed chunk (phidata RunResponse, dict or plain string)"""
+    if isinstance(chunk, str):
+        return chunk
+    content = getattr(chunk, "content", None)
+    if content is None and isinstance(chunk, dict):
+        content = chunk.get("content")
+    return "" if content is None else str(content)
+
+
+async def team_chunks(team, query: str) -> AsyncIterator[str]:
+    """Stream a team's answer; teams without streaming yield it whole"""
+    if hasattr(team, "arun"):
+        result = team.arun(query, stream=True)
+        if inspect.isawaitable(result):
+            result = await result
+        if hasattr(result, "__aiter__"):
+            try:
+                async for chunk in result:
+                    text = chunk_text(chunk)
+                    if text:
+                        yield text
+            finally:
+                # Closing this generator early must stop the model stream too
+                if hasattr(result, "aclose"):
+                    await result.aclose()
+            return
+    else:
+        result = await team.run(query)
+    text = chunk_text(result)
+    if text:
+        yield text
+
+
+async def board_decision_events(
+    decide: Callable[[], Awaitable[Dict]],
+    chunks: Callable[[], AsyncIterator[str]],
+    is_halted: Callable[[], bool],
+    is_disconnected: Callable[[], Awaitable[bool]],
+    poll_interval: float = STOP_POLL_INTERVAL
+) -> AsyncIterator[str]:
+    """
+    SSE frames for one board decision.
+
+    decide() returns {"approved", "reason", "risk_assessments", "member_timings"};
+    chunks() streams the team's answer and is only started once approved.
+    Events: assessments, verdict, then chunk* and finally done, rejected or halted.
+    """
+    event_id = 0
+
+    def frame(event: str, data: Any) -> str:
+        nonlocal event_id
+        event_id += 1
+        return format_sse(event, data, event_id)
+
+    decision = await decide()
+    yield frame("assessments", {
+        "risk_assessments": decision["risk_assessments"],
+        "member_timings": decision.get("member_timings", []),
+    })
+    yield frame("verdict", {
+        "approved": decision["approved"],
+        "reason": decision["reason"],
+        "execution_plan": decision.get("execution_plan"),
+    })
+    if not decision["approved"]:
+        yield frame("rejected", {"reason": decision["reason"]})
+        return
+
+    stream = chunks().__aiter__()
+    pending: Optional[asyncio.Future] = None
+    chunk_count = 0
+    try:
+        while True:
+            if is_halted():
+                yield frame("halted", {"reason": "System halted by Edward Override", "chunks": chunk_count})
+                return
+            if await is_disconnected():
+                logger.info("Client disconnected from board decision stream")
+                return
+            if pending is None:
+                pending = asyncio.ensure_future(stream.__anext__())
+            done, _ = await asyncio.wait({pending}, timeout=poll_interval)
+            if not done:
+                continue
+            try:
+                text = pending.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                if done:
+                    pending = None
+            chunk_count += 1
+            yield frame("chunk", {"text": text})
+    finally:
+        # Stop the team run on any early exit, including the client going away
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        if hasattr(stream, "aclose"):
+            await stream.aclose()
+
+    yield frame("done", {"chunks": chunk_count})
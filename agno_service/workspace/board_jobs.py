@@ -0,0 +1,245 @@
+"""
+Queued board decisions with a bounded worker pool
+
+POST /board/jobs hands a task to this queue and returns a job ID at once;
+a fixed number of workers run the assessment and team execution, so a burst
+of submissions waits in a queue of limited depth instead of holding HTTP
+connections. A full queue is refused (HTTP 429). Job state is kept in
+process and mirrored to Redis, so any uvicorn worker can answer a poll.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+from .metrics import LatencyRegistry
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("BOARD_JOB_WORKERS", "4"))
+JOB_QUEUE_DEPTH = int(os.getenv("BOARD_JOB_QUEUE_DEPTH", "100"))
+# Finished jobs kept in process, and how long their state stays in Redis
+JOB_RETENTION = int(os.getenv("BOARD_JOB_RETENTION", "1000"))
+JOB_TTL = int(os.getenv("BOARD_JOB_TTL", "3600"))
+JOB_PREFIX = "board_job:"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+REJECTED = "rejected"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, REJECTED, FAILED, CANCELLED)
+# Job status by outcome status code; anything else is a board rejection
+OUTCOME_STATUS = {200: SUCCEEDED, 503: CANCELLED}
+
+
+class QueueFull(Exception):
+    """The job queue is at its depth limit"""
+
+
+class BoardJob:
+    """One queued board decision"""
+    __slots__ = ("id", "task", "status", "submitted_at", "started_at", "finished_at", "outcome", "error", "done")
+
+    def __init__(self, task: Dict, job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex
+        self.task = task
+        self.status = QUEUED
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # The run_board_decision outcome: {"status_code", "body" | "detail"}
+        self.outcome: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.done = asyncio.Event()
+
+    @property
+    def wait_seconds(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return self.started_at - self.submitted_at
+
+    @property
+    def exec_seconds(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def to_dict(self) -> Dict:
+        wait, run = self.wait_seconds, self.exec_seconds
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wait_ms": None if wait is None else wait * 1000.0,
+            "exec_ms": None if run is None else run * 1000.0,
+            "outcome": self.outcome,
+            "error": self.error,
+        }
+
+
+class BoardJobQueue:
+    """
+    Bounded queue of board decisions drained by `workers` tasks.
+    execute(task) returns a run_board_decision outcome.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[Dict], Awaitable[Dict]],
+        redis=None,
+        workers: int = JOB_WORKERS,
+        max_depth: int = JOB_QUEUE_DEPTH,
+        retention: int = JOB_RETENTION,
+        ttl: int = JOB_TTL,
+        is_halted: Callable[[], bool] = lambda: False,
+        prefix: str = JOB_PREFIX
+    ):
+        self.execute = execute
+        self.redis = redis
+        self.workers = workers
+        self.max_depth = max_depth
+        self.retention = retention
+        self.ttl = ttl
+        self.is_halted = is_halted
+        self.prefix = prefix
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_depth)
+        self._jobs: "OrderedDict[str, BoardJob]" = OrderedDict()
+        self._tasks = []
+        self.running = 0
+        self.submitted = 0
+        self.refused = 0
+        # "wait": submission to start, "exec": start to finish
+        self.latency = LatencyRegistry()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+
+    async def stop(self):
+        """Stop the workers; jobs still queued or running are marked cancelled"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while not self._queue.empty():
+            await self._finish(self._queue.get_nowait(), CANCELLED, error="Service shutting down")
+
+    async def submit(self, task: Dict) -> BoardJob:
+        job = BoardJob(task)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.refused += 1
+            raise QueueFull(f"Board job queue is full ({self.max_depth} waiting)")
+        self.submitted += 1
+        self._remember(job)
+        await self._publish(job)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        """Job state from this process, or from Redis if another worker owns it"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.redis is None:
+            return None
+        try:
+            raw = await self.redis.get(self.prefix + job_id)
+        except Exception as e:
+            logger.warning(f"Board job lookup failed: {e}")
+            return None
+        return None if raw is None else json.loads(raw)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Dict]:
+        """Long-poll: return once the job has finished or `timeout` has passed"""
+        job = self._jobs.get(job_id)
+        if job is not None and timeout > 0:
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return await self.get(job_id)
+
+    async def _worker(self, n: int):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                await asyncio.shield(self._finish(job, CANCELLED, error="Service shutting down"))
+                raise
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: BoardJob):
+        if self.is_halted():
+            await self._finish(job, CANCELLED, error="System halted by Edward Override")
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        self.latency.record("wait", job.wait_seconds)
+        await self._publish(job)
+        self.running += 1
+        try:
+            outcome = await self.execute(job.task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Board job {job.id} failed: {e}")
+            await self._finish(job, FAILED, error=str(e))
+        else:
+            await self._finish(job, OUTCOME_STATUS.get(outcome["status_code"], REJECTED), outcome=outcome)
+        finally:
+            self.running -= 1
+
+    async def _finish(self, job: BoardJob, status: str, outcome: Optional[Dict] = None, error: Optional[str] = None):
+        job.status = status
+        job.outcome = outcome
+        job.error = error
+        job.finished_at = time.time()
+        if job.started_at is not None:
+            self.latency.record("exec", job.exec_seconds, status)
+        job.done.set()
+        await self._publish(job)
+
+    def _remember(self, job: BoardJob):
+        self._jobs[job.id] = job
+        excess = len(self._jobs) - self.retention
+        if excess <= 0:
+            return
+        # Forget the oldest finished jobs; unfinished ones are never evicted
+        for job_id in [job_id for job_id, old in self._jobs.items() if old.status in FINISHED][:excess]:
+            del self._jobs[job_id]
+
+    async def _publish(self, job: BoardJob):
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(self.prefix + job.id, json.dumps(job.to_dict(), default=str), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Board job state write failed: {e}")
+
+    def stats(self) -> Dict:
+        latency = self.latency.snapshot()
+        return {
+            "workers": self.workers,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "running": self.running,
+            "submitted": self.submitted,
+            "refused": self.refused,
+            "queue_wait": latency.get("wait"),
+            "execution": latency.get("exec"),
+        }
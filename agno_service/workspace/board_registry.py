@@ -0,0 +1,121 @@
+"""
+Lazily built board of directors
+
+Building a member (LLM client, tools, storage) is slow and each one holds
+memory, so members are built on first use instead of all at startup. The
+registry is a read-only mapping of seat key -> member, so existing
+`board[key]` lookups keep working; an optional warm-up builds a chosen
+subset in the background.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .metrics import process_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+# Seats built in the background at startup: comma-separated keys, "all" or ""
+BOARD_WARMUP = os.getenv("BOARD_WARMUP", "CEO,CQO,CSO,CRO")
+
+
+def parse_warmup(spec: Optional[str], keys: Iterable[str]) -> List[str]:
+    """Seat keys to warm up, in board order"""
+    keys = list(keys)
+    spec = (spec or "").strip()
+    if spec.lower() == "all":
+        return keys
+    wanted = {key.strip() for key in spec.split(",") if key.strip()}
+    unknown = wanted - set(keys)
+    if unknown:
+        raise ValueError(f"Unknown board seats in BOARD_WARMUP: {', '.join(sorted(unknown))}")
+    return [key for key in keys if key in wanted]
+
+
+class BoardRegistry(Mapping):
+    """
+    Seat key -> board member, built by `build(key)` on first access.
+    Iterating values() builds every member.
+    """
+
+    def __init__(self, build: Callable[[str], Any], keys: Iterable[str]):
+        self._build = build
+        self._keys = list(keys)
+        self._members: Dict[str, Any] = {}
+        self._locks = {key: threading.Lock() for key in self._keys}
+        self._build_seconds: Dict[str, float] = {}
+        self.warmup: Dict[str, Any] = {"status": "not started"}
+
+    def __getitem__(self, key: str) -> Any:
+        member = self._members.get(key)
+        if member is not None:
+            return member
+        if key not in self._locks:
+            raise KeyError(key)
+        with self._locks[key]:
+            member = self._members.get(key)
+            if member is None:
+                start = time.perf_counter()
+                member = self._build(key)
+                self._build_seconds[key] = time.perf_counter() - start
+                self._members[key] = member
+                logger.info(f"Built board member {key} in {self._build_seconds[key] * 1000:.0f} ms")
+        return member
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def is_built(self, key: str) -> bool:
+        return key in self._members
+
+    @property
+    def built_count(self) -> int:
+        return len(self._members)
+
+    async def get(self, key: str) -> Any:
+        """Member for `key`, built in a worker thread so the event loop keeps serving"""
+        member = self._members.get(key)
+        if member is not None:
+            return member
+        return await asyncio.to_thread(self.__getitem__, key)
+
+    async def build_all(self) -> List[Any]:
+        """Every member, in seat order"""
+        return list(await asyncio.gather(*(self.get(key) for key in self._keys)))
+
+    async def warm_up(self, keys: Iterable[str]):
+        """Build `keys` ahead of the first request that needs them"""
+        keys = list(keys)
+        rss_before = process_rss_bytes()
+        self.warmup = {"status": "running", "members": keys}
+        start = time.perf_counter()
+        try:
+            for key in keys:
+                await self.get(key)
+        except Exception as e:
+            logger.error(f"Board warm-up failed: {e}")
+            self.warmup.update(status="failed", error=str(e))
+            return
+        rss_after = process_rss_bytes()
+        self.warmup.update(
+            status="done",
+            seconds=time.perf_counter() - start,
+            rss_before_bytes=rss_before,
+            rss_after_bytes=rss_after,
+        )
+        logger.info(f"Warmed up {len(keys)} board members in {self.warmup['seconds']:.2f}s")
+
+    def stats(self) -> Dict:
+        return {
+            "seats": len(self._keys),
+            "built": [key for key in self._keys if key in self._members],
+            "build_ms": {key: seconds * 1000.0 for key, seconds in self._build_seconds.items()},
+            "warmup": self.warmup,
+        }
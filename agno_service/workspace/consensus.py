@@ -0,0 +1,139 @@
+"""
+Streaming board consensus
+
+StreamingConsensus takes member assessments as they finish and reports the
+board's decision as soon as no remaining member can change it, so callers can
+stop waiting for (or cancel) the rest of the board.
+"""
+import asyncio
+from typing import Awaitable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .risk_management import (
+    APPROVAL_THRESHOLD,
+    VETO_AGENTS,
+    AssessmentRecord,
+    RiskAssessment,
+    RiskLevel,
+)
+
+Assessment = Union[AssessmentRecord, RiskAssessment]
+
+
+class StreamingConsensus:
+    """
+    Incremental version of RiskManagementFramework.get_board_consensus.
+
+    The outcome is final as soon as:
+    - a veto agent reports HIGH risk or above (rejected),
+    - no veto agent is still pending and approvals have reached the threshold (approved), or
+    - no veto agent is still pending and approvals can no longer reach the
+      threshold even if every pending member approves (rejected).
+
+    While a veto agent is pending nothing else is final: its veto would
+    change the reason. Once final the approved flag cannot change, and the
+    decision is always what get_board_consensus returns for the assessments
+    received so far, in arrival order.
+    """
+
+    def __init__(self, expected_members: Iterable[str]):
+        self.pending = set(expected_members)
+        self.total_members = len(self.pending)
+        self.assessments: List[Assessment] = []
+        self.approval_votes = 0
+        self.final = False
+        self._veto: Optional[Tuple[bool, str]] = None
+        self._failed: Optional[Tuple[bool, str]] = None
+
+    @property
+    def decided(self) -> bool:
+        return self.final
+
+    @property
+    def decision(self) -> Optional[Tuple[bool, str]]:
+        if not self.final:
+            return None
+        return self._failed or self.finish()
+
+    def add(self, assessment: Assessment) -> Optional[Tuple[bool, str]]:
+        """Record a member's assessment; returns the decision once it is final"""
+        self.pending.discard(assessment.assessed_by)
+        self.assessments.append(assessment)
+
+        if assessment.risk_level.value <= RiskLevel.MEDIUM.value:
+            self.approval_votes += 1
+        elif self._veto is None and assessment.assessed_by in VETO_AGENTS:
+            self._veto = (
+                False,
+                f"VETO by {assessment.assessed_by}: {assessment.cons[0] if assessment.cons else 'High risk detected'}"
+            )
+        return self._check()
+
+    def skip(self, member: str) -> Optional[Tuple[bool, str]]:
+        """A member will not report (no framework, abstained or timed out)"""
+        self.pending.discard(member)
+        return self._check()
+
+    def fail(self, member: str, reason: str) -> Tuple[bool, str]:
+        """A member could not report and the board fails closed: reject now"""
+        self.pending.discard(member)
+        if not self.final:
+            self.final = True
+            self._failed = (False, reason)
+        return self.decision
+
+    def finish(self) -> Tuple[bool, str]:
+        """Decision over everything received, matching get_board_consensus"""
+        if self._veto is not None:
+            return self._veto
+        total_members = len(self.assessments)
+        if self.approval_votes >= APPROVAL_THRESHOLD:
+            return True, f"Board approval granted ({self.approval_votes}/{total_members} votes)"
+        return False, f"Insufficient board approval ({self.approval_votes}/{total_members} votes required: 7/11)"
+
+    def _check(self) -> Optional[Tuple[bool, str]]:
+        if not self.final:
+            if self._veto is not None or not self.pending:
+                self.final = True
+            elif self.pending.intersection(VETO_AGENTS):
+                return None
+            elif (
+                self.approval_votes >= APPROVAL_THRESHOLD
+                or self.approval_votes + len(self.pending) < APPROVAL_THRESHOLD
+            ):
+                self.final = True
+        return self.decision
+
+
+async def consensus_as_completed(
+    evaluator: StreamingConsensus,
+    member_assessments: Dict[str, Awaitable[Optional[Assessment]]]
+) -> Tuple[Tuple[bool, str], List[str]]:
+    """
+    Run member assessments concurrently, feeding each to the evaluator as it
+    finishes. Once the decision is final the assessments still running are
+    cancelled and awaited; ones that finished alongside the deciding one are
+    kept. Returns the decision and the members that were cancelled.
+    """
+    tasks = {
+        asyncio.ensure_future(awaitable): member
+        for member, awaitable in member_assessments.items()
+    }
+    pending = set(tasks)
+    try:
+        while pending and not evaluator.decided:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                assessment = task.result()
+                if assessment is None:
+                    evaluator.skip(tasks[task])
+                else:
+                    evaluator.add(assessment)
+    finally:
+        for task in pending:
+            task.cancel()
+        # Let cancelled assessments unwind before returning
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    cancelled = sorted(tasks[task] for task in pending)
+    return evaluator.decision or evaluator.finish(), cancelled
@@ -0,0 +1,149 @@
+"""
+Single-flight coalescing and result caching for board decisions
+
+Identical tasks (same canonical JSON, same active rule version) share one
+in-flight execution, and completed outcomes are kept for a short TTL in
+process and in Redis. An Edward Override HALT or RESUME invalidates every
+cached outcome, including ones still being computed when it arrives.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+DECISION_CACHE_TTL = float(os.getenv("BOARD_DECISION_CACHE_TTL", "30"))
+DECISION_CACHE_SIZE = int(os.getenv("BOARD_DECISION_CACHE_SIZE", "1024"))
+DECISION_CACHE_PREFIX = "board_decision_cache:"
+
+
+def task_key(task: Dict, *scope: str) -> str:
+    """Canonical hash of a task plus anything else that shapes its outcome"""
+    canonical = json.dumps([task, scope], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class SingleFlight:
+    """Run one execution per key at a time; concurrent callers share its result"""
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.coalesced += 1
+        # A caller that goes away must not cancel the shared execution
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def stats(self) -> Dict:
+        return {"in_flight": len(self._in_flight), "leaders": self.leaders, "coalesced": self.coalesced}
+
+
+class DecisionCache:
+    """
+    Two-level outcome cache: an in-process TTLCache in front of Redis.
+    Values must be JSON-serializable.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DECISION_CACHE_TTL,
+        maxsize: int = DECISION_CACHE_SIZE,
+        prefix: str = DECISION_CACHE_PREFIX
+    ):
+        self.ttl = ttl
+        self.prefix = prefix
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl, name="board_decisions")
+        # Bumped on every invalidation; results computed under an older
+        # generation are not stored
+        self.generation = 0
+        self.redis_hits = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.local.maxsize > 0
+
+    async def get(self, redis, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        value = self.local.get(key)
+        if value is not None or redis is None:
+            return value
+        try:
+            raw = await redis.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Decision cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        self.redis_hits += 1
+        self.local.set(key, value)
+        return value
+
+    async def set(self, redis, key: str, value: Any, generation: int) -> bool:
+        """Store an outcome computed under `generation`; skipped if invalidated since"""
+        if not self.enabled or generation != self.generation:
+            return False
+        self.local.set(key, value)
+        if redis is not None:
+            try:
+                await redis.set(self.prefix + key, json.dumps(value), ex=max(1, int(round(self.ttl))))
+            except Exception as e:
+                logger.warning(f"Decision cache write failed: {e}")
+        return True
+
+    async def invalidate(self, redis) -> int:
+        """Drop every cached outcome here and in Redis; returns the Redis keys removed"""
+        self.generation += 1
+        self.invalidations += 1
+        self.local.clear()
+        if redis is None:
+            return 0
+        removed = 0
+        batch = []
+        async for name in redis.scan_iter(match=self.prefix + "*", count=500):
+            batch.append(name)
+            if len(batch) >= 500:
+                removed += await redis.delete(*batch)
+                batch = []
+        if batch:
+            removed += await redis.delete(*batch)
+        return removed
+
+    def stats(self) -> Dict:
+        stats = self.local.stats()
+        stats.update({
+            "redis_hits": self.redis_hits,
+            "invalidations": self.invalidations,
+            "generation": self.generation,
+        })
+        return stats
+
+
+DECISION_CACHE = DecisionCache()
+DECISION_FLIGHTS = SingleFlight()
@@ -0,0 +1,384 @@
+"""
+Board decision pipeline: capped Redis Stream -> batched Postgres inserts
+
+board_decision XADDs each decision to a Redis Stream trimmed to roughly
+BOARD_DECISION_STREAM_MAXLEN entries, so Redis memory stays bounded.
+DecisionStreamWorker reads the stream through a consumer group and writes
+batches to the board_decisions table with one multi-row INSERT each. An
+entry is only acknowledged once its row is committed. Connection failures
+are retried with backoff, rows the database rejects are dead-lettered, and
+entries left pending (by a crashed consumer or an outage) are reclaimed.
+The stream entry ID is stored with the row, so a redelivered entry is never
+inserted twice.
+
+Run standalone with:
+    python -m workspace.decision_stream
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+DECISION_STREAM = os.getenv("BOARD_DECISION_STREAM", "board_decisions:stream")
+DECISION_STREAM_MAXLEN = int(os.getenv("BOARD_DECISION_STREAM_MAXLEN", "100000"))
+DECISION_GROUP = os.getenv("BOARD_DECISION_GROUP", "board_decision_writers")
+DEAD_LETTER_STREAM = os.getenv("BOARD_DECISION_DEAD_LETTER_STREAM", "board_decisions:dead")
+DECISION_STREAM_RECONNECT_MAX_BACKOFF = 5.0
+
+# Columns written by the worker; stream_id makes redelivery idempotent
+INSERT_SQL = """
+    INSERT INTO board_decisions (stream_id, task, risk_assessments, approved, reason, timestamp, execution_result)
+    VALUES %s
+    ON CONFLICT (stream_id) DO NOTHING
+    RETURNING stream_id
+"""
+SCHEMA_SQL = """
+    ALTER TABLE board_decisions ADD COLUMN IF NOT EXISTS stream_id TEXT;
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_board_decisions_stream_id ON board_decisions(stream_id);
+"""
+
+DecisionRow = Tuple[str, str, str, bool, Optional[str], datetime, Optional[str]]
+
+
+async def publish_decision(redis, decision_log: Dict, stream: str = DECISION_STREAM,
+                           maxlen: int = DECISION_STREAM_MAXLEN) -> Optional[str]:
+    """
+    Append a decision to the capped stream; returns the entry ID, or None
+    if Redis failed. The decision is already reached, so a logging failure
+    is logged rather than raised.
+    """
+    try:
+        return await redis.xadd(stream, {"decision": json.dumps(decision_log)}, maxlen=maxlen, approximate=True)
+    except Exception as e:
+        logger.error(f"Failed to publish board decision (approved={decision_log.get('approved')}): {e}")
+        return None
+
+
+def entry_timestamp(entry_id: str) -> datetime:
+    """Stream IDs start with the XADD time in milliseconds"""
+    millis = int(entry_id.split("-", 1)[0])
+    return datetime.fromtimestamp(millis / 1000.0, tz=timezone.utc)
+
+
+def decision_row(entry_id: str, fields: Dict[str, str]) -> DecisionRow:
+    """Turn a stream entry into a board_decisions row; raises ValueError if malformed"""
+    try:
+        decision = json.loads(fields["decision"])
+        task = decision["task"]
+        assessments = decision["assessments"]
+        approved = bool(decision["approved"])
+    except (KeyError, TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Malformed decision entry {entry_id}: {e}") from e
+    return (
+        entry_id,
+        json.dumps(task),
+        json.dumps(assessments),
+        approved,
+        decision.get("reason"),
+        entry_timestamp(entry_id),
+        json.dumps({"execution_plan": decision["execution_plan"]}) if decision.get("execution_plan") else None,
+    )
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Connection-level failures are worth retrying; rejected data is not"""
+    return isinstance(error, (ConnectionError, TimeoutError)) or type(error).__name__ in (
+        "OperationalError", "InterfaceError"
+    )
+
+
+class PostgresDecisionWriter:
+    """Writes decision rows with psycopg2 on a dedicated connection"""
+
+    def __init__(self, database_url: str, page_size: int = 1000):
+        self.database_url = database_url
+        self.page_size = page_size
+        self._connection = None
+
+    def _connect(self):
+        import psycopg2
+
+        if self._connection is None or self._connection.closed:
+            self._connection = psycopg2.connect(self.database_url)
+        return self._connection
+
+    def ensure_schema(self):
+        connection = self._connect()
+        with connection, connection.cursor() as cursor:
+            cursor.execute(SCHEMA_SQL)
+
+    def insert(self, rows: Sequence[DecisionRow]) -> int:
+        """Insert rows in one transaction; returns the number actually inserted"""
+        from psycopg2.extras import execute_values
+
+        connection = self._connect()
+        try:
+            with connection, connection.cursor() as cursor:
+                # rowcount only covers the last page; RETURNING rows are collected from every page
+                inserted = execute_values(
+                    cursor, INSERT_SQL, rows, template="(%s, %s::jsonb, %s::jsonb, %s, %s, %s, %s::jsonb)",
+                    page_size=self.page_size, fetch=True
+                )
+                return len(inserted)
+        except Exception:
+            # Drop a possibly broken connection; the next attempt reconnects
+            self.close()
+            raise
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class DecisionStreamWorker:
+    """Consumer-group worker that persists stream entries in batches"""
+
+    def __init__(
+        self,
+        redis,
+        insert_rows: Callable[[Sequence[DecisionRow]], int],
+        stream: str = DECISION_STREAM,
+        group: str = DECISION_GROUP,
+        consumer: Optional[str] = None,
+        dead_letter_stream: str = DEAD_LETTER_STREAM,
+        batch_size: int = 500,
+        block_ms: int = 1000,
+        max_retries: int = 5,
+        retry_backoff: float = 0.5,
+        claim_idle_ms: int = 60000,
+        is_transient: Optional[Callable[[Exception], bool]] = None
+    ):
+        self.redis = redis
+        self.insert_rows = insert_rows
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.dead_letter_stream = dead_letter_stream
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.claim_idle_ms = claim_idle_ms
+        self.is_transient = is_transient or is_transient_error
+
+        self.batches = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.acked = 0
+        self.retries = 0
+        self.dead_lettered = 0
+        self.reclaimed = 0
+        self.stalled = 0
+        self.reconnects = 0
+        self.batch_latency = LatencyStats()
+        # Time from XADD to commit, for the most recent batch
+        self.last_commit_lag: Optional[float] = None
+
+    async def ensure_group(self):
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def run(self):
+        """Consume until cancelled, reconnecting on errors"""
+        backoff = 0.1
+        while True:
+            try:
+                # The group is gone if the stream was deleted while we were away
+                await self.ensure_group()
+                # Our own entries left pending by a previous run of this consumer first
+                await self._drain_own_pending()
+                backoff = 0.1
+                last_claim = time.monotonic()
+                while True:
+                    if time.monotonic() - last_claim >= self.claim_idle_ms / 1000.0:
+                        await self.reclaim_stale()
+                        last_claim = time.monotonic()
+                    response = await self.redis.xreadgroup(
+                        self.group, self.consumer, {self.stream: ">"}, count=self.batch_size, block=self.block_ms
+                    )
+                    for _, entries in response or []:
+                        await self.process(entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.reconnects += 1
+                logger.error(f"Board decision stream lost ({e}); reconnecting in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, DECISION_STREAM_RECONNECT_MAX_BACKOFF)
+
+    async def reclaim_stale(self) -> int:
+        """Take over entries another consumer read but never acknowledged"""
+        reclaimed = 0
+        start = "0-0"
+        while True:
+            result = await self.redis.xautoclaim(
+                self.stream, self.group, self.consumer, self.claim_idle_ms, start_id=start, count=self.batch_size
+            )
+            start, entries = result[0], result[1]
+            if entries:
+                reclaimed += len(entries)
+                await self.process(entries)
+            if not entries or start in ("0-0", b"0-0"):
+                break
+        self.reclaimed += reclaimed
+        return reclaimed
+
+    async def _drain_own_pending(self):
+        while True:
+            response = await self.redis.xreadgroup(
+                self.group, self.consumer, {self.stream: "0"}, count=self.batch_size
+            )
+            entries = response[0][1] if response else []
+            if not entries:
+                return
+            settled = self.acked + self.dead_lettered
+            await self.process(entries)
+            if self.acked + self.dead_lettered == settled:
+                # Database still unavailable; reclaim_stale retries them later
+                return
+
+    async def process(self, entries: List[Tuple[str, Dict[str, str]]]):
+        """Persist a batch of entries, then acknowledge them"""
+        rows = []
+        for entry_id, fields in entries:
+            if not fields:
+                # Trimmed from the stream while pending: nothing left to write
+                await self._dead_letter(entry_id, fields, "entry trimmed before it was persisted")
+                continue
+            try:
+                rows.append(decision_row(entry_id, fields))
+            except ValueError as e:
+                await self._dead_letter(entry_id, fields, str(e))
+        if rows:
+            await self._persist(rows, dict(entries))
+
+    async def _persist(self, rows: List[DecisionRow], fields: Dict[str, Dict[str, str]]):
+        """
+        Insert and acknowledge rows. Transient failures (database unreachable)
+        are retried with backoff and then left pending for a later reclaim.
+        A batch rejected by the database is split to isolate the bad rows,
+        which are dead-lettered.
+        """
+        try:
+            inserted = await self._insert_with_retry(rows)
+        except Exception as e:
+            if self.is_transient(e):
+                self.stalled += len(rows)
+                logger.error(f"Leaving {len(rows)} board decisions pending, database unavailable: {e}")
+                return
+            if len(rows) == 1:
+                await self._dead_letter(rows[0][0], fields[rows[0][0]], f"insert rejected: {e}")
+                return
+            middle = len(rows) // 2
+            await self._persist(rows[:middle], fields)
+            await self._persist(rows[middle:], fields)
+            return
+
+        self.batches += 1
+        self.inserted += inserted
+        self.duplicates += len(rows) - inserted
+        await self.redis.xack(self.stream, self.group, *[row[0] for row in rows])
+        self.acked += len(rows)
+        self.last_commit_lag = time.time() - entry_timestamp(rows[0][0]).timestamp()
+
+    async def _insert_with_retry(self, rows: List[DecisionRow]) -> int:
+        attempt = 0
+        while True:
+            began = time.perf_counter()
+            try:
+                # psycopg2 blocks, so keep it off the event loop
+                inserted = await asyncio.to_thread(self.insert_rows, rows)
+            except Exception as e:
+                self.batch_latency.record(time.perf_counter() - began, "error")
+                if attempt >= self.max_retries or not self.is_transient(e):
+                    raise
+                self.retries += 1
+                delay = self.retry_backoff * (2 ** attempt)
+                attempt += 1
+                logger.warning(f"Board decision insert failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            self.batch_latency.record(time.perf_counter() - began, "ok")
+            return inserted
+
+    async def _dead_letter(self, entry_id: str, fields: Dict, error: str):
+        await self.redis.xadd(
+            self.dead_letter_stream,
+            {"entry_id": entry_id, "error": error, "fields": json.dumps(fields or {})},
+            maxlen=DECISION_STREAM_MAXLEN, approximate=True
+        )
+        await self.redis.xack(self.stream, self.group, entry_id)
+        self.dead_lettered += 1
+        logger.error(f"Dead-lettered board decision {entry_id}: {error}")
+
+    async def stats(self) -> Dict:
+        """Worker counters plus the group's backlog as Redis reports it"""
+        group_info = {}
+        try:
+            for group in await self.redis.xinfo_groups(self.stream):
+                if group.get("name") == self.group:
+                    group_info = group
+        except Exception as e:
+            logger.debug(f"XINFO GROUPS failed: {e}")
+        return {
+            "stream": self.stream,
+            "group": self.group,
+            "consumer": self.consumer,
+            # Entries not yet delivered to the group (Redis 7+) and delivered but unacknowledged
+            "lag": group_info.get("lag"),
+            "pending": group_info.get("pending"),
+            "batches": self.batches,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "acked": self.acked,
+            "retries": self.retries,
+            "dead_lettered": self.dead_lettered,
+            "reclaimed": self.reclaimed,
+            "stalled": self.stalled,
+            "reconnects": self.reconnects,
+            "last_commit_lag_seconds": self.last_commit_lag,
+            "batch_latency": self.batch_latency.snapshot(),
+        }
+
+
+def worker_from_env(redis, writer: PostgresDecisionWriter) -> DecisionStreamWorker:
+    return DecisionStreamWorker(
+        redis,
+        writer.insert,
+        batch_size=int(os.getenv("BOARD_DECISION_BATCH_SIZE", "500")),
+        block_ms=int(os.getenv("BOARD_DECISION_BLOCK_MS", "1000")),
+        max_retries=int(os.getenv("BOARD_DECISION_MAX_RETRIES", "5")),
+        claim_idle_ms=int(os.getenv("BOARD_DECISION_CLAIM_IDLE_MS", "60000"))
+    )
+
+
+async def _main():
+    import redis.asyncio as aioredis
+
+    logging.basicConfig(level=logging.INFO)
+    redis = await aioredis.from_url(os.getenv("REDIS_URL", "redis://redis:6379"), decode_responses=True)
+    writer = PostgresDecisionWriter(os.environ["DATABASE_URL"])
+    await asyncio.to_thread(writer.ensure_schema)
+    worker = worker_from_env(redis, writer)
+    logger.info(f"Persisting {worker.stream} as consumer {worker.consumer}")
+    try:
+        await worker.run()
+    finally:
+        writer.close()
+        await redis.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
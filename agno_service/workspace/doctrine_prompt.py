@@ -0,0 +1,124 @@
+"""
+EPIC doctrine compiled once into a shared prompt prefix
+
+Every agent's instructions start with the same doctrine and verification
+lines, built once here as an immutable tuple of shared strings, so the
+prompt prefix is byte-identical across agents (and provider-side prompt
+caches can reuse it). Role sections follow the prefix. Token counts for the
+prefix and each role section are computed once per tokenizer, using
+tiktoken when it is installed and a character-based estimate otherwise.
+"""
+import hashlib
+import math
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .epic_doctrine import BOARD_ROLES, EPIC_DOCTRINE
+
+try:
+    import tiktoken
+except ImportError:  # optional: exact counts for OpenAI models
+    tiktoken = None
+
+VERIFICATION_REQUIREMENTS = (
+    "\nVERIFICATION REQUIREMENTS:",
+    "- You MUST verify capabilities through MCP before claiming them",
+    "- You MUST perform risk assessment before any significant action",
+    "- You MUST log all actions for audit trail",
+    "- You MUST prioritize Edward Ip's interests above all else",
+)
+
+# Used when no offline tokenizer is available for a model
+ESTIMATE_TOKENIZER = "estimate"
+CHARS_PER_TOKEN = 4.0
+
+
+def doctrine_lines(doctrine: Mapping) -> Tuple[str, ...]:
+    """The doctrine as instruction lines"""
+    lines = []
+    for key, value in doctrine.items():
+        if isinstance(value, dict):
+            lines.append(f"DOCTRINE {key}:")
+            for sub_key, sub_value in value.items():
+                lines.append(f"  - {sub_key}: {sub_value}")
+        else:
+            lines.append(f"DOCTRINE: {key} = {value}")
+    return tuple(lines)
+
+
+def role_lines(name: str, role_info: Mapping) -> Tuple[str, ...]:
+    return (
+        f"\nYOUR ROLE: {name}",
+        f"Focus: {role_info['focus']}",
+        f"Veto Power: {'YES' if role_info['veto_power'] else 'NO'}",
+        f"Risk Tolerance: {role_info['risk_tolerance']}",
+    )
+
+
+def tokenizer_for(model_id: Optional[str]) -> str:
+    """Name of the offline tokenizer used to count tokens for `model_id`"""
+    if tiktoken is None or not model_id:
+        return ESTIMATE_TOKENIZER
+    try:
+        return tiktoken.encoding_for_model(model_id).name
+    except KeyError:
+        # Anthropic and Gemini tokenizers are not available offline
+        return ESTIMATE_TOKENIZER
+    except Exception:
+        # BPE files missing from the tiktoken cache and no network to fetch them
+        return ESTIMATE_TOKENIZER
+
+
+def count_tokens(text: str, tokenizer: str = ESTIMATE_TOKENIZER) -> int:
+    if tokenizer == ESTIMATE_TOKENIZER:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(tiktoken.get_encoding(tokenizer).encode(text))
+
+
+def join_lines(lines: Iterable[str]) -> str:
+    return "\n".join(lines)
+
+
+class DoctrinePrompt:
+    """Immutable shared prefix plus per-role sections"""
+
+    def __init__(self, doctrine: Mapping = EPIC_DOCTRINE, roles: Mapping = BOARD_ROLES):
+        self.shared: Tuple[str, ...] = doctrine_lines(doctrine) + VERIFICATION_REQUIREMENTS
+        self.text = join_lines(self.shared)
+        # Changes whenever the doctrine wording does
+        self.version = hashlib.sha256(self.text.encode()).hexdigest()[:12]
+        self.sections: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {name: role_lines(name, info) for name, info in roles.items()}
+        )
+        self._token_counts: Dict[str, Dict] = {}
+
+    def instructions(self, name: str, specific: Sequence[str] = ()) -> List[str]:
+        """Instruction list for one agent: shared prefix, role section, then its own lines"""
+        return [*self.shared, *self.sections.get(name, ()), *specific]
+
+    def token_counts(self, model_id: Optional[str] = None) -> Dict:
+        """Prefix and per-role token counts, computed once per tokenizer"""
+        tokenizer = tokenizer_for(model_id)
+        counts = self._token_counts.get(tokenizer)
+        if counts is None:
+            counts = {
+                "tokenizer": tokenizer,
+                "shared": count_tokens(self.text, tokenizer),
+                "roles": {
+                    name: count_tokens(join_lines(section), tokenizer)
+                    for name, section in self.sections.items()
+                },
+            }
+            self._token_counts[tokenizer] = counts
+        return counts
+
+    def prompt_tokens(self, name: str, specific: Sequence[str] = (), model_id: Optional[str] = None) -> int:
+        """Doctrine and role tokens one agent sends with every call"""
+        counts = self.token_counts(model_id)
+        tokens = counts["shared"] + counts["roles"].get(name, 0)
+        if specific:
+            tokens += count_tokens(join_lines(specific), counts["tokenizer"])
+        return tokens
+
+
+DOCTRINE_PROMPT = DoctrinePrompt()
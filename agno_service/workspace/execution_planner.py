@@ -0,0 +1,126 @@
+"""
+Risk-tiered execution planning for approved tasks
+
+An approved task does not always need all 11 board members. The planner
+picks an execution path from the board's risk assessment:
+
+    LOW      fast      one member on a small, fast model
+    MEDIUM   subteam   the smallest member set covering the task's risk
+                       categories and metadata (team_selector)
+    HIGH+    full      the whole board
+
+Every plan is recorded with the decision, and run latency is tracked per tier.
+"""
+import os
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+from .metrics import LatencyRegistry
+from .risk_management import AssessmentRecord, RiskCategory, RiskLevel
+from .team_selector import BOARD_SEATS, TEAM_SELECTOR, TeamSelector, task_requirements
+
+FAST = "fast"
+SUBTEAM = "subteam"
+FULL = "full"
+TIERS = (FAST, SUBTEAM, FULL)
+
+# COO and CXO run on gpt-4o-mini
+FAST_MEMBER = os.getenv("EXECUTION_FAST_MEMBER", "COO")
+# A MEDIUM task needing more members than this runs on the full board
+MAX_SUBTEAM = int(os.getenv("EXECUTION_MAX_SUBTEAM", "4"))
+
+# MEDIUM-risk tasks without a category
+DEFAULT_SUBTEAM = ("CEO", "COO")
+
+
+class ExecutionPlan:
+    """Which members execute an approved task, and why"""
+    __slots__ = ("tier", "members", "risk_level", "categories", "reason")
+
+    def __init__(
+        self,
+        tier: str,
+        members: Sequence[str],
+        risk_level: RiskLevel,
+        categories: Sequence[RiskCategory],
+        reason: str
+    ):
+        self.tier = tier
+        self.members: Tuple[str, ...] = tuple(members)
+        self.risk_level = risk_level
+        self.categories: Tuple[RiskCategory, ...] = tuple(categories)
+        self.reason = reason
+
+    def to_dict(self) -> Dict:
+        return {
+            "tier": self.tier,
+            "members": list(self.members),
+            "risk_level": self.risk_level.name,
+            "categories": [category.value for category in self.categories],
+            "reason": self.reason,
+        }
+
+    def __repr__(self) -> str:
+        return f"ExecutionPlan(tier={self.tier!r}, members={list(self.members)!r})"
+
+
+class ExecutionPlanner:
+    """Maps a risk level and categories to an execution tier and its members"""
+
+    def __init__(
+        self,
+        seats: Sequence[str] = BOARD_SEATS,
+        fast_member: str = FAST_MEMBER,
+        selector: Optional[TeamSelector] = None,
+        default_subteam: Sequence[str] = DEFAULT_SUBTEAM,
+        max_subteam: int = MAX_SUBTEAM
+    ):
+        self.seats = tuple(seats)
+        unknown = {fast_member, *default_subteam} - set(self.seats)
+        if unknown:
+            raise ValueError(f"Unknown board seats: {', '.join(sorted(unknown))}")
+        self.fast_member = fast_member
+        self.selector = selector or TEAM_SELECTOR
+        self.default_subteam = tuple(default_subteam)
+        self.max_subteam = max_subteam
+        self.latency = LatencyRegistry()
+
+    def plan(
+        self,
+        risk_level: RiskLevel,
+        categories: Iterable[RiskCategory] = (),
+        task: Optional[Mapping] = None
+    ) -> ExecutionPlan:
+        categories = tuple(categories)
+        if risk_level.value >= RiskLevel.HIGH.value:
+            return ExecutionPlan(FULL, self.seats, risk_level, categories, f"{risk_level.name} risk needs the full board")
+        if risk_level == RiskLevel.LOW and not task_requirements(task):
+            return ExecutionPlan(FAST, (self.fast_member,), risk_level, categories, "LOW risk: single fast member")
+        members = self.selector.select(categories, task) or self.default_subteam
+        if len(members) > self.max_subteam:
+            return ExecutionPlan(
+                FULL, self.seats, risk_level, categories, f"needs {len(members)} members, over the sub-team limit"
+            )
+        return ExecutionPlan(
+            SUBTEAM, members, risk_level, categories, f"{risk_level.name} risk: smallest qualifying sub-team"
+        )
+
+    def plan_assessments(self, assessments: Sequence[AssessmentRecord], task: Optional[Mapping] = None) -> ExecutionPlan:
+        """Plan from the board's assessments: the highest level and every category raised"""
+        if not assessments:
+            return self.plan(RiskLevel.HIGH, task=task)
+        level = max((a.risk_level for a in assessments), key=lambda level: level.value)
+        categories = []
+        for assessment in assessments:
+            for category in assessment.categories:
+                if category not in categories:
+                    categories.append(category)
+        return self.plan(level, categories, task)
+
+    def record(self, plan: ExecutionPlan, seconds: float, outcome: Optional[str] = None):
+        self.latency.record(plan.tier, seconds, outcome)
+
+    def stats(self) -> Dict:
+        return {"tiers": self.latency.snapshot()}
+
+
+EXECUTION_PLANNER = ExecutionPlanner()
@@ -0,0 +1,366 @@
+"""
+Shared LLM provider clients with per-provider limits
+
+All board members on one provider share one client and its HTTP connection
+pool instead of opening their own. Every call first passes the provider's
+limiter: token buckets for requests and tokens per minute, then a
+concurrency limit, so a burst of decisions queues here instead of hitting
+provider rate limits and retrying. Time spent queued is tracked per provider.
+
+Limits are configured per provider from the environment, e.g.
+LLM_OPENAI_MAX_CONCURRENCY, LLM_OPENAI_RPM, LLM_OPENAI_TPM; 0 disables a limit.
+The SDKs read OPENAI_BASE_URL / ANTHROPIC_BASE_URL, so a local stub API can
+stand in for a provider.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, ClassVar, Dict, Iterable, Optional
+
+from .doctrine_prompt import count_tokens
+from .metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+OPENAI = "openai"
+ANTHROPIC = "anthropic"
+GEMINI = "gemini"
+PROVIDERS = (OPENAI, ANTHROPIC, GEMINI)
+
+# Defaults roughly follow each provider's first usage tier
+DEFAULT_LIMITS = {
+    OPENAI: {"max_concurrency": 8, "rpm": 500, "tpm": 30000},
+    ANTHROPIC: {"max_concurrency": 4, "rpm": 50, "tpm": 40000},
+    GEMINI: {"max_concurrency": 4, "rpm": 15, "tpm": 1000000},
+}
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "10"))
+HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "60"))
+# Completion tokens reserved for a request that does not set max_tokens
+COMPLETION_TOKENS = int(os.getenv("LLM_COMPLETION_TOKENS", "512"))
+
+
+def provider_limits(provider: str) -> Dict[str, float]:
+    defaults = DEFAULT_LIMITS[provider]
+    prefix = f"LLM_{provider.upper()}_"
+    return {
+        "max_concurrency": int(os.getenv(prefix + "MAX_CONCURRENCY", str(defaults["max_concurrency"]))),
+        "rpm": float(os.getenv(prefix + "RPM", str(defaults["rpm"]))),
+        "tpm": float(os.getenv(prefix + "TPM", str(defaults["tpm"]))),
+    }
+
+
+def estimate_request_tokens(messages: Iterable[Any], max_tokens: Optional[int] = None) -> int:
+    """Prompt tokens (estimated from message content) plus the completion budget"""
+    text = []
+    for message in messages:
+        content = message.get("content") if isinstance(message, dict) else getattr(message, "content", None)
+        if content:
+            text.append(content if isinstance(content, str) else str(content))
+    return count_tokens("\n".join(text)) + (max_tokens or COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """
+    Refills `per_minute` units a minute, holding at most a minute's worth.
+    reserve() takes units immediately and returns how long the caller must
+    wait before using them, so sync and async callers share one bucket.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def reserve(self, amount: float = 1.0) -> float:
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # A request larger than the bucket waits for a full bucket, not forever
+            self._tokens -= min(amount, self.capacity)
+            return max(0.0, -self._tokens / self.rate)
+
+
+class ConcurrencyLimit:
+    """
+    Semaphore shared by threads and event loops: members run both through
+    sync `run` (in worker threads) and async `arun`. Waiters are served first
+    come, first served; a released slot passes straight to the next waiter.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    def _take(self) -> bool:
+        if self.limit <= 0 or (self.in_use < self.limit and not self._waiters):
+            self.in_use += 1
+            return True
+        return False
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def acquire(self):
+        with self._lock:
+            if self._take():
+                return
+            granted = threading.Event()
+            self._waiters.append(granted.set)
+        granted.wait()
+
+    async def aacquire(self):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve():
+            if not future.done():
+                future.set_result(None)
+
+        def grant():
+            loop.call_soon_threadsafe(resolve)
+
+        with self._lock:
+            if self._take():
+                return
+            self._waiters.append(grant)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(grant)
+                    granted = False
+                except ValueError:
+                    granted = True
+            if granted:
+                # The slot was handed over as we were cancelled; pass it on
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            if not self._waiters:
+                self.in_use -= 1
+                return
+            grant = self._waiters.popleft()
+        grant()
+
+
+class ProviderLimiter:
+    """Request and token buckets, then a concurrency limit, for one provider"""
+
+    def __init__(self, name: str, max_concurrency: int = 0, rpm: float = 0, tpm: float = 0):
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = ConcurrencyLimit(max_concurrency)
+        self.queue_wait = LatencyStats()
+        self.call_time = LatencyStats()
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.peak_in_flight = 0
+        self.tokens_reserved = 0
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            self.tokens_reserved += tokens
+        return max(self.requests.reserve(1), self.tokens.reserve(tokens))
+
+    def _started(self, waited: float):
+        self.queue_wait.record(waited)
+        with self._lock:
+            if waited > 0.001:
+                self.throttled += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.concurrency.in_use)
+
+    def _finished(self, start: float, error: bool):
+        self.concurrency.release()
+        self.call_time.record(time.perf_counter() - start, "error" if error else "ok")
+
+    @contextmanager
+    def slot(self, tokens: int = 0):
+        """Blocks until the call may go out; yields the seconds spent queued"""
+        start = time.perf_counter()
+        delay = self._reserve(tokens)
+        if delay:
+            time.sleep(delay)
+        self.concurrency.acquire()
+        waited = time.perf_counter() - start
+        self._started(waited)
+        error = True
+        try:
+            yield waited
+            error = False
+        finally:
+            self._finished(start + waited, error)
+
+    @asynccontextmanager
+    async def aslot(self, tokens: int = 0):
+        start = time.perf_counter()
+        delay = self._reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+        await self.concurrency.aacquire()
+        waited = time.perf_counter() - start
+        self._started(waited)
+        error = True
+        try:
+            yield waited
+            error = False
+        finally:
+            self._finished(start + waited, error)
+
+    def stats(self) -> Dict:
+        return {
+            "max_concurrency": self.concurrency.limit,
+            "rpm": self.requests.capacity,
+            "tpm": self.tokens.capacity,
+            "in_flight": self.concurrency.in_use,
+            "waiting": self.concurrency.waiting,
+            "peak_in_flight": self.peak_in_flight,
+            "throttled": self.throttled,
+            "tokens_reserved": self.tokens_reserved,
+            "queue_wait": self.queue_wait.snapshot(),
+            "call_time": self.call_time.snapshot(),
+        }
+
+
+class ProviderPool:
+    """One limiter and one lazily built client per provider, shared by every member"""
+
+    def __init__(self, limits: Optional[Dict[str, Dict]] = None):
+        limits = limits or {provider: provider_limits(provider) for provider in PROVIDERS}
+        self.limiters: Dict[str, ProviderLimiter] = {
+            provider: ProviderLimiter(provider, **config) for provider, config in limits.items()
+        }
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, provider: str) -> ProviderLimiter:
+        return self.limiters[provider]
+
+    def _client(self, name: str, build):
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    client = self._clients[name] = build()
+                    logger.info(f"Created shared LLM client: {name}")
+        return client
+
+    @staticmethod
+    def _http_limits():
+        import httpx
+        return httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE)
+
+    def http_client(self):
+        import httpx
+        return self._client("http", lambda: httpx.Client(limits=self._http_limits(), timeout=HTTP_TIMEOUT))
+
+    def async_http_client(self):
+        import httpx
+        return self._client("async_http", lambda: httpx.AsyncClient(limits=self._http_limits(), timeout=HTTP_TIMEOUT))
+
+    def openai_client(self):
+        from openai import OpenAI
+        return self._client(OPENAI, lambda: OpenAI(http_client=self.http_client()))
+
+    def openai_async_client(self):
+        from openai import AsyncOpenAI
+        return self._client("async_" + OPENAI, lambda: AsyncOpenAI(http_client=self.async_http_client()))
+
+    def anthropic_client(self):
+        from anthropic import Anthropic
+        return self._client(ANTHROPIC, lambda: Anthropic(http_client=self.http_client()))
+
+    def stats(self) -> Dict:
+        return {
+            "clients": sorted(self._clients),
+            "providers": {name: limiter.stats() for name, limiter in self.limiters.items()},
+        }
+
+    async def aclose(self):
+        for name in ("async_http", "http"):
+            client = self._clients.pop(name, None)
+            if client is None:
+                continue
+            if name == "async_http":
+                await client.aclose()
+            else:
+                client.close()
+        self._clients.clear()
+
+
+LLM_POOL = ProviderPool()
+
+
+class PooledLLM:
+    """
+    Mixin for a phi LLM class: every provider call goes through the
+    provider's shared limiter. Put it first in the bases. invoke_stream
+    holds the slot until the chunk iterator is exhausted or closed.
+    """
+    pool_provider: ClassVar[str]
+    # None: the process-wide LLM_POOL
+    llm_pool: ClassVar[Optional[ProviderPool]] = None
+
+    def _limiter(self) -> ProviderLimiter:
+        return (self.llm_pool or LLM_POOL).limiter(self.pool_provider)
+
+    def _request_tokens(self, messages) -> int:
+        return estimate_request_tokens(messages, getattr(self, "max_tokens", None))
+
+    def invoke(self, messages):
+        with self._limiter().slot(self._request_tokens(messages)):
+            return super().invoke(messages)
+
+    def invoke_stream(self, messages):
+        with self._limiter().slot(self._request_tokens(messages)):
+            yield from super().invoke_stream(messages)
+
+
+class PooledAsyncLLM(PooledLLM):
+    """PooledLLM for classes with async calls as well (phi's OpenAIChat)"""
+
+    async def ainvoke(self, messages):
+        async with self._limiter().aslot(self._request_tokens(messages)):
+            return await super().ainvoke(messages)
+
+    async def ainvoke_stream(self, messages):
+        async with self._limiter().aslot(self._request_tokens(messages)):
+            async for chunk in super().ainvoke_stream(messages):
+                yield chunk
+
+
+class PooledStreamManagerLLM(PooledLLM):
+    """
+    PooledLLM for classes whose invoke_stream returns a stream manager used
+    as ``with llm.invoke_stream(messages) as stream`` (phi's Claude). The
+    slot is taken when the stream is entered and released when it exits.
+    """
+
+    @contextmanager
+    def invoke_stream(self, messages):
+        with self._limiter().slot(self._request_tokens(messages)):
+            # Past PooledLLM.invoke_stream, to the LLM class's own
+            with super(PooledLLM, self).invoke_stream(messages) as stream:
+                yield stream
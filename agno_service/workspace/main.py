@@ -1,4 +1,6 @@
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from phi.playground import Playground
 from phi.agent import Agent
 from phi.team import Team
@@ -7,25 +9,55 @@ import redis.asyncio as aioredis
 import os
 import logging
 import asyncio
+import time
 from typing import Dict, List, Optional
 import json
 
-from .agent_factory import AgentFactory
-from .risk_management import RiskAssessment, RiskLevel
+from .agent_factory import AgentFactory, BOARD_MEMBER_SPECS
+from .doctrine_prompt import DOCTRINE_PROMPT
+from .response_cache import RESPONSE_CACHE, response_key
+from .execution_planner import EXECUTION_PLANNER, FAST, ExecutionPlan
+from .team_selector import BOARD_SEATS, TEAM_SELECTOR, TeamCache
+from .board_registry import BOARD_WARMUP, BoardRegistry, parse_warmup
+from .risk_management import AssessmentRecord, RiskLevel
+from .risk_event_log import RISK_EVENT_LOG
+from .board_evaluation import evaluate_board
+from .member_assessment import MEMBER_LATENCY, MemberTiming, assess_members
+from .decision_stream import PostgresDecisionWriter, publish_decision, worker_from_env
+from .decision_cache import DECISION_CACHE, DECISION_FLIGHTS, task_key
+from .board_events import board_decision_events, team_chunks
+from .board_jobs import BoardJobQueue, QueueFull
+from .override_gate import OverrideGate, OverrideHalted
+from .risk_rules import RULE_REGISTRY
+from .llm_pool import LLM_POOL
+from .prompt_budget import PROMPT_ASSEMBLER
+from .session_cache import SESSION_CACHE
+from .metrics import process_rss_bytes
+from .rule_loader import reloader_from_env
 from .tools.mcp_tools import MCPToolkit
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global board instance
-board_of_directors: Optional[Dict] = None
-epic_team: Optional[Team] = None
+# "key": CEO, CQO, CSO and CRO assess individually; "full": all 11 members vote
+BOARD_CONSENSUS_SCOPE = os.getenv("BOARD_CONSENSUS_SCOPE", "key").lower()
+
+# Global board instance; members and teams are built on first use
+board_of_directors: Optional[BoardRegistry] = None
+EPIC_TEAM_INSTRUCTIONS = [
+    "You are the EPIC Board of Directors serving Edward Ip",
+    "Major decisions require 7/11 board member consensus",
+    "CSO, CRO, and CQO have veto power for high-risk actions",
+    "Every action must prioritize Edward and his family's interests"
+]
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize board on startup"""
-    global board_of_directors, epic_team
+    global board_of_directors
+    startup_start = time.perf_counter()
+    rss_before = process_rss_bytes()
     
     # Initialize Redis
     app.state.redis = await aioredis.from_url(
@@ -35,63 +67,86 @@ async def lifespan(app: FastAPI):
     )
     
     # Check for system override
-    override_status = await app.state.redis.get("EDWARD_OVERRIDE_STATUS")
-    if override_status == "HALT":
+    gate = OverrideGate(app.state.redis)
+    app.state.override_gate = gate
+    await gate.sync()
+    if gate.halted:
         logger.error("SYSTEM HALTED by EDWARD OVERRIDE - Refusing to start")
         raise RuntimeError("System halted by Edward Override")
     
+    # Load risk rule sets before the board starts scoring
+    app.state.rule_reloader = reloader_from_env(app.state.redis)
+    rule_reload_task = None
+    if app.state.rule_reloader.configured:
+        await app.state.rule_reloader.reload()
+        rule_reload_task = asyncio.create_task(app.state.rule_reloader.run())
+    logger.info(f"Risk rules {RULE_REGISTRY.active.version} active")
+    
+    # Members' sessions are cached in memory; writes are announced to other workers
+    SESSION_CACHE.attach(app.state.redis, asyncio.get_running_loop())
+    session_cache_task = asyncio.create_task(SESSION_CACHE.run(app.state.redis))
+    
     # Initialize agent factory
     factory = AgentFactory()
+    app.state.storage = factory.storage
     
-    # Create all board members
+    # Board members are built on first use; warm up the ones every decision needs
     logger.info("Initializing EPIC Board of Directors...")
-    board_of_directors = factory.create_board_of_directors()
-    
-    # Create collaborative team
-    epic_team = Team(
-        name="EPIC Board of Directors",
-        agents=list(board_of_directors.values()),
-        instructions=[
-            "You are the EPIC Board of Directors serving Edward Ip",
-            "Major decisions require 7/11 board member consensus",
-            "CSO, CRO, and CQO have veto power for high-risk actions",
-            "Every action must prioritize Edward and his family's interests"
-        ]
-    )
+    board_of_directors = BoardRegistry(factory.create_board_member, BOARD_MEMBER_SPECS)
+    warmup_task = asyncio.create_task(board_of_directors.warm_up(parse_warmup(BOARD_WARMUP, BOARD_MEMBER_SPECS)))
     
-    # Subscribe to override channel
-    pubsub = app.state.redis.pubsub()
-    await pubsub.subscribe("edward_override_channel")
+    # Follow the override channel; cached decisions never outlive a HALT or RESUME
+    gate.on_change(lambda halted: DECISION_CACHE.invalidate(app.state.redis))
+    override_task = asyncio.create_task(gate.run())
     
-    # Start override listener
-    asyncio.create_task(override_listener(pubsub, app))
+    # Persist board decisions from the Redis Stream into Postgres
+    app.state.decision_worker = None
+    decision_worker_task = None
+    if os.getenv("DATABASE_URL") and os.getenv("BOARD_DECISION_WORKER", "1") != "0":
+        decision_writer = PostgresDecisionWriter(os.environ["DATABASE_URL"])
+        await asyncio.to_thread(decision_writer.ensure_schema)
+        app.state.decision_worker = worker_from_env(app.state.redis, decision_writer)
+        decision_worker_task = asyncio.create_task(app.state.decision_worker.run())
+    
+    # Queued board decisions (POST /board/jobs)
+    app.state.board_jobs = BoardJobQueue(
+        lambda task: run_board_decision(task, app.state.redis),
+        redis=app.state.redis,
+        is_halted=lambda: gate.halted
+    )
+    app.state.board_jobs.start()
     
     # Report health
     await app.state.redis.set("agno_service_health", "healthy")
     
-    logger.info("EPIC Board of Directors initialized successfully")
+    app.state.startup = {
+        "seconds": time.perf_counter() - startup_start,
+        "rss_before_bytes": rss_before,
+        "rss_after_bytes": process_rss_bytes(),
+    }
+    logger.info(
+        f"EPIC Board of Directors initialized successfully in {app.state.startup['seconds']:.2f}s "
+        f"(RSS {(app.state.startup['rss_after_bytes'] or 0) / 2**20:.0f} MB)"
+    )
     
     yield
     
     # Cleanup
-    await pubsub.unsubscribe("edward_override_channel")
+    warmup_task.cancel()
+    if rule_reload_task:
+        rule_reload_task.cancel()
+    if decision_worker_task:
+        decision_worker_task.cancel()
+    await app.state.board_jobs.stop()
+    override_task.cancel()
+    session_cache_task.cancel()
+    await asyncio.gather(override_task, session_cache_task, return_exceptions=True)
+    if factory.storage is not None:
+        # Pending run state is written (and announced) before Redis closes
+        await asyncio.to_thread(factory.storage.write_behind.stop)
     await app.state.redis.close()
-
-async def override_listener(pubsub, app):
-    """Listen for Edward Override commands"""
-    async for message in pubsub.listen():
-        if message['type'] == 'message':
-            try:
-                data = json.loads(message['data'])
-                if data['action'] == 'HALT':
-                    logger.critical("EDWARD OVERRIDE RECEIVED - HALTING ALL OPERATIONS")
-                    # Implement graceful shutdown
-                    app.state.halted = True
-                elif data['action'] == 'RESUME':
-                    logger.info("System resume command received")
-                    app.state.halted = False
-            except Exception as e:
-                logger.error(f"Error processing override: {e}")
+    await LLM_POOL.aclose()
+    await asyncio.to_thread(RISK_EVENT_LOG.stop)
 
 app = FastAPI(
     title="EPIC V11 AGNO Service",
@@ -109,60 +164,295 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "agno_service",
-        "board_members": len(board_of_directors) if board_of_directors else 0
+        "board_members": len(board_of_directors) if board_of_directors else 0,
+        "board_members_built": board_of_directors.built_count if board_of_directors else 0
     }
 
+@app.get("/board/prompt")
+async def board_prompt_budget():
+    """Doctrine prefix version and the prompt tokens each member sends per call"""
+    members = {}
+    for key, spec in BOARD_MEMBER_SPECS.items():
+        counts = DOCTRINE_PROMPT.token_counts(spec["model_id"])
+        members[key] = {
+            "model_id": spec["model_id"],
+            "tokenizer": counts["tokenizer"],
+            "shared_prefix_tokens": counts["shared"],
+            "prompt_tokens": DOCTRINE_PROMPT.prompt_tokens(spec["name"], spec["specific_instructions"], spec["model_id"]),
+        }
+    return {"doctrine_version": DOCTRINE_PROMPT.version, "members": members}
+
+@app.get("/risk/rules")
+async def risk_rules_status():
+    """Active and shadow risk rule versions, with shadow disagreement rates"""
+    status = RULE_REGISTRY.stats()
+    status["reloader"] = app.state.rule_reloader.stats()
+    return status
+
+@app.post("/risk/rules/reload")
+async def reload_risk_rules():
+    """Check the rule sources now instead of waiting for the next poll"""
+    swapped = await app.state.rule_reloader.reload()
+    return {"swapped": swapped, "active_version": RULE_REGISTRY.active.version}
+
 @app.post("/board/decision")
 async def board_decision(
     task: dict,
-    background_tasks: BackgroundTasks,
+    response: Response,
+    use_cache: bool = True,
     redis = Depends(lambda: app.state.redis)
 ):
     """Submit a task for board decision with risk assessment"""
     
     # Check if system is halted
-    if hasattr(app.state, 'halted') and app.state.halted:
+    if app.state.override_gate.halted:
         raise HTTPException(status_code=503, detail="System halted by Edward Override")
     
+    if not use_cache:
+        outcome = await run_board_decision(task, redis)
+        response.headers["X-Board-Decision-Cache"] = "bypass"
+        return decision_response(outcome)
+    
+    # Identical tasks under the same rules share one execution and its result
+    key = task_key(task, BOARD_CONSENSUS_SCOPE, RULE_REGISTRY.active.version)
+    outcome = await DECISION_CACHE.get(redis, key)
+    if outcome is not None:
+        response.headers["X-Board-Decision-Cache"] = "hit"
+        return decision_response(outcome)
+    
+    async def decide_and_cache():
+        generation = DECISION_CACHE.generation
+        outcome = await run_board_decision(task, redis)
+        await DECISION_CACHE.set(redis, key, outcome, generation)
+        return outcome
+    
+    # Never join an execution that started before the last override
+    flight_key = (key, DECISION_CACHE.generation)
+    shared = flight_key in DECISION_FLIGHTS
+    outcome = await DECISION_FLIGHTS.do(flight_key, decide_and_cache)
+    response.headers["X-Board-Decision-Cache"] = "coalesced" if shared else "miss"
+    return decision_response(outcome)
+
+def decision_response(outcome: Dict) -> Dict:
+    """Turn a stored outcome into the endpoint's response"""
+    if outcome["status_code"] != 200:
+        raise HTTPException(status_code=outcome["status_code"], detail=outcome["detail"])
+    return outcome["body"]
+
+async def build_team(members) -> Team:
+    """A Team of the given seats (the full board or a sub-team)"""
+    agents = [await board_of_directors.get(seat) for seat in members]
+    name = "EPIC Board of Directors" if tuple(members) == BOARD_SEATS else f"EPIC Board sub-team ({', '.join(members)})"
+    return Team(name=name, agents=agents, instructions=EPIC_TEAM_INSTRUCTIONS)
+
+# One Team per member set actually used
+TEAM_CACHE = TeamCache(build_team)
+
+async def execution_target(plan: ExecutionPlan):
+    """A single member, a sub-team or the full team, per the execution plan"""
+    if plan.tier == FAST:
+        return await board_of_directors.get(plan.members[0])
+    return await TEAM_CACHE.get(plan.members)
+
+async def run_target(target, query: str):
+    if isinstance(target, Team):
+        return await target.run(query)
+    # A single assistant streams by default
+    return await target.arun(query, stream=False)
+
+async def planned_chunks(plan: ExecutionPlan, query: str):
+    """Stream the planned members' answer to `query`"""
+    target = await execution_target(plan)
+    async for text in team_chunks(target, query):
+        yield text
+
+async def run_board_decision(task: dict, redis) -> Dict:
+    """
+    Assess, decide and (if approved) execute a task.
+    Returns a JSON-ready outcome that can be cached and shared.
+    """
+    decision = await assess_board_task(task, redis)
+    
+    if not decision["approved"]:
+        return {"status_code": 403, "detail": f"Board rejected: {decision['reason']}"}
+    
+    # Execute through the planned members if approved; a HALT cancels the run.
+    # Repeated queries to the same members under the same doctrine reuse the answer.
+    plan: ExecutionPlan = decision["plan"]
+    query = task.get("query", "")
+    members = [(BOARD_MEMBER_SPECS[seat]["name"], BOARD_MEMBER_SPECS[seat]["model_id"]) for seat in plan.members]
+    
+    async def execute():
+        target = await execution_target(plan)
+        return jsonable_encoder(await app.state.override_gate.guard(run_target(target, query)))
+    
+    start = time.perf_counter()
+    try:
+        response, response_cache = await RESPONSE_CACHE.run(
+            redis,
+            response_key(query, members, DOCTRINE_PROMPT.version),
+            execute,
+            use_cache=task.get("llm_cache", True) is not False
+        )
+    except OverrideHalted as e:
+        record_execution(plan, time.perf_counter() - start, "halted")
+        return {"status_code": 503, "detail": str(e)}
+    except Exception:
+        record_execution(plan, time.perf_counter() - start, "error")
+        raise
+    record_execution(plan, time.perf_counter() - start, response_cache)
+    
+    return {
+        "status_code": 200,
+        "body": jsonable_encoder({
+            "approved": decision["approved"],
+            "reason": decision["reason"],
+            "response": response,
+            "response_cache": response_cache,
+            "execution_plan": decision["execution_plan"],
+            "risk_assessments": decision["risk_assessments"],
+            "member_timings": decision["member_timings"]
+        })
+    }
+
+def record_execution(plan: ExecutionPlan, seconds: float, outcome: str):
+    """Latency by tier and by team size, with the doctrine tokens the run sent"""
+    EXECUTION_PLANNER.record(plan, seconds, outcome)
+    prompt_tokens = 0
+    if outcome != "hit":
+        for seat in plan.members:
+            spec = BOARD_MEMBER_SPECS[seat]
+            prompt_tokens += DOCTRINE_PROMPT.prompt_tokens(spec["name"], spec["specific_instructions"], spec["model_id"])
+    TEAM_SELECTOR.record(plan.members, seconds, outcome, prompt_tokens)
+
+async def assess_board_task(task: dict, redis) -> Dict:
+    """Collect risk assessments, reach the board's verdict and publish it"""
     # Collect risk assessments from relevant board members
-    assessments: List[RiskAssessment] = []
+    assessments: List[AssessmentRecord] = []
+    member_timings: List[MemberTiming] = []
+    ceo = await board_of_directors.get("CEO")
     
-    # Key members must assess
-    key_members = ["CEO", "CQO", "CSO", "CRO"]
+    if BOARD_CONSENSUS_SCOPE == "full":
+        # One scoring pass yields all 11 member verdicts
+        evaluation = evaluate_board(ceo.risk_framework, task)
+        assessments = evaluation.assessments
+        approved, reason = evaluation.consensus()
+    else:
+        # Key members must assess
+        key_members = ["CEO", "CQO", "CSO", "CRO"]
+        
+        # Assess concurrently, each member within its own deadline; members
+        # still running once the outcome is final are cancelled
+        members = [await board_of_directors.get(key) for key in key_members]
+        member_round = await assess_members(members, task)
+        assessments = member_round.assessments
+        member_timings = member_round.timings
+        approved, reason = member_round.decision
     
-    for member_key in key_members:
-        member = board_of_directors[member_key]
-        assessment = await member.assess_risk(task)
-        if assessment:
-            assessments.append(assessment)
+    # Shadow rules are compared once per decision, whatever the scope
+    if assessments and ceo.risk_framework:
+        ceo.risk_framework.shadow_compare(task, assessments[0])
     
-    # Get board consensus
-    risk_framework = board_of_directors["CEO"].risk_framework
-    approved, reason = await risk_framework.get_board_consensus(assessments)
+    # Validated models are only built here, at the API boundary
+    assessment_models = [a.to_model() for a in assessments]
+    
+    # Approved tasks run on the members their risk tier calls for
+    plan = EXECUTION_PLANNER.plan_assessments(assessments, task) if approved else None
     
     # Log decision
     decision_log = {
         "task": task,
-        "assessments": [a.model_dump() for a in assessments],
+        "assessments": [m.model_dump(mode="json") for m in assessment_models],
         "approved": approved,
-        "reason": reason
+        "reason": reason,
+        "member_timings": [t.to_dict() for t in member_timings],
+        "execution_plan": plan.to_dict() if plan else None
     }
     
-    background_tasks.add_task(
-        redis.lpush,
-        "board_decisions",
-        json.dumps(decision_log)
-    )
-    
-    if not approved:
-        raise HTTPException(status_code=403, detail=f"Board rejected: {reason}")
-    
-    # Execute through team if approved
-    response = await epic_team.run(task.get("query", ""))
+    await publish_decision(redis, decision_log)
     
     return {
         "approved": approved,
         "reason": reason,
-        "response": response,
-        "risk_assessments": [a.model_dump() for a in assessments]
+        "risk_assessments": decision_log["assessments"],
+        "member_timings": decision_log["member_timings"],
+        "execution_plan": decision_log["execution_plan"],
+        "plan": plan
+    }
+
+@app.post("/board/decision/stream")
+async def board_decision_stream(
+    task: dict,
+    request: Request,
+    redis = Depends(lambda: app.state.redis)
+):
+    """
+    Streaming variant of /board/decision (server-sent events): assessments
+    and the verdict first, then the team's answer as it is generated.
+    Never cached; stops on client disconnect or an override HALT.
+    """
+    if app.state.override_gate.halted:
+        raise HTTPException(status_code=503, detail="System halted by Edward Override")
+    
+    decision = {}
+    
+    async def decide():
+        decision.update(await assess_board_task(task, redis))
+        return decision
+    
+    events = board_decision_events(
+        decide=decide,
+        chunks=lambda: planned_chunks(decision["plan"], task.get("query", "")),
+        is_halted=lambda: app.state.override_gate.halted,
+        is_disconnected=request.is_disconnected
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/board/jobs", status_code=202)
+async def submit_board_job(task: dict, response: Response):
+    """Queue a task for board decision; poll /board/jobs/{job_id} for the result"""
+    if app.state.override_gate.halted:
+        raise HTTPException(status_code=503, detail="System halted by Edward Override")
+    
+    try:
+        job = await app.state.board_jobs.submit(task)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    
+    response.headers["Location"] = f"/board/jobs/{job.id}"
+    return {"job_id": job.id, "status": job.status, "queue_depth": app.state.board_jobs.depth}
+
+@app.get("/board/jobs/{job_id}")
+async def board_job_status(job_id: str, wait: float = 0):
+    """Job status and, once finished, its outcome; `wait` long-polls for up to 30 s"""
+    job = await app.state.board_jobs.wait(job_id, min(max(wait, 0), 30))
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown board job {job_id}")
+    return job
+
+@app.get("/board/metrics")
+async def board_metrics():
+    """Per-member assessment latency (ms) and outcome counts"""
+    metrics = {
+        "member_assessments": MEMBER_LATENCY.snapshot(),
+        "decision_cache": DECISION_CACHE.stats(),
+        "single_flight": DECISION_FLIGHTS.stats(),
+        "jobs": app.state.board_jobs.stats(),
+        "override": app.state.override_gate.stats(),
+        "board": board_of_directors.stats(),
+        "startup": app.state.startup,
+        "llm_response_cache": RESPONSE_CACHE.stats(),
+        "execution": EXECUTION_PLANNER.stats(),
+        "teams": dict(TEAM_SELECTOR.stats(), cache=TEAM_CACHE.stats()),
+        "llm_providers": LLM_POOL.stats(),
+        "prompts": PROMPT_ASSEMBLER.stats(),
+        "sessions": SESSION_CACHE.stats(),
+        "storage_writes": app.state.storage.write_behind.stats() if app.state.storage else None,
     }
+    if app.state.decision_worker is not None:
+        metrics["decision_stream"] = await app.state.decision_worker.stats()
+    return metrics
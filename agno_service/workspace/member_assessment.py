@@ -0,0 +1,144 @@
+"""
+Concurrent board member assessment with per-member deadlines
+
+Key members are assessed at the same time instead of one after another, so a
+decision takes as long as the slowest member still needed rather than the
+sum of all of them. Every member has a deadline; a member that misses it (or
+fails) either abstains or makes the board fail closed, per the configured
+policy. Once the outcome is final the remaining assessments are cancelled.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .consensus import StreamingConsensus, consensus_as_completed
+from .metrics import LatencyRegistry
+from .risk_management import AssessmentRecord
+
+logger = logging.getLogger(__name__)
+
+# A member that misses its deadline does not vote
+ABSTAIN = "abstain"
+# A member that misses its deadline makes the board reject the task
+FAIL_CLOSED = "fail_closed"
+TIMEOUT_POLICIES = (ABSTAIN, FAIL_CLOSED)
+
+DEFAULT_DEADLINE = float(os.getenv("BOARD_MEMBER_DEADLINE", "2.0"))
+DEFAULT_TIMEOUT_POLICY = os.getenv("BOARD_MEMBER_TIMEOUT_POLICY", FAIL_CLOSED).lower()
+
+# Per-member assessment latency and outcomes, for /board/metrics
+MEMBER_LATENCY = LatencyRegistry()
+
+
+def parse_deadlines(spec: Optional[str]) -> Dict[str, float]:
+    """Parse per-member overrides: 'CSO_Sentinel=1.5,CEO_Visionary=3'"""
+    deadlines = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        member, _, seconds = item.partition("=")
+        deadlines[member.strip()] = float(seconds)
+    return deadlines
+
+
+MEMBER_DEADLINES = parse_deadlines(os.getenv("BOARD_MEMBER_DEADLINES"))
+
+
+class MemberTiming:
+    """How one member's assessment went"""
+    __slots__ = ("member", "status", "elapsed", "deadline")
+
+    def __init__(self, member: str, status: str, elapsed: float, deadline: float):
+        self.member = member
+        # ok, abstained (no framework), timeout, error or cancelled
+        self.status = status
+        self.elapsed = elapsed
+        self.deadline = deadline
+
+    def to_dict(self) -> Dict:
+        return {
+            "member": self.member,
+            "status": self.status,
+            "elapsed_ms": round(self.elapsed * 1000.0, 3),
+            "deadline_ms": round(self.deadline * 1000.0, 3),
+        }
+
+
+class MemberRound:
+    """Outcome of assessing a set of members concurrently"""
+
+    def __init__(
+        self,
+        decision: Tuple[bool, str],
+        assessments: List[AssessmentRecord],
+        timings: List[MemberTiming],
+        cancelled: List[str],
+        elapsed: float
+    ):
+        self.decision = decision
+        self.assessments = assessments
+        self.timings = timings
+        self.cancelled = cancelled
+        self.elapsed = elapsed
+
+
+async def assess_members(
+    members: Sequence,
+    task: Dict,
+    deadlines: Optional[Dict[str, float]] = None,
+    default_deadline: float = DEFAULT_DEADLINE,
+    policy: str = DEFAULT_TIMEOUT_POLICY,
+    metrics: Optional[LatencyRegistry] = MEMBER_LATENCY
+) -> MemberRound:
+    """
+    Assess every member concurrently, each bounded by its own deadline, and
+    stop as soon as the board's decision is final. Members need a ``name``
+    and an async ``assess_risk(task)``.
+    """
+    if policy not in TIMEOUT_POLICIES:
+        raise ValueError(f"Unknown timeout policy: {policy}")
+    deadlines = MEMBER_DEADLINES if deadlines is None else deadlines
+    evaluator = StreamingConsensus(member.name for member in members)
+    timings: Dict[str, MemberTiming] = {}
+    started = time.perf_counter()
+
+    def finish(name: str, status: str, deadline: float, began: float):
+        elapsed = time.perf_counter() - began
+        timings[name] = MemberTiming(name, status, elapsed, deadline)
+        if metrics is not None:
+            metrics.record(name, elapsed, status)
+
+    async def timed(member) -> Optional[AssessmentRecord]:
+        name = member.name
+        deadline = deadlines.get(name, default_deadline)
+        began = time.perf_counter()
+        try:
+            assessment = await asyncio.wait_for(member.assess_risk(task), timeout=deadline)
+        except asyncio.TimeoutError:
+            finish(name, "timeout", deadline, began)
+            logger.warning(f"{name} missed its {deadline:.3f}s assessment deadline")
+            return _missed(evaluator, name, policy, f"{name} missed its assessment deadline")
+        except asyncio.CancelledError:
+            finish(name, "cancelled", deadline, began)
+            raise
+        except Exception as e:
+            finish(name, "error", deadline, began)
+            logger.error(f"{name} risk assessment failed: {e}")
+            return _missed(evaluator, name, policy, f"{name} risk assessment failed")
+        finish(name, "ok" if assessment is not None else "abstained", deadline, began)
+        return assessment
+
+    decision, cancelled = await consensus_as_completed(
+        evaluator, {member.name: timed(member) for member in members}
+    )
+    ordered = [timings[member.name] for member in members if member.name in timings]
+    return MemberRound(decision, list(evaluator.assessments), ordered, cancelled, time.perf_counter() - started)
+
+
+def _missed(evaluator: StreamingConsensus, member: str, policy: str, reason: str) -> None:
+    """Apply the timeout policy; returns None so the member is skipped"""
+    if policy == FAIL_CLOSED:
+        evaluator.fail(member, f"Failed closed: {reason}")
+    return None
@@ -0,0 +1,90 @@
+"""
+Lightweight in-process latency metrics
+
+Each LatencyStats keeps lifetime counters plus a bounded window of recent
+samples for percentiles, so recording is O(1) and memory stays flat.
+"""
+import os
+import threading
+from collections import Counter, deque
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class LatencyStats:
+    """Durations in seconds, reported in milliseconds"""
+
+    def __init__(self, window: int = 1024):
+        self._recent: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.outcomes: Counter = Counter()
+
+    def record(self, seconds: float, outcome: Optional[str] = None):
+        with self._lock:
+            self._recent.append(seconds)
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            if outcome:
+                self.outcomes[outcome] += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            recent = np.array(self._recent, dtype=np.float64)
+            count, total, longest = self.count, self.total, self.max
+            outcomes = dict(self.outcomes)
+        if recent.size:
+            p50, p95, p99 = (float(v) * 1000.0 for v in np.percentile(recent, (50, 95, 99)))
+        else:
+            p50 = p95 = p99 = None
+        return {
+            "count": count,
+            "mean_ms": total / count * 1000.0 if count else None,
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "max_ms": longest * 1000.0,
+            "outcomes": outcomes,
+        }
+
+
+class LatencyRegistry:
+    """Named LatencyStats created on first use"""
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._stats: Dict[str, LatencyStats] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> LatencyStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(name, LatencyStats(self.window))
+        return stats
+
+    def record(self, name: str, seconds: float, outcome: Optional[str] = None):
+        self[name].record(seconds, outcome)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {name: stats.snapshot() for name, stats in sorted(self._stats.items())}
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Current resident set size of this process, if the platform exposes it"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
@@ -0,0 +1,183 @@
+"""
+Edward Override gate
+
+Holds the HALT/ACTIVE state locally, so the check on every request is a
+plain attribute read. The gate follows `edward_override_channel` and
+re-reads `EDWARD_OVERRIDE_STATUS` after every (re)subscription and
+periodically, so a dropped pubsub connection or a missed message cannot
+leave the service running after a HALT. Team runs go through guard(), and a
+HALT cancels all of them and waits a bounded time for them to stop.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OVERRIDE_CHANNEL = "edward_override_channel"
+OVERRIDE_STATUS_KEY = "EDWARD_OVERRIDE_STATUS"
+HALT = "HALT"
+ACTIVE = "ACTIVE"
+
+# Re-read the status key this often even when no message arrives
+OVERRIDE_RESYNC_INTERVAL = float(os.getenv("OVERRIDE_RESYNC_INTERVAL", "5"))
+# How long a HALT waits for cancelled team runs to stop
+OVERRIDE_CANCEL_GRACE = float(os.getenv("OVERRIDE_CANCEL_GRACE", "1.0"))
+OVERRIDE_RECONNECT_MAX_BACKOFF = 5.0
+
+
+class OverrideHalted(Exception):
+    """Work refused or stopped because of an Edward Override HALT"""
+
+
+class OverrideGate:
+    """Local override state, kept in sync with Redis"""
+
+    def __init__(
+        self,
+        redis=None,
+        channel: str = OVERRIDE_CHANNEL,
+        status_key: str = OVERRIDE_STATUS_KEY,
+        resync_interval: float = OVERRIDE_RESYNC_INTERVAL,
+        cancel_grace: float = OVERRIDE_CANCEL_GRACE
+    ):
+        self.redis = redis
+        self.channel = channel
+        self.status_key = status_key
+        self.resync_interval = resync_interval
+        self.cancel_grace = cancel_grace
+        self.halted = False
+        # Bumped on every state change
+        self.version = 0
+        self._in_flight: Dict[asyncio.Task, bool] = {}
+        self._listeners: List[Callable[[bool], Awaitable[None]]] = []
+        self.halts = 0
+        self.cancelled = 0
+        self.overdue = 0
+        self.reconnects = 0
+        self.last_sync: Optional[float] = None
+        self.last_stop_seconds: Optional[float] = None
+
+    def on_change(self, listener: Callable[[bool], Awaitable[None]]):
+        """Call `await listener(halted)` after every state change"""
+        self._listeners.append(listener)
+
+    async def set_state(self, status: str, source: str = "local") -> bool:
+        """Apply HALT or ACTIVE/RESUME; returns whether the state changed"""
+        halted = status.upper() == HALT
+        if halted == self.halted:
+            return False
+        self.halted = halted
+        self.version += 1
+        start = time.perf_counter()
+        if halted:
+            self.halts += 1
+            logger.critical(f"EDWARD OVERRIDE HALT ({source}) - stopping {len(self._in_flight)} team runs")
+            tasks = list(self._in_flight)
+            for task in tasks:
+                self._in_flight[task] = True
+                task.cancel()
+        else:
+            logger.info(f"Edward Override resume ({source})")
+            tasks = []
+        for listener in self._listeners:
+            try:
+                await listener(halted)
+            except Exception as e:
+                logger.error(f"Override listener failed: {e}")
+        if tasks:
+            await self._await_stopped(tasks, start)
+        return True
+
+    async def _await_stopped(self, tasks: List[asyncio.Task], start: float):
+        _, still_running = await asyncio.wait(tasks, timeout=self.cancel_grace)
+        self.last_stop_seconds = time.perf_counter() - start
+        self.cancelled += len(tasks) - len(still_running)
+        if still_running:
+            self.overdue += len(still_running)
+            logger.error(f"{len(still_running)} team runs still running {self.cancel_grace}s after HALT")
+
+    def check(self):
+        """Raise OverrideHalted while halted"""
+        if self.halted:
+            raise OverrideHalted("System halted by Edward Override")
+
+    async def guard(self, awaitable: Awaitable):
+        """Run `awaitable` as a task that a HALT cancels; raises OverrideHalted if it does"""
+        if self.halted:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise OverrideHalted("System halted by Edward Override")
+        task = asyncio.ensure_future(awaitable)
+        self._in_flight[task] = False
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if self._in_flight.get(task):
+                raise OverrideHalted("Team run cancelled by Edward Override") from None
+            raise
+        finally:
+            self._in_flight.pop(task, None)
+
+    async def sync(self) -> bool:
+        """Re-read the status key"""
+        status = await self.redis.get(self.status_key)
+        self.last_sync = time.time()
+        return await self.set_state(status or ACTIVE, source="status key")
+
+    async def run(self):
+        """Follow the override channel until cancelled, reconnecting on errors"""
+        backoff = 0.1
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Anything published before the subscription is in the key
+                await self.sync()
+                backoff = 0.1
+                next_sync = time.monotonic() + self.resync_interval
+                while True:
+                    timeout = max(0.0, next_sync - time.monotonic())
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+                    if message is not None and message.get("type") == "message":
+                        await self._handle(message["data"])
+                    if time.monotonic() >= next_sync:
+                        await self.sync()
+                        next_sync = time.monotonic() + self.resync_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.reconnects += 1
+                logger.error(f"Override channel lost ({e}); reconnecting in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, OVERRIDE_RECONNECT_MAX_BACKOFF)
+            finally:
+                try:
+                    await asyncio.shield(pubsub.reset())
+                except Exception:
+                    pass
+
+    async def _handle(self, data):
+        try:
+            action = json.loads(data)["action"]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Error processing override: {e}")
+            return
+        if action in (HALT, "RESUME"):
+            await self.set_state(action, source="channel")
+
+    def stats(self) -> Dict:
+        return {
+            "halted": self.halted,
+            "version": self.version,
+            "in_flight": len(self._in_flight),
+            "halts": self.halts,
+            "cancelled": self.cancelled,
+            "overdue": self.overdue,
+            "reconnects": self.reconnects,
+            "last_sync": self.last_sync,
+            "last_stop_ms": None if self.last_stop_seconds is None else self.last_stop_seconds * 1000.0,
+        }
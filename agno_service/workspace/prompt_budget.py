@@ -0,0 +1,260 @@
+"""
+Token-budgeted prompt assembly for board members
+
+A member's prompt is the system prompt (doctrine prefix, role and
+instructions), tool schemas, the chat history window and the new message.
+Nothing bounded the total, so long sessions grew prompt cost and latency on
+every call. The assembler fits the history into what the model's budget
+leaves after everything else: the oldest turns are dropped first, always
+whole turns starting at a user message, and the system prompt is never
+trimmed. Token counts are cached per message text, so a history replayed
+on every turn is only tokenized once.
+
+Assistants are shared between requests, so what one run's prompt is
+fitted against (its system prompt and new message) and how it fit are
+kept in a PromptRun bound to the run's context, not on the assistant.
+"""
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .cache import TTLCache
+from .doctrine_prompt import count_tokens, tokenizer_for
+
+logger = logging.getLogger(__name__)
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "16000"))
+PROMPT_TOKEN_CACHE_SIZE = int(os.getenv("PROMPT_TOKEN_CACHE_SIZE", "8192"))
+# Role and separators around each chat message, as in OpenAI's accounting
+MESSAGE_OVERHEAD_TOKENS = 4
+TOKEN_CACHE_TTL = 24 * 3600.0
+
+
+def parse_budgets(spec: Optional[str]) -> Dict[str, int]:
+    """Parse per-model budgets: 'gpt-4o-mini=8000,gemini-1.5-flash=32000'"""
+    budgets = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        model, _, budget = item.partition("=")
+        budgets[model.strip()] = int(budget)
+    return budgets
+
+
+def _field(message: Any, name: str) -> Any:
+    return message.get(name) if isinstance(message, dict) else getattr(message, name, None)
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+class TokenCounter:
+    """Token counts by tokenizer and text, kept in a bounded LRU"""
+
+    def __init__(self, maxsize: int = PROMPT_TOKEN_CACHE_SIZE):
+        self.cache = TTLCache(maxsize=maxsize, ttl=TOKEN_CACHE_TTL, name="prompt_tokens")
+
+    def count(self, text: str, tokenizer: str) -> int:
+        if not text:
+            return 0
+        key = (tokenizer, text)
+        tokens = self.cache.get(key)
+        if tokens is None:
+            tokens = count_tokens(text, tokenizer)
+            self.cache.set(key, tokens)
+        return tokens
+
+    def message(self, message: Any, tokenizer: str) -> int:
+        return (
+            MESSAGE_OVERHEAD_TOKENS
+            + self.count(_text(_field(message, "content")), tokenizer)
+            + self.count(_text(_field(message, "tool_calls")), tokenizer)
+        )
+
+
+class PromptReport:
+    """How one prompt fit its budget"""
+    __slots__ = ("model_id", "budget", "fixed_tokens", "history_tokens", "kept_tokens", "dropped_messages")
+
+    def __init__(
+        self,
+        model_id: str,
+        budget: int,
+        fixed_tokens: int,
+        history_tokens: int,
+        kept_tokens: int,
+        dropped_messages: int
+    ):
+        self.model_id = model_id
+        self.budget = budget
+        self.fixed_tokens = fixed_tokens
+        self.history_tokens = history_tokens
+        self.kept_tokens = kept_tokens
+        self.dropped_messages = dropped_messages
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.history_tokens - self.kept_tokens
+
+    @property
+    def prompt_tokens(self) -> int:
+        return self.fixed_tokens + self.kept_tokens
+
+    @property
+    def over_budget(self) -> bool:
+        """The system prompt, tools and message alone exceed the budget"""
+        return self.fixed_tokens > self.budget
+
+    def to_dict(self) -> Dict:
+        return {
+            "model_id": self.model_id,
+            "budget": self.budget,
+            "prompt_tokens": self.prompt_tokens,
+            "fixed_tokens": self.fixed_tokens,
+            "history_tokens": self.history_tokens,
+            "kept_tokens": self.kept_tokens,
+            "dropped_messages": self.dropped_messages,
+            "tokens_saved": self.tokens_saved,
+            "over_budget": self.over_budget,
+        }
+
+
+class PromptRun:
+    """The prompt state of one assistant run"""
+    __slots__ = ("prefix", "tail", "reports", "parent")
+
+    def __init__(self, tail: Any = None, parent: Optional["PromptRun"] = None):
+        self.prefix = ""
+        self.tail = tail
+        self.reports: List[PromptReport] = []
+        self.parent = parent
+
+    @property
+    def report(self) -> Optional[PromptReport]:
+        """How the last prompt of this run fit its budget"""
+        return self.reports[-1] if self.reports else None
+
+    def record(self, report: PromptReport):
+        # Enclosing runs (a caller's prompt_run() block) see their members' prompts too
+        run = self
+        while run is not None:
+            run.reports.append(report)
+            run = run.parent
+
+
+PROMPT_RUN: contextvars.ContextVar[Optional[PromptRun]] = contextvars.ContextVar("prompt_run", default=None)
+
+
+@contextlib.contextmanager
+def prompt_run(tail: Any = None) -> Iterator[PromptRun]:
+    """
+    Bind a PromptRun to the current context for the block. Assistants open
+    one per run; callers wrap runs in one to read their reports.
+    """
+    run = PromptRun(tail, parent=PROMPT_RUN.get())
+    token = PROMPT_RUN.set(run)
+    try:
+        yield run
+    finally:
+        try:
+            PROMPT_RUN.reset(token)
+        except ValueError:
+            # A run's generator closed from another context (an abandoned stream)
+            pass
+
+
+class PromptAssembler:
+    """Fits chat history into each model's prompt token budget"""
+
+    def __init__(
+        self,
+        default_budget: int = PROMPT_TOKEN_BUDGET,
+        budgets: Optional[Dict[str, int]] = None,
+        counter: Optional[TokenCounter] = None
+    ):
+        self.default_budget = default_budget
+        self.budgets = dict(budgets or {})
+        self.counter = counter or TokenCounter()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.trimmed = 0
+        self.over_budget = 0
+        self.dropped_messages = 0
+        self.tokens_saved = 0
+
+    def budget_for(self, model_id: str) -> int:
+        return self.budgets.get(model_id, self.default_budget)
+
+    def fit(
+        self,
+        model_id: str,
+        history: Sequence[Any],
+        prefix: str = "",
+        tools: Optional[Sequence[Dict]] = None,
+        tail: Any = None
+    ) -> Tuple[List[Any], PromptReport]:
+        """
+        The newest history that fits beside `prefix` (the system prompt),
+        `tools` (schemas sent with the call) and `tail` (the new message or
+        messages). Returns the kept messages and a report.
+        """
+        tokenizer = tokenizer_for(model_id)
+        count = self.counter.count
+        budget = self.budget_for(model_id)
+
+        fixed = MESSAGE_OVERHEAD_TOKENS + count(prefix, tokenizer)
+        if tools:
+            fixed += count(_text(list(tools)), tokenizer)
+        if isinstance(tail, (list, tuple)):
+            fixed += sum(self.counter.message(message, tokenizer) for message in tail)
+        elif tail is not None:
+            fixed += MESSAGE_OVERHEAD_TOKENS + count(_text(tail), tokenizer)
+
+        sizes = [self.counter.message(message, tokenizer) for message in history]
+        total = sum(sizes)
+        available = max(0, budget - fixed)
+        start, kept = 0, total
+        if kept > available:
+            # Oldest first, then on to the next user turn so no tool result
+            # or reply loses the message it answers
+            while start < len(sizes) and kept > available:
+                kept -= sizes[start]
+                start += 1
+            while start < len(sizes) and _field(history[start], "role") != "user":
+                kept -= sizes[start]
+                start += 1
+
+        report = PromptReport(model_id, budget, fixed, total, kept, start)
+        with self._lock:
+            self.calls += 1
+            if start:
+                self.trimmed += 1
+                self.dropped_messages += start
+                self.tokens_saved += report.tokens_saved
+            if report.over_budget:
+                self.over_budget += 1
+        return list(history[start:]), report
+
+    def stats(self) -> Dict:
+        return {
+            "default_budget": self.default_budget,
+            "budgets": dict(self.budgets),
+            "calls": self.calls,
+            "trimmed": self.trimmed,
+            "over_budget": self.over_budget,
+            "dropped_messages": self.dropped_messages,
+            "tokens_saved": self.tokens_saved,
+            "token_counts": self.counter.cache.stats(),
+        }
+
+
+PROMPT_ASSEMBLER = PromptAssembler(budgets=parse_budgets(os.getenv("PROMPT_TOKEN_BUDGETS")))
@@ -0,0 +1,314 @@
+"""
+Offline re-scoring of stored board decisions
+
+Streams past decisions from Redis (the decision stream and the legacy
+``board_decisions`` list) and/or the ``board_decisions`` Postgres table through the current risk rules, spreads
+the work across a process pool in chunks and writes an NDJSON report of every
+decision whose member risk levels or consensus outcome would change.
+
+Memory stays bounded: sources are read page by page and at most
+``2 x workers`` chunks are in flight at any time.
+
+Usage:
+    python -m workspace.rescore --source redis --output flips.ndjson
+    python -m workspace.rescore --source postgres --workers 8 --chunk-size 5000
+    python -m workspace.rescore --rules candidate_rules.json --output flips.ndjson
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Set
+
+from .consensus import StreamingConsensus
+from .decision_stream import DECISION_STREAM
+from .risk_management import RiskLevel, RiskManagementFramework
+from .risk_rules import RuleRegistry
+from .rule_loader import load_rule_file
+
+logger = logging.getLogger(__name__)
+
+# Per-process frameworks keyed by rule file (None: the built-in rules)
+_frameworks: Dict[Optional[str], RiskManagementFramework] = {}
+
+
+def _framework_for(rules_path: Optional[str]) -> RiskManagementFramework:
+    framework = _frameworks.get(rules_path)
+    if framework is None:
+        registry = RuleRegistry(load_rule_file(rules_path)) if rules_path else None
+        framework = _frameworks[rules_path] = RiskManagementFramework("RESCORE", registry=registry)
+    return framework
+
+
+def _level_value(level) -> int:
+    """Stored levels are RiskLevel values (JSON mode) or names"""
+    if isinstance(level, str) and not level.isdigit():
+        return RiskLevel[level.upper()].value
+    return RiskLevel(int(level)).value
+
+
+def iter_redis_decisions(
+    redis_url: str, key: str = "board_decisions", page_size: int = 1000, client=None
+) -> Iterator[Dict]:
+    """
+    Page through the Redis decision list without loading it whole, oldest
+    first. Writers LPUSH new decisions onto the head while this runs, so the
+    length is read once and pages are taken from the tail with negative
+    indices: those positions keep pointing at the same records however many
+    are pushed, and decisions pushed after the snapshot are left out.
+    """
+    if client is None:
+        import redis
+
+        client = redis.Redis.from_url(redis_url, decode_responses=True)
+    length = client.llen(key)
+    # Position from the tail: 0 is the oldest decision
+    position = 0
+    while position < length:
+        end = -1 - position
+        start = -min(position + page_size, length)
+        page = client.lrange(key, start, end)
+        if not page:
+            break
+        for raw in reversed(page):
+            record = json.loads(raw)
+            record.setdefault("id", f"redis:{key}:{position}")
+            position += 1
+            yield record
+
+
+def iter_redis_stream_decisions(redis_url: str, stream: str = DECISION_STREAM, page_size: int = 1000) -> Iterator[Dict]:
+    """Page through the decision stream with XRANGE"""
+    import redis
+
+    client = redis.Redis.from_url(redis_url, decode_responses=True)
+    start = "-"
+    while True:
+        page = client.xrange(stream, min=start, count=page_size)
+        if not page:
+            break
+        for entry_id, fields in page:
+            record = json.loads(fields["decision"])
+            record["id"] = f"redis:{stream}:{entry_id}"
+            yield record
+        start = f"({page[-1][0]}"
+
+
+def iter_postgres_decisions(database_url: str, page_size: int = 1000) -> Iterator[Dict]:
+    """Stream the board_decisions table through a server-side cursor"""
+    import psycopg2
+
+    connection = psycopg2.connect(database_url)
+    try:
+        with connection.cursor(name="rescore_board_decisions") as cursor:
+            cursor.itersize = page_size
+            cursor.execute(
+                "SELECT id, task, risk_assessments, approved, reason FROM board_decisions ORDER BY timestamp"
+            )
+            for decision_id, task, assessments, approved, reason in cursor:
+                yield {
+                    "id": f"postgres:{decision_id}",
+                    "task": task,
+                    "assessments": assessments,
+                    "approved": approved,
+                    "reason": reason,
+                }
+    finally:
+        connection.close()
+
+
+def _is_scorable(record: Dict) -> bool:
+    """The batch scorer needs a string action and a numeric amount"""
+    task = record.get("task")
+    if not isinstance(task, dict) or not isinstance(record.get("assessments"), list):
+        return False
+    context = task.get("context", {})
+    return (
+        isinstance(task.get("action", ""), str)
+        and isinstance(context, dict)
+        and isinstance(context.get("amount", 0), (int, float))
+    )
+
+
+def chunked(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    chunk: List[Dict] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def rescore_chunk(records: List[Dict], rules_path: Optional[str] = None) -> Dict:
+    """
+    Re-score one chunk with the current rules, or the rule set in rules_path
+    (runs in a worker process). Returns the changed decisions and per-chunk counters.
+    """
+    framework = _framework_for(rules_path)
+
+    result = {"processed": 0, "errors": 0, "level_changes": 0, "consensus_flips": 0, "changes": []}
+    valid = []
+    for record in records:
+        if _is_scorable(record):
+            valid.append(record)
+        else:
+            result["errors"] += 1
+
+    batch = framework.assess_risk_batch([record["task"] for record in valid])
+    for index, record in enumerate(valid):
+        result["processed"] += 1
+        try:
+            change = _diff_decision(record, batch, index)
+        except (KeyError, ValueError, TypeError):
+            result["errors"] += 1
+            continue
+        if change:
+            result["changes"].append(change)
+            result["level_changes"] += bool(change["level_changes"])
+            result["consensus_flips"] += change["old_approved"] != change["new_approved"]
+    return result
+
+
+def _diff_decision(record: Dict, batch, index: int) -> Optional[Dict]:
+    new_level = int(batch.risk_levels[index])
+    level_changes = []
+    members = []
+    for stored in record["assessments"]:
+        members.append(stored["assessed_by"])
+        old_level = _level_value(stored["risk_level"])
+        if old_level != new_level:
+            level_changes.append({
+                "member": stored["assessed_by"],
+                "old_level": RiskLevel(old_level).name,
+                "new_level": RiskLevel(new_level).name,
+            })
+
+    # Same members, same order, new rules
+    prototype = batch.framework._compose_assessment(batch.category_scores_at(index), batch.rules.version)
+    consensus = StreamingConsensus(members)
+    for member in members:
+        consensus.add(prototype.copy(assessed_by=member))
+    new_approved, new_reason = consensus.finish()
+
+    old_approved = bool(record.get("approved"))
+    if not level_changes and old_approved == new_approved:
+        return None
+    return {
+        "id": record.get("id"),
+        "action": record["task"].get("action", ""),
+        "level_changes": level_changes,
+        "old_approved": old_approved,
+        "new_approved": new_approved,
+        "old_reason": record.get("reason"),
+        "new_reason": new_reason,
+        "rule_version": batch.rules.version,
+    }
+
+
+def run_rescore(
+    records: Iterable[Dict],
+    output: IO[str],
+    chunk_size: int = 2000,
+    workers: int = 0,
+    progress_interval: float = 5.0,
+    rules_path: Optional[str] = None
+) -> Dict:
+    """
+    Re-score every record and write changed decisions to output as NDJSON.
+    workers=0 runs inline; otherwise chunks go to a process pool with at
+    most 2 x workers chunks in flight. Returns the summary counters.
+    """
+    summary = {"processed": 0, "errors": 0, "level_changes": 0, "consensus_flips": 0}
+    started = last_report = time.monotonic()
+
+    def collect(result: Dict):
+        nonlocal last_report
+        for change in result.pop("changes"):
+            output.write(json.dumps(change) + "\n")
+        for counter, value in result.items():
+            summary[counter] += value
+        now = time.monotonic()
+        if now - last_report >= progress_interval:
+            last_report = now
+            rate = summary["processed"] / max(now - started, 1e-9)
+            logger.info(
+                f"Rescored {summary['processed']:,} decisions ({rate:,.0f}/s), "
+                f"{summary['level_changes']:,} level changes, {summary['consensus_flips']:,} consensus flips"
+            )
+
+    chunks = chunked(records, chunk_size)
+    if workers <= 0:
+        for chunk in chunks:
+            collect(rescore_chunk(chunk, rules_path))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight: Set[Future] = set()
+            for chunk in chunks:
+                if len(in_flight) >= 2 * workers:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+                in_flight.add(pool.submit(rescore_chunk, chunk, rules_path))
+            for future in in_flight:
+                collect(future.result())
+
+    elapsed = time.monotonic() - started
+    summary["elapsed_seconds"] = round(elapsed, 3)
+    summary["decisions_per_second"] = round(summary["processed"] / elapsed, 1) if elapsed else 0.0
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-score stored board decisions with the current risk rules")
+    parser.add_argument("--source", choices=["redis", "postgres", "all"], default="all")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://redis:6379"))
+    parser.add_argument("--redis-key", default="board_decisions", help="Legacy decision list")
+    parser.add_argument("--redis-stream", default=DECISION_STREAM)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", default="-", help="NDJSON report path, '-' for stdout")
+    parser.add_argument("--progress-interval", type=float, default=5.0)
+    parser.add_argument("--rules", help="Rule set JSON file to score with instead of the built-in rules")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.rules:
+        # Fail before any worker starts if the candidate rules don't compile
+        logger.info(f"Scoring with rule set {load_rule_file(args.rules).version}")
+
+    def records() -> Iterator[Dict]:
+        if args.source == "redis":
+            yield from iter_redis_stream_decisions(args.redis_url, args.redis_stream)
+        if args.source in ("redis", "all"):
+            # Stream entries are persisted to Postgres, so "all" skips the stream
+            yield from iter_redis_decisions(args.redis_url, args.redis_key)
+        if args.source in ("postgres", "all"):
+            if not args.database_url:
+                raise SystemExit("DATABASE_URL is required to read the board_decisions table")
+            yield from iter_postgres_decisions(args.database_url)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        summary = run_rescore(
+            records(), output,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            progress_interval=args.progress_interval,
+            rules_path=args.rules
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    logger.info(f"Rescore complete: {json.dumps(summary)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Exact-match cache for team responses
+
+A repeated query (scheduled reports, recurring checks) reuses the team's
+earlier answer instead of another multi-model run. The key covers the
+normalized query, the team members and their model IDs, and the doctrine
+version, so any change to who answers or under which doctrine misses the
+cache. An in-process LRU sits in front of Redis; both expire after a TTL.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+from .cache import TTLCache
+from .metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL = float(os.getenv("LLM_RESPONSE_CACHE_TTL", "300"))
+RESPONSE_CACHE_SIZE = int(os.getenv("LLM_RESPONSE_CACHE_SIZE", "256"))
+RESPONSE_CACHE_PREFIX = "llm_response_cache:"
+
+HIT = "hit"
+MISS = "miss"
+BYPASS = "bypass"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Unicode-normalized query with whitespace collapsed; case is kept"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", query)).strip()
+
+
+def response_key(query: str, members: Sequence[Tuple[str, str]], doctrine_version: str) -> str:
+    """Cache key for a query answered by `members` ((name, model_id) pairs)"""
+    canonical = json.dumps(
+        [normalize_query(query), sorted(members), doctrine_version],
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-level response cache. Each entry keeps how long the run took, so a
+    hit can report the latency it saved. Responses must be JSON-serializable.
+    """
+
+    def __init__(
+        self,
+        ttl: float = RESPONSE_CACHE_TTL,
+        maxsize: int = RESPONSE_CACHE_SIZE,
+        prefix: str = RESPONSE_CACHE_PREFIX
+    ):
+        self.ttl = ttl
+        self.prefix = prefix
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl, name="llm_responses")
+        self.run_latency = LatencyStats()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.saved_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.local.maxsize > 0
+
+    async def get(self, redis, key: str) -> Optional[Dict]:
+        """Stored entry {"response", "elapsed", "created_at"} or None"""
+        entry = self.local.get(key)
+        if entry is not None or redis is None:
+            return entry
+        try:
+            raw = await redis.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        self.redis_hits += 1
+        self.local.set(key, entry)
+        return entry
+
+    async def set(self, redis, key: str, response: Any, elapsed: float):
+        entry = {"response": response, "elapsed": elapsed, "created_at": time.time()}
+        self.local.set(key, entry)
+        if redis is None:
+            return
+        try:
+            await redis.set(self.prefix + key, json.dumps(entry), ex=max(1, int(round(self.ttl))))
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    async def run(
+        self,
+        redis,
+        key: str,
+        execute: Callable[[], Awaitable[Any]],
+        use_cache: bool = True
+    ) -> Tuple[Any, str]:
+        """The cached response for `key`, or execute() and store it; returns (response, hit|miss|bypass)"""
+        if not use_cache or not self.enabled:
+            self.bypassed += 1
+            return await execute(), BYPASS
+        entry = await self.get(redis, key)
+        if entry is not None:
+            self.hits += 1
+            self.saved_seconds += entry["elapsed"]
+            return entry["response"], HIT
+        self.misses += 1
+        start = time.perf_counter()
+        response = await execute()
+        elapsed = time.perf_counter() - start
+        self.run_latency.record(elapsed)
+        await self.set(redis, key, response, elapsed)
+        return response, MISS
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_seconds": self.saved_seconds,
+            "run_latency": self.run_latency.snapshot(),
+            "local": self.local.stats(),
+        }
+
+
+RESPONSE_CACHE = ResponseCache()
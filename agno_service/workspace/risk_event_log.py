@@ -0,0 +1,171 @@
+"""
+Asynchronous, sampled NDJSON logging for risk assessments
+
+assess_risk only samples and enqueues a snapshot of the assessment; a
+background writer thread encodes queued events and flushes them in batches,
+so the event loop never blocks on log I/O. When the queue is full events
+are dropped and counted instead of waiting.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, IO, List, Optional
+
+if TYPE_CHECKING:
+    from .risk_management import AssessmentRecord
+
+logger = logging.getLogger(__name__)
+
+# Share of assessments written per risk level; HIGH and above are always kept
+DEFAULT_SAMPLE_RATES = {"LOW": 0.1, "MEDIUM": 1.0, "HIGH": 1.0, "CRITICAL": 1.0, "EXTREME": 1.0}
+ALWAYS_LOGGED = ("HIGH", "CRITICAL", "EXTREME")
+
+
+def parse_sample_rates(spec: Optional[str]) -> Dict[str, float]:
+    """Parse 'LOW=0.05,MEDIUM=0.5' on top of the defaults"""
+    rates = dict(DEFAULT_SAMPLE_RATES)
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        level, _, rate = item.partition("=")
+        level = level.strip().upper()
+        if level not in rates:
+            raise ValueError(f"Unknown risk level in sample rates: {level}")
+        rate = min(1.0, max(0.0, float(rate)))
+        if level in ALWAYS_LOGGED and rate < 1.0:
+            raise ValueError(f"{level} assessments are always logged; sample rate must be 1.0")
+        rates[level] = rate
+    return rates
+
+
+class RiskEventLogger:
+    """Queue risk assessments for a background NDJSON writer"""
+
+    def __init__(
+        self,
+        stream: Optional[IO[str]] = None,
+        path: Optional[str] = None,
+        queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        sample_rates: Optional[Dict[str, float]] = None,
+        rng: Callable[[], float] = random.random
+    ):
+        self.stream = stream
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_rates = dict(sample_rates or DEFAULT_SAMPLE_RATES)
+        self.sample_rates.update((level, 1.0) for level in ALWAYS_LOGGED)
+        self._rng = rng
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._start_lock = threading.Lock()
+
+        self.submitted = 0
+        self.sampled_out = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.write_errors = 0
+
+    def submit(self, record: "AssessmentRecord") -> bool:
+        """
+        Sample and enqueue an assessment without blocking.
+        Returns True if it was queued.
+        """
+        self.submitted += 1
+        rate = self.sample_rates.get(record.risk_level.name, 1.0)
+        if rate < 1.0 and self._rng() >= rate:
+            self.sampled_out += 1
+            return False
+
+        if self._thread is None:
+            self.start()
+        event = {"event": "risk_assessment", "logged_at": time.time(), "sample_rate": rate}
+        # Snapshot now: the caller keeps the record and may change it
+        event.update(record.to_dict())
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="risk-event-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Flush everything queued and stop the writer thread"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping.set()
+        thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> Dict:
+        return {
+            "submitted": self.submitted,
+            "sampled_out": self.sampled_out,
+            "dropped": self.dropped,
+            "written": self.written,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+            "queued": self._queue.qsize(),
+        }
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                if self._stopping.is_set():
+                    return
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: List[Dict]):
+        payload = "\n".join(json.dumps(event) for event in batch) + "\n"
+        try:
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as handle:
+                    handle.write(payload)
+            else:
+                stream = self.stream or sys.stdout
+                stream.write(payload)
+                stream.flush()
+        except Exception:
+            self.write_errors += 1
+            logger.exception("Failed to write risk assessment events")
+            return
+        self.written += len(batch)
+        self.batches += 1
+
+
+RISK_EVENT_LOG = RiskEventLogger(
+    path=os.getenv("RISK_EVENT_LOG_PATH") or None,
+    queue_size=int(os.getenv("RISK_EVENT_LOG_QUEUE_SIZE", "10000")),
+    batch_size=int(os.getenv("RISK_EVENT_LOG_BATCH_SIZE", "256")),
+    flush_interval=float(os.getenv("RISK_EVENT_LOG_FLUSH_INTERVAL", "0.5")),
+    sample_rates=parse_sample_rates(os.getenv("RISK_EVENT_LOG_SAMPLE_RATES"))
+)
+atexit.register(RISK_EVENT_LOG.stop)
@@ -0,0 +1,189 @@
+"""
+Bounded, compact store for a framework's risk assessment history
+
+Assessments are kept in a fixed-capacity ring buffer of NumPy arrays instead
+of a list of pydantic objects, so a long-running worker's memory stays flat.
+Each retained assessment costs BYTES_PER_ENTRY bytes:
+
+    risk level            uint8       1
+    capped risk score     float32     4
+    category bitmask      uint8       1
+    timestamp (us, UTC)   int64       8
+    per-category scores   7 x float64 56
+    rule version index    uint16      2
+                                      --
+                                      72 bytes
+
+Per-category scores are kept at full precision so RiskAssessment objects
+rebuilt for the most recent entries match the originals exactly. Rule
+version strings are interned once per history and referenced by index.
+"""
+import os
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+from .risk_management import AssessmentRecord, RiskAssessment, RiskCategory, RiskLevel
+
+if TYPE_CHECKING:
+    from .risk_management import RiskManagementFramework
+
+DEFAULT_CAPACITY = int(os.getenv("RISK_HISTORY_CAPACITY", "10000"))
+
+# Bit order of the category bitmask; also the order categories are listed on an assessment
+CATEGORY_BITS = (
+    RiskCategory.SECURITY,
+    RiskCategory.FINANCIAL,
+    RiskCategory.PRIVACY,
+    RiskCategory.OPERATIONAL,
+    RiskCategory.REPUTATIONAL,
+    RiskCategory.LEGAL,
+    RiskCategory.TECHNICAL,
+)
+
+# Percentiles are tracked on a 0.1 grid over the capped 0-10 score range
+SCORE_RESOLUTION = 0.1
+_SCORE_BINS = int(round(10.0 / SCORE_RESOLUTION)) + 1
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+BYTES_PER_ENTRY = (
+    np.dtype(np.uint8).itemsize          # risk level
+    + np.dtype(np.float32).itemsize      # risk score
+    + np.dtype(np.uint8).itemsize        # category bitmask
+    + np.dtype(np.int64).itemsize        # timestamp
+    + len(CATEGORY_BITS) * np.dtype(np.float64).itemsize  # per-category scores
+    + np.dtype(np.uint16).itemsize       # rule version index
+)
+
+
+class RiskHistory:
+    """
+    Fixed-capacity ring buffer of risk assessments with running statistics.
+    Counters and the score histogram are updated in O(1) per assessment.
+    """
+
+    def __init__(self, framework: "RiskManagementFramework", capacity: Optional[int] = None):
+        self.framework = framework
+        self.capacity = DEFAULT_CAPACITY if capacity is None else capacity
+        if self.capacity < 1:
+            raise ValueError(f"Risk history capacity must be at least 1, got {self.capacity}")
+
+        self.levels = np.zeros(self.capacity, dtype=np.uint8)
+        self.scores = np.zeros(self.capacity, dtype=np.float32)
+        self.category_bits = np.zeros(self.capacity, dtype=np.uint8)
+        self.timestamps = np.zeros(self.capacity, dtype=np.int64)
+        self.category_scores = np.zeros((self.capacity, len(CATEGORY_BITS)), dtype=np.float64)
+        self.rule_version_ids = np.zeros(self.capacity, dtype=np.uint16)
+        self._rule_versions: List[Optional[str]] = []
+        self._rule_version_ids: Dict[Optional[str], int] = {}
+
+        self._next = 0
+        self._size = 0
+        # Lifetime counters
+        self.total_recorded = 0
+        self.level_counts: Dict[RiskLevel, int] = {level: 0 for level in RiskLevel}
+        self.category_counts: Dict[RiskCategory, int] = {category: 0 for category in RiskCategory}
+        self.rule_version_counts: Dict[Optional[str], int] = {}
+        # Score histogram over the retained window
+        self._score_histogram = np.zeros(_SCORE_BINS, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the buffer arrays"""
+        return (
+            self.levels.nbytes + self.scores.nbytes + self.category_bits.nbytes
+            + self.timestamps.nbytes + self.category_scores.nbytes + self.rule_version_ids.nbytes
+        )
+
+    def record(self, assessment: AssessmentRecord, category_scores: Dict[RiskCategory, float]):
+        """Append an assessment, overwriting the oldest one when full"""
+        slot = self._next
+        if self._size == self.capacity:
+            self._score_histogram[self._score_bin(self.scores[slot])] -= 1
+        else:
+            self._size += 1
+
+        bits = 0
+        row = self.category_scores[slot]
+        row[:] = 0.0
+        for position, category in enumerate(CATEGORY_BITS):
+            if category in category_scores:
+                bits |= 1 << position
+                row[position] = category_scores[category]
+
+        self.levels[slot] = assessment.risk_level.value
+        self.scores[slot] = assessment.risk_score
+        self.category_bits[slot] = bits
+        self.timestamps[slot] = (assessment.assessment_timestamp - _EPOCH) // _MICROSECOND
+        self.rule_version_ids[slot] = self._rule_version_id(assessment.rule_version)
+
+        self._score_histogram[self._score_bin(self.scores[slot])] += 1
+        self.total_recorded += 1
+        self.level_counts[assessment.risk_level] += 1
+        for category in category_scores:
+            self.category_counts[category] += 1
+        self.rule_version_counts[assessment.rule_version] = self.rule_version_counts.get(assessment.rule_version, 0) + 1
+
+        self._next = (slot + 1) % self.capacity
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Nearest-rank percentile (0-100) of risk scores in the retained window,
+        to SCORE_RESOLUTION. Returns None when the history is empty.
+        """
+        if not self._size:
+            return None
+        rank = max(1, int(np.ceil(q / 100.0 * self._size)))
+        bin_index = int(np.searchsorted(np.cumsum(self._score_histogram), rank))
+        return round(bin_index * SCORE_RESOLUTION, 10)
+
+    def stats(self) -> Dict:
+        """Running counters and rolling-window percentiles"""
+        return {
+            "retained": self._size,
+            "capacity": self.capacity,
+            "total_recorded": self.total_recorded,
+            "level_counts": {level.name: count for level, count in self.level_counts.items()},
+            "category_counts": {category.value: count for category, count in self.category_counts.items()},
+            "rule_version_counts": dict(self.rule_version_counts),
+            "score_percentiles": {f"p{q}": self.percentile(q) for q in (50, 90, 99)},
+        }
+
+    def recent(self, n: Optional[int] = None) -> List[RiskAssessment]:
+        """Rebuild full assessments for the last n entries, oldest first"""
+        count = self._size if n is None else min(n, self._size)
+        slots = [(self._next - count + i) % self.capacity for i in range(count)]
+        return [self._rebuild(slot) for slot in slots]
+
+    def _rebuild(self, slot: int) -> RiskAssessment:
+        bits = int(self.category_bits[slot])
+        category_scores = {
+            category: float(self.category_scores[slot, position])
+            for position, category in enumerate(CATEGORY_BITS)
+            if bits & (1 << position)
+        }
+        record = self.framework._compose_assessment(
+            category_scores, self._rule_versions[self.rule_version_ids[slot]]
+        )
+        record.assessment_timestamp = _EPOCH + int(self.timestamps[slot]) * _MICROSECOND
+        return record.to_model()
+
+    def _rule_version_id(self, version: Optional[str]) -> int:
+        version_id = self._rule_version_ids.get(version)
+        if version_id is None:
+            version_id = len(self._rule_versions)
+            if version_id > np.iinfo(np.uint16).max:
+                raise ValueError("Too many distinct rule versions in one risk history")
+            self._rule_versions.append(version)
+            self._rule_version_ids[version] = version_id
+        return version_id
+
+    @staticmethod
+    def _score_bin(score: float) -> int:
+        return min(_SCORE_BINS - 1, max(0, int(round(float(score) / SCORE_RESOLUTION))))
@@ -1,9 +1,15 @@
 from enum import Enum
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Mapping, Optional, Sequence, Tuple, Union
 from datetime import datetime
 import json
 import logging
+import os
+import random
+
+from .cache import TTLCache
+from .risk_event_log import RISK_EVENT_LOG
+from .risk_rules import KeywordMatcher, RuleRegistry, RuleSet, RULE_REGISTRY
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +20,14 @@ class RiskLevel(Enum):
     CRITICAL = 4
     EXTREME = 5
 
+# Upper score bound (inclusive) of every level below EXTREME
+RISK_LEVEL_THRESHOLDS: Tuple[Tuple[RiskLevel, float], ...] = (
+    (RiskLevel.LOW, 2.0),
+    (RiskLevel.MEDIUM, 5.0),
+    (RiskLevel.HIGH, 8.0),
+    (RiskLevel.CRITICAL, 12.0),
+)
+
 class RiskCategory(Enum):
     FINANCIAL = "financial"
     SECURITY = "security"
@@ -23,6 +37,21 @@ class RiskCategory(Enum):
     TECHNICAL = "technical"
     PRIVACY = "privacy"
 
+# Board members whose HIGH+ assessment vetoes a decision. This is the
+# security, risk and quality seats get_board_consensus has always used, not
+# the BOARD_ROLES veto_power flags: the CEO holds veto_power there but its
+# HIGH assessment only withholds an approval vote.
+VETO_AGENTS = ("CSO_Sentinel", "CRO_Guardian", "CQO_Oracle")
+# Approval votes (MEDIUM risk or lower) needed for the board to proceed
+APPROVAL_THRESHOLD = 7
+
+# Process-wide cache of rule evaluations shared by every board member
+ASSESSMENT_CACHE = TTLCache(
+    maxsize=int(os.getenv("RISK_ASSESSMENT_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("RISK_ASSESSMENT_CACHE_TTL", "300")),
+    name="risk_assessments"
+)
+
 class RiskAssessment(BaseModel):
     risk_level: RiskLevel
     risk_score: float = Field(ge=0.0, le=10.0)
@@ -34,74 +63,300 @@ class RiskAssessment(BaseModel):
     confidence_level: float = Field(ge=0.0, le=1.0)
     assessed_by: str
     assessment_timestamp: datetime = Field(default_factory=datetime.utcnow)
+    rule_version: Optional[str] = None
+
+class AssessmentRecord:
+    """
+    Unvalidated risk assessment used on the hot path.
+    Carries the same fields as RiskAssessment; the pydantic model is only
+    built (and validated) at the API boundary with to_model().
+    """
+    __slots__ = (
+        "risk_level", "risk_score", "categories", "pros", "cons",
+        "mitigation_strategies", "requires_human_approval", "confidence_level",
+        "assessed_by", "assessment_timestamp", "rule_version"
+    )
+    
+    def __init__(
+        self,
+        risk_level: RiskLevel,
+        risk_score: float,
+        categories: List[RiskCategory],
+        pros: List[str],
+        cons: List[str],
+        mitigation_strategies: List[str],
+        requires_human_approval: bool,
+        confidence_level: float,
+        assessed_by: str,
+        assessment_timestamp: Optional[datetime] = None,
+        rule_version: Optional[str] = None
+    ):
+        self.risk_level = risk_level
+        self.risk_score = risk_score
+        self.categories = categories
+        self.pros = pros
+        self.cons = cons
+        self.mitigation_strategies = mitigation_strategies
+        self.requires_human_approval = requires_human_approval
+        self.confidence_level = confidence_level
+        self.assessed_by = assessed_by
+        self.assessment_timestamp = assessment_timestamp or datetime.utcnow()
+        self.rule_version = rule_version
+    
+    def __repr__(self) -> str:
+        return (
+            f"AssessmentRecord(assessed_by={self.assessed_by!r}, risk_level={self.risk_level.name}, "
+            f"risk_score={self.risk_score}, categories={[c.value for c in self.categories]}, "
+            f"rule_version={self.rule_version!r})"
+        )
+    
+    def copy(self, **changes) -> "AssessmentRecord":
+        """Copy with fresh lists, optionally overriding fields"""
+        record = AssessmentRecord(
+            risk_level=self.risk_level,
+            risk_score=self.risk_score,
+            categories=list(self.categories),
+            pros=list(self.pros),
+            cons=list(self.cons),
+            mitigation_strategies=list(self.mitigation_strategies),
+            requires_human_approval=self.requires_human_approval,
+            confidence_level=self.confidence_level,
+            assessed_by=self.assessed_by,
+            assessment_timestamp=self.assessment_timestamp,
+            rule_version=self.rule_version
+        )
+        for field, value in changes.items():
+            setattr(record, field, value)
+        return record
+    
+    def to_dict(self) -> Dict:
+        """JSON-ready dict, equal to RiskAssessment.model_dump(mode="json")"""
+        return {
+            "risk_level": self.risk_level.value,
+            "risk_score": self.risk_score,
+            "categories": [category.value for category in self.categories],
+            "pros": list(self.pros),
+            "cons": list(self.cons),
+            "mitigation_strategies": list(self.mitigation_strategies),
+            "requires_human_approval": self.requires_human_approval,
+            "confidence_level": self.confidence_level,
+            "assessed_by": self.assessed_by,
+            "assessment_timestamp": self.assessment_timestamp.isoformat(),
+            "rule_version": self.rule_version
+        }
+    
+    def to_model(self) -> RiskAssessment:
+        """Build the validated pydantic model"""
+        return RiskAssessment(
+            risk_level=self.risk_level,
+            risk_score=self.risk_score,
+            categories=self.categories,
+            pros=self.pros,
+            cons=self.cons,
+            mitigation_strategies=self.mitigation_strategies,
+            requires_human_approval=self.requires_human_approval,
+            confidence_level=self.confidence_level,
+            assessed_by=self.assessed_by,
+            assessment_timestamp=self.assessment_timestamp,
+            rule_version=self.rule_version
+        )
     
 class RiskManagementFramework:
     """
     V8 Risk Management Framework - Core risk assessment logic
     """
     
-    def __init__(self, agent_name: str):
+    def __init__(
+        self,
+        agent_name: str,
+        matcher: Optional[KeywordMatcher] = None,
+        history_capacity: Optional[int] = None,
+        registry: Optional[RuleRegistry] = None
+    ):
+        from .risk_history import RiskHistory
+        
         self.agent_name = agent_name
-        self.risk_history: List[RiskAssessment] = []
+        # Rules come from the process-wide registry unless this framework is
+        # pinned to its own, so a hot reload reaches every board member at once
+        if registry is None and matcher is not None:
+            registry = RuleRegistry(RuleSet(f"custom-{matcher.fingerprint}", matcher=matcher))
+        self.registry = registry or RULE_REGISTRY
+        self.risk_history = RiskHistory(self, capacity=history_capacity)
+    
+    @property
+    def rules(self) -> RuleSet:
+        """The active rule set; take it once per assessment"""
+        return self.registry.active
+    
+    @property
+    def matcher(self) -> KeywordMatcher:
+        return self.registry.active.matcher
+    
+    @property
+    def rules_fingerprint(self) -> str:
+        return self.registry.active.fingerprint
+        
+    async def assess_risk(self, task: Dict) -> AssessmentRecord:
+        """
+        Comprehensive risk assessment for any proposed action.
+        Returns a lightweight record; call to_model() for a validated RiskAssessment.
+        """
+        rules = self.registry.active
+        category_scores, prototype, shared = self._evaluate(task, rules)
+        
+        # A cached prototype is shared by every board member: hand out a copy
+        # stamped with this member's name, with lists the caller may mutate
+        assessment = prototype.copy(
+            assessed_by=self.agent_name,
+            assessment_timestamp=datetime.utcnow()
+        ) if shared else prototype
+        
+        self.record(assessment, category_scores)
+        return assessment
+    
+    def record(self, assessment: AssessmentRecord, category_scores: Dict[RiskCategory, float]):
+        """Add an assessment to the history and the risk event log (sampled and written off the request path)"""
+        self.risk_history.record(assessment, category_scores)
+        RISK_EVENT_LOG.submit(assessment)
+    
+    def shadow_compare(self, task: Dict, assessment: AssessmentRecord):
+        """
+        Score the task with the shadow candidate, if any, and record whether
+        it agrees with `assessment`. Called once per board decision: every
+        member scores with the same rules, so one comparison stands for all.
+        """
+        shadow = self.registry.shadow
+        stats = self.registry.shadow_stats
+        if shadow is None or stats is None or (self.registry.shadow_sample_rate < 1.0 and random.random() >= self.registry.shadow_sample_rate):
+            return
+        try:
+            _, shadow_assessment, _ = self._evaluate(task, shadow)
+        except Exception:
+            logger.exception(f"Shadow rules {shadow.version} failed to score task")
+            return
+        stats.record(assessment.risk_level, shadow_assessment.risk_level)
+    
+    def assess_risk_batch(self, tasks: Sequence[Dict]) -> "RiskBatchResult":
+        """
+        Score a whole batch of tasks with NumPy array operations.
+        Returns columnar results; RiskAssessment objects are only built on demand.
+        Batch results are not added to the risk history or logged.
+        """
+        from .risk_batch import score_batch
+        return score_batch(self, tasks)
+    
+    def _evaluate(
+        self, task: Dict, rules: Optional[RuleSet] = None
+    ) -> Tuple[Dict[RiskCategory, float], AssessmentRecord, bool]:
+        """
+        Run the rules (the active set unless given) for a task, through the
+        shared assessment cache. Returns the category scores, the assessment
+        and whether that assessment is a shared cache entry that must be
+        copied before use.
+        """
+        rules = rules or self.registry.active
+        cache_key = self._cache_key(task, rules)
+        cached = ASSESSMENT_CACHE.get(cache_key) if cache_key else None
+        if cached is not None:
+            category_scores, prototype = cached
+            return category_scores, prototype, True
+        
+        category_scores = self._score_categories(task, rules)
+        prototype = self._compose_assessment(category_scores, rules.version)
+        if cache_key:
+            ASSESSMENT_CACHE.set(cache_key, (category_scores, prototype))
+        return category_scores, prototype, bool(cache_key)
+    
+    def _cache_key(self, task: Dict, rules: Optional[RuleSet] = None) -> Optional[Tuple]:
+        """
+        Canonical key of everything that affects scoring: the rules (version
+        and content), the normalized action and the amount tier. None when the
+        task can't be cached.
+        """
+        rules = rules or self.registry.active
+        action = task.get("action", "")
+        context = task.get("context", {})
+        if not isinstance(action, str) or not isinstance(context, dict):
+            return None
         
-    async def assess_risk(self, task: Dict) -> RiskAssessment:
+        amount = context.get("amount", 0)
+        if not isinstance(amount, (int, float)):
+            return None
+        amount_bucket = len(rules.amount_tiers)
+        for bucket, (lower_bound, _) in enumerate(rules.amount_tiers):
+            if amount > lower_bound:
+                amount_bucket = bucket
+                break
+        
+        return (rules.version, rules.fingerprint, action.lower(), amount_bucket)
+    
+    def _score_categories(self, task: Dict, rules: Optional[RuleSet] = None) -> Dict[RiskCategory, float]:
         """
-        Comprehensive risk assessment for any proposed action
+        Score contribution of every category the task falls into,
+        in assessment order
         """
+        rules = rules or self.registry.active
         # Extract task details
         action = task.get("action", "")
         context = task.get("context", {})
-        target = task.get("target", "")
         
-        # Initialize assessment components
-        risk_score = 0.0
-        categories = []
-        pros = []
-        cons = []
-        mitigation_strategies = []
+        # Single pass over the lower-cased action for every keyword group
+        hits = rules.matcher.match(action.lower())
+        category_scores: Dict[RiskCategory, float] = {}
         
         # 1. SECURITY RISK ASSESSMENT
-        security_score = self._assess_security_risk(action, context)
+        security_score = self._assess_security_risk(hits, context)
         if security_score > 0:
-            risk_score += security_score
-            categories.append(RiskCategory.SECURITY)
-            if security_score > 5:
-                cons.append(f"High security risk detected (score: {security_score})")
-                mitigation_strategies.append("Require additional authentication")
-                mitigation_strategies.append("Enable comprehensive audit logging")
+            category_scores[RiskCategory.SECURITY] = security_score
         
         # 2. FINANCIAL RISK ASSESSMENT  
-        if any(keyword in action.lower() for keyword in ["payment", "transfer", "purchase", "invest"]):
-            financial_score = self._assess_financial_risk(action, context)
-            risk_score += financial_score
-            categories.append(RiskCategory.FINANCIAL)
-            if financial_score > 3:
-                cons.append("Financial transaction detected")
-                mitigation_strategies.append("Require transaction approval")
-                mitigation_strategies.append("Set transaction limits")
+        if "financial_trigger" in hits:
+            category_scores[RiskCategory.FINANCIAL] = self._assess_financial_risk(hits, context, rules.amount_tiers)
         
         # 3. PRIVACY RISK ASSESSMENT
-        if any(keyword in action.lower() for keyword in ["personal", "private", "family", "edward"]):
-            privacy_score = 8.0  # High sensitivity for family data
-            risk_score += privacy_score
-            categories.append(RiskCategory.PRIVACY)
-            cons.append("Potential privacy impact on Edward or family")
-            mitigation_strategies.append("Ensure data remains within approved systems")
-            mitigation_strategies.append("Apply maximum encryption standards")
+        if "privacy" in hits:
+            category_scores[RiskCategory.PRIVACY] = hits["privacy"]  # High sensitivity for family data
         
         # 4. OPERATIONAL RISK ASSESSMENT
-        operational_score = self._assess_operational_risk(action, context)
+        operational_score = self._assess_operational_risk(hits, context)
         if operational_score > 0:
-            risk_score += operational_score
-            categories.append(RiskCategory.OPERATIONAL)
+            category_scores[RiskCategory.OPERATIONAL] = operational_score
         
         # 5. REPUTATIONAL RISK ASSESSMENT
-        if any(keyword in action.lower() for keyword in ["public", "publish", "share", "external"]):
-            reputational_score = 4.0
-            risk_score += reputational_score
-            categories.append(RiskCategory.REPUTATIONAL)
-            cons.append("Potential public exposure")
-            mitigation_strategies.append("Review content before publication")
+        if "reputational" in hits:
+            category_scores[RiskCategory.REPUTATIONAL] = hits["reputational"]
+        
+        return category_scores
+    
+    def _compose_assessment(
+        self, category_scores: Dict[RiskCategory, float], rule_version: Optional[str] = None
+    ) -> AssessmentRecord:
+        """Build the full assessment from per-category scores"""
+        risk_score = 0.0
+        categories = []
+        pros = []
+        cons = []
+        mitigation_strategies = []
+        
+        for category, score in category_scores.items():
+            risk_score += score
+            categories.append(category)
+            
+            if category == RiskCategory.SECURITY and score > 5:
+                cons.append(f"High security risk detected (score: {score})")
+                mitigation_strategies.append("Require additional authentication")
+                mitigation_strategies.append("Enable comprehensive audit logging")
+            elif category == RiskCategory.FINANCIAL and score > 3:
+                cons.append("Financial transaction detected")
+                mitigation_strategies.append("Require transaction approval")
+                mitigation_strategies.append("Set transaction limits")
+            elif category == RiskCategory.PRIVACY:
+                cons.append("Potential privacy impact on Edward or family")
+                mitigation_strategies.append("Ensure data remains within approved systems")
+                mitigation_strategies.append("Apply maximum encryption standards")
+            elif category == RiskCategory.REPUTATIONAL:
+                cons.append("Potential public exposure")
+                mitigation_strategies.append("Review content before publication")
         
         # Calculate final risk level
         risk_level = self._calculate_risk_level(risk_score)
@@ -119,7 +374,7 @@ class RiskManagementFramework:
             pros.append("Action aligns with EPIC doctrine")
         
         # Create assessment
-        assessment = RiskAssessment(
+        return AssessmentRecord(
             risk_level=risk_level,
             risk_score=min(risk_score, 10.0),  # Cap at 10
             categories=categories,
@@ -128,82 +383,65 @@ class RiskManagementFramework:
             mitigation_strategies=mitigation_strategies,
             requires_human_approval=requires_human_approval,
             confidence_level=0.85,  # Base confidence
-            assessed_by=self.agent_name
+            assessed_by=self.agent_name,
+            rule_version=rule_version or self.registry.active.version
         )
-        
-        # Log assessment
-        self.risk_history.append(assessment)
-        logger.info(f"Risk Assessment by {self.agent_name}: {assessment.model_dump_json()}")
-        
-        return assessment
     
-    def _assess_security_risk(self, action: str, context: Dict) -> float:
+    def _assess_security_risk(self, hits: Mapping[str, float], context: Dict) -> float:
         """Assess security-related risks"""
         score = 0.0
         
-        # Check for dangerous keywords
-        dangerous_keywords = ["sudo", "admin", "root", "password", "credential", "key", "token"]
-        for keyword in dangerous_keywords:
-            if keyword in action.lower():
-                score += 3.0
+        # Check for dangerous keywords (scored per keyword found)
+        score += hits.get("security_credentials", 0.0)
         
         # Check for system modifications
-        if any(word in action.lower() for word in ["delete", "remove", "modify", "override"]):
-            score += 2.0
+        score += hits.get("security_modification", 0.0)
             
         # Check for external connections
-        if any(word in action.lower() for word in ["connect", "api", "webhook", "external"]):
-            score += 1.5
+        score += hits.get("security_external", 0.0)
             
         return score
     
-    def _assess_financial_risk(self, action: str, context: Dict) -> float:
+    def _assess_financial_risk(
+        self, hits: Mapping[str, float], context: Dict, amount_tiers: Sequence[Tuple[float, float]]
+    ) -> float:
         """Assess financial risks"""
         score = 0.0
         
         # Check amount if present
         amount = context.get("amount", 0)
-        if amount > 10000:
-            score += 5.0
-        elif amount > 1000:
-            score += 3.0
-        elif amount > 100:
-            score += 1.0
+        for lower_bound, amount_score in amount_tiers:
+            if amount > lower_bound:
+                score += amount_score
+                break
             
         # Check for high-risk financial actions
-        if any(word in action.lower() for word in ["wire", "crypto", "investment"]):
-            score += 2.0
+        score += hits.get("financial_high_risk", 0.0)
             
         return score
     
-    def _assess_operational_risk(self, action: str, context: Dict) -> float:
+    def _assess_operational_risk(self, hits: Mapping[str, float], context: Dict) -> float:
         """Assess operational risks"""
         score = 0.0
         
         # Check for service disruption potential
-        if any(word in action.lower() for word in ["stop", "halt", "restart", "shutdown"]):
-            score += 3.0
+        score += hits.get("operational_disruption", 0.0)
             
         # Check for batch operations
-        if any(word in action.lower() for word in ["bulk", "mass", "all", "batch"]):
-            score += 1.5
+        score += hits.get("operational_batch", 0.0)
             
         return score
     
     def _calculate_risk_level(self, score: float) -> RiskLevel:
         """Convert risk score to risk level"""
-        if score <= 2:
-            return RiskLevel.LOW
-        elif score <= 5:
-            return RiskLevel.MEDIUM
-        elif score <= 8:
-            return RiskLevel.HIGH
-        elif score <= 12:
-            return RiskLevel.CRITICAL
-        else:
-            return RiskLevel.EXTREME
+        for level, upper_bound in RISK_LEVEL_THRESHOLDS:
+            if score <= upper_bound:
+                return level
+        return RiskLevel.EXTREME
     
-    async def get_board_consensus(self, assessments: List[RiskAssessment]) -> Tuple[bool, str]:
+    async def get_board_consensus(
+        self, assessments: Sequence[Union[AssessmentRecord, RiskAssessment]]
+    ) -> Tuple[bool, str]:
         """
         Determine board consensus based on multiple risk assessments
         Requires 7/11 approval for proceed, with veto power for security agents
@@ -213,13 +451,12 @@ class RiskManagementFramework:
         approval_votes = sum(1 for a in assessments if a.risk_level.value <= RiskLevel.MEDIUM.value)
         
         # Check for veto from CSO or CRO
-        veto_agents = ["CSO_Sentinel", "CRO_Guardian", "CQO_Oracle"]
         for assessment in assessments:
-            if assessment.assessed_by in veto_agents and assessment.risk_level.value >= RiskLevel.HIGH.value:
+            if assessment.assessed_by in VETO_AGENTS and assessment.risk_level.value >= RiskLevel.HIGH.value:
                 return False, f"VETO by {assessment.assessed_by}: {assessment.cons[0] if assessment.cons else 'High risk detected'}"
         
         # Require 7/11 approval
-        if approval_votes >= 7:
+        if approval_votes >= APPROVAL_THRESHOLD:
             return True, f"Board approval granted ({approval_votes}/{total_members} votes)"
         else:
             return False, f"Insufficient board approval ({approval_votes}/{total_members} votes required: 7/11)"
@@ -0,0 +1,316 @@
+"""
+Keyword rules for the V8 Risk Management Framework
+
+Every keyword group is compiled into one matcher, so an action is lower-cased
+once and scanned once per assessment no matter how many rules exist.
+
+Rules are bundled into versioned RuleSets. The RuleRegistry holds the active
+set (and optionally a shadow candidate); swapping it is a single reference
+assignment, so in-flight assessments finish on the set they started with.
+"""
+import hashlib
+import re
+import threading
+from collections import Counter
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+
+class KeywordGroup(NamedTuple):
+    name: str
+    keywords: Tuple[str, ...]
+    weight: float
+    # Add the weight once per distinct keyword found instead of once per group
+    per_keyword: bool = False
+
+
+DEFAULT_KEYWORD_GROUPS: Tuple[KeywordGroup, ...] = (
+    # SECURITY
+    KeywordGroup("security_credentials", ("sudo", "admin", "root", "password", "credential", "key", "token"), 3.0, per_keyword=True),
+    KeywordGroup("security_modification", ("delete", "remove", "modify", "override"), 2.0),
+    KeywordGroup("security_external", ("connect", "api", "webhook", "external"), 1.5),
+    # FINANCIAL - the trigger group only opens the financial assessment
+    KeywordGroup("financial_trigger", ("payment", "transfer", "purchase", "invest"), 0.0),
+    KeywordGroup("financial_high_risk", ("wire", "crypto", "investment"), 2.0),
+    # PRIVACY - high sensitivity for family data
+    KeywordGroup("privacy", ("personal", "private", "family", "edward"), 8.0),
+    # OPERATIONAL
+    KeywordGroup("operational_disruption", ("stop", "halt", "restart", "shutdown"), 3.0),
+    KeywordGroup("operational_batch", ("bulk", "mass", "all", "batch"), 1.5),
+    # REPUTATIONAL
+    KeywordGroup("reputational", ("public", "publish", "share", "external"), 4.0),
+)
+
+# Financial amount tiers: (exclusive lower bound, score), highest first
+FINANCIAL_AMOUNT_TIERS: Tuple[Tuple[float, float], ...] = ((10000, 5.0), (1000, 3.0), (100, 1.0))
+
+
+def _keyword_trie_pattern(keywords: Iterable[str]) -> str:
+    """Build a regex alternation shaped as a trie so each position is tested once"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Keywords ending here are prefixes of longer ones: prefer the longer match
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Single-pass substring matcher over a set of keyword groups
+
+    All keywords are compiled into one trie-shaped lookahead regex, so the
+    regex engine reports the longest keyword starting at every position of the
+    action. Shorter keywords hidden inside a reported one ("invest" inside
+    "investment") are recovered from a table built at compile time, which
+    gives exactly the same hits as testing every keyword with ``in``.
+    """
+
+    # Upper bound on memoized keyword combinations
+    MEMO_SIZE = 4096
+
+    def __init__(self, groups: Iterable[KeywordGroup] = DEFAULT_KEYWORD_GROUPS):
+        self.groups: Tuple[KeywordGroup, ...] = tuple(groups)
+        self.keywords: Tuple[str, ...] = tuple(
+            sorted({kw for group in self.groups for kw in group.keywords})
+        )
+        self._pattern = re.compile("(?=(" + _keyword_trie_pattern(self.keywords) + "))")
+        self._implied: Dict[str, FrozenSet[str]] = {
+            kw: frozenset(other for other in self.keywords if other in kw)
+            for kw in self.keywords
+        }
+        self._groups_by_keyword: Dict[str, Tuple[int, ...]] = {
+            kw: tuple(i for i, group in enumerate(self.groups) if kw in group.keywords)
+            for kw in self.keywords
+        }
+        # Identifies the compiled rules; changes whenever a keyword or weight does
+        self.fingerprint = hashlib.sha256(repr(self.groups).encode()).hexdigest()[:16]
+        # Raw regex hits -> group contributions; actions repeat the same few
+        # keyword combinations, so this skips the bookkeeping almost always
+        self._memo: Dict[FrozenSet[str], Mapping[str, float]] = {}
+
+    def find_keywords(self, action_lower: str) -> FrozenSet[str]:
+        """Return every keyword contained in an already lower-cased action"""
+        found = set()
+        for kw in self._pattern.findall(action_lower):
+            # An empty match means no keyword starts here
+            if kw:
+                found |= self._implied[kw]
+        return frozenset(found)
+
+    def match(self, action_lower: str) -> Mapping[str, float]:
+        """
+        Return the score contribution of every keyword group hit by the action,
+        keyed by group name. Groups without a hit are omitted.
+        """
+        raw = frozenset(kw for kw in self._pattern.findall(action_lower) if kw)
+        contributions = self._memo.get(raw)
+        if contributions is None:
+            contributions = self._contributions(raw)
+            if len(self._memo) < self.MEMO_SIZE:
+                self._memo[raw] = contributions
+        return contributions
+
+    def _contributions(self, raw: FrozenSet[str]) -> Mapping[str, float]:
+        found = set()
+        for kw in raw:
+            found |= self._implied[kw]
+
+        counts = [0] * len(self.groups)
+        for kw in found:
+            for index in self._groups_by_keyword[kw]:
+                counts[index] += 1
+
+        contributions: Dict[str, float] = {}
+        for group, count in zip(self.groups, counts):
+            if count:
+                contributions[group.name] = group.weight * count if group.per_keyword else group.weight
+        return MappingProxyType(contributions)
+
+
+DEFAULT_MATCHER = KeywordMatcher(DEFAULT_KEYWORD_GROUPS)
+
+# Version stamped on assessments scored with the built-in rules
+BUILTIN_RULE_VERSION = "builtin"
+
+
+class RuleSet:
+    """
+    A versioned, compiled set of scoring rules: keyword groups and financial
+    amount tiers. Immutable once built; compile a new one to change rules.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        groups: Iterable[KeywordGroup] = DEFAULT_KEYWORD_GROUPS,
+        amount_tiers: Iterable[Tuple[float, float]] = FINANCIAL_AMOUNT_TIERS,
+        matcher: Optional[KeywordMatcher] = None
+    ):
+        if not isinstance(version, str) or not version:
+            raise ValueError("Rule set version must be a non-empty string")
+        self.version = version
+        self.matcher = matcher or KeywordMatcher(groups)
+        # Highest bound first, as the scorers expect
+        self.amount_tiers: Tuple[Tuple[float, float], ...] = tuple(
+            sorted(((float(bound), float(score)) for bound, score in amount_tiers), reverse=True)
+        )
+        self.fingerprint = hashlib.sha256(
+            repr((self.matcher.fingerprint, self.amount_tiers)).encode()
+        ).hexdigest()[:16]
+
+    def __repr__(self) -> str:
+        return f"RuleSet(version={self.version!r}, fingerprint={self.fingerprint!r})"
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "RuleSet":
+        """
+        Build a rule set from its JSON form:
+
+            {"version": "2024-06-01.1",
+             "keyword_groups": [{"name": "privacy", "keywords": ["family"], "weight": 8.0,
+                                 "per_keyword": false}, ...],
+             "financial_amount_tiers": [[10000, 5.0], [1000, 3.0], [100, 1.0]]}
+
+        Missing sections fall back to the built-in rules. Raises ValueError
+        on malformed input.
+        """
+        if not isinstance(data, Mapping):
+            raise ValueError("Rule set must be a JSON object")
+        try:
+            groups = DEFAULT_KEYWORD_GROUPS
+            if "keyword_groups" in data:
+                groups = tuple(
+                    KeywordGroup(
+                        name=str(group["name"]),
+                        keywords=tuple(str(keyword).lower() for keyword in group["keywords"]),
+                        weight=float(group["weight"]),
+                        per_keyword=bool(group.get("per_keyword", False))
+                    )
+                    for group in data["keyword_groups"]
+                )
+            tiers = data.get("financial_amount_tiers", FINANCIAL_AMOUNT_TIERS)
+            tiers = tuple((float(bound), float(score)) for bound, score in tiers)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Malformed rule set: {e}") from e
+
+        if not groups:
+            raise ValueError("A rule set needs at least one keyword group")
+        if any(not group.keywords or "" in group.keywords for group in groups):
+            raise ValueError("Every keyword group needs at least one non-empty keyword")
+        return cls(data.get("version"), groups, tiers)
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": self.version,
+            "keyword_groups": [
+                {
+                    "name": group.name,
+                    "keywords": list(group.keywords),
+                    "weight": group.weight,
+                    "per_keyword": group.per_keyword,
+                }
+                for group in self.matcher.groups
+            ],
+            "financial_amount_tiers": [list(tier) for tier in self.amount_tiers],
+        }
+
+
+DEFAULT_RULE_SET = RuleSet(BUILTIN_RULE_VERSION, DEFAULT_KEYWORD_GROUPS, FINANCIAL_AMOUNT_TIERS, DEFAULT_MATCHER)
+
+
+class ShadowStats:
+    """Agreement between the active rules and a shadow candidate on live traffic"""
+
+    def __init__(self, active_version: str, shadow_version: str, approve_max: int = 2):
+        self.active_version = active_version
+        self.shadow_version = shadow_version
+        # Highest level value that still counts as an approval vote (MEDIUM)
+        self.approve_max = approve_max
+        self.compared = 0
+        self.level_disagreements = 0
+        self.escalations = 0
+        self.vote_flips = 0
+        self.transitions: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, active_level, shadow_level):
+        """Count one assessment scored by both rule sets (RiskLevel values)"""
+        with self._lock:
+            self.compared += 1
+            if active_level is shadow_level:
+                return
+            self.level_disagreements += 1
+            self.escalations += shadow_level.value > active_level.value
+            self.vote_flips += (active_level.value <= self.approve_max) != (shadow_level.value <= self.approve_max)
+            self.transitions[(active_level.name, shadow_level.name)] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            compared = self.compared
+            return {
+                "active_version": self.active_version,
+                "shadow_version": self.shadow_version,
+                "compared": compared,
+                "level_disagreements": self.level_disagreements,
+                "disagreement_rate": self.level_disagreements / compared if compared else 0.0,
+                "escalations": self.escalations,
+                "de_escalations": self.level_disagreements - self.escalations,
+                "vote_flips": self.vote_flips,
+                "vote_flip_rate": self.vote_flips / compared if compared else 0.0,
+                "transitions": {f"{old}->{new}": count for (old, new), count in self.transitions.most_common()},
+            }
+
+
+class RuleRegistry:
+    """
+    Holds the active rule set and an optional shadow candidate.
+
+    Readers take ``registry.active`` once per assessment and use that object
+    throughout, so activate() never pauses or splits an in-flight assessment.
+    """
+
+    def __init__(self, active: RuleSet = DEFAULT_RULE_SET):
+        self.active = active
+        self.shadow: Optional[RuleSet] = None
+        self.shadow_stats: Optional[ShadowStats] = None
+        self.shadow_sample_rate = 1.0
+        self.swaps = 0
+
+    def activate(self, rules: RuleSet) -> RuleSet:
+        """Swap in new active rules; returns the previous set"""
+        previous, self.active = self.active, rules
+        self.swaps += 1
+        if self.shadow is not None:
+            self.shadow_stats = ShadowStats(rules.version, self.shadow.version)
+        return previous
+
+    def set_shadow(self, rules: Optional[RuleSet], sample_rate: float = 1.0):
+        """Score live traffic with a candidate alongside the active rules; None stops shadowing"""
+        self.shadow_sample_rate = min(1.0, max(0.0, sample_rate))
+        self.shadow_stats = ShadowStats(self.active.version, rules.version) if rules is not None else None
+        self.shadow = rules
+
+    def stats(self) -> Dict:
+        return {
+            "active_version": self.active.version,
+            "active_fingerprint": self.active.fingerprint,
+            "shadow_version": self.shadow.version if self.shadow is not None else None,
+            "shadow_sample_rate": self.shadow_sample_rate,
+            "swaps": self.swaps,
+            "shadow": self.shadow_stats.stats() if self.shadow_stats is not None else None,
+        }
+
+
+# Process-wide rules used by every framework that isn't given its own
+RULE_REGISTRY = RuleRegistry()
@@ -0,0 +1,187 @@
+"""
+Hot reloading of risk rule sets
+
+RuleReloader polls a JSON rule file and/or a Redis key, compiles changed rule
+sets off the event loop and swaps them into the RuleRegistry. The same
+sources can provide a shadow candidate that is scored alongside the active
+rules on live traffic.
+
+A rule set's version identifies its content: a source that changes content
+without changing its version is rejected and the current rules stay active.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional, Union
+
+from .risk_rules import RULE_REGISTRY, RuleRegistry, RuleSet
+
+logger = logging.getLogger(__name__)
+
+
+def parse_rule_set(raw: Union[str, bytes]) -> RuleSet:
+    """Compile a rule set from its JSON text; raises ValueError when invalid"""
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Rule set is not valid JSON: {e}") from e
+    return RuleSet.from_dict(data)
+
+
+def load_rule_file(path: str) -> RuleSet:
+    with open(path, "r", encoding="utf-8") as handle:
+        return parse_rule_set(handle.read())
+
+
+class _RuleSource:
+    """One file and/or Redis key holding a rule set; remembers what it last read"""
+
+    def __init__(self, path: Optional[str], redis_key: Optional[str]):
+        self.path = path
+        self.redis_key = redis_key
+        self._file_stamp = None
+        self._file_raw: Optional[str] = None
+        self.digest: Optional[str] = None
+        self.rules: Optional[RuleSet] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.path or self.redis_key)
+
+    async def read(self, redis) -> Optional[str]:
+        """Raw rule set text; the Redis key takes precedence over the file"""
+        if self.redis_key and redis is not None:
+            raw = await redis.get(self.redis_key)
+            if raw:
+                return raw.decode() if isinstance(raw, bytes) else raw
+        if self.path:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return None
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if stamp != self._file_stamp:
+                self._file_raw = await asyncio.to_thread(_read_text, self.path)
+                self._file_stamp = stamp
+            return self._file_raw
+        return None
+
+    async def refresh(self, redis) -> bool:
+        """Recompile if the source content changed; returns True when it did"""
+        raw = await self.read(redis)
+        digest = hashlib.sha256(raw.encode()).hexdigest() if raw else None
+        if digest == self.digest:
+            return False
+        # Remember the content even if it fails to compile, so a bad rule
+        # set is reported once rather than on every poll
+        self.digest = digest
+        # Compile off the event loop so requests keep flowing meanwhile
+        self.rules = await asyncio.to_thread(parse_rule_set, raw) if raw else None
+        return True
+
+
+def _read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as handle:
+        return handle.read()
+
+
+class RuleReloader:
+    """Keep a RuleRegistry in sync with its rule sources"""
+
+    def __init__(
+        self,
+        registry: RuleRegistry = RULE_REGISTRY,
+        redis=None,
+        path: Optional[str] = None,
+        redis_key: Optional[str] = None,
+        shadow_path: Optional[str] = None,
+        shadow_redis_key: Optional[str] = None,
+        shadow_sample_rate: float = 1.0,
+        interval: float = 5.0
+    ):
+        self.registry = registry
+        self.redis = redis
+        self.active_source = _RuleSource(path, redis_key)
+        self.shadow_source = _RuleSource(shadow_path, shadow_redis_key)
+        self.shadow_sample_rate = shadow_sample_rate
+        self.interval = interval
+        # Version -> fingerprint of every rule set seen, to catch edits that kept the version
+        self._seen: Dict[str, str] = {registry.active.version: registry.active.fingerprint}
+
+        self.checks = 0
+        self.reloads = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[float] = None
+
+    @property
+    def configured(self) -> bool:
+        return self.active_source.configured or self.shadow_source.configured
+
+    async def reload(self) -> bool:
+        """Check every source once; returns True if the active rules changed"""
+        self.checks += 1
+        self.last_checked = time.time()
+        swapped = False
+        try:
+            if self.active_source.configured and await self.active_source.refresh(self.redis):
+                rules = self.active_source.rules
+                if rules is not None:
+                    # Also catches edits that kept the active version
+                    self._check_version(rules)
+                if rules is not None and rules.version != self.registry.active.version:
+                    previous = self.registry.activate(rules)
+                    self.reloads += 1
+                    swapped = True
+                    logger.info(f"Risk rules {rules.version} active (was {previous.version})")
+
+            if self.shadow_source.configured and await self.shadow_source.refresh(self.redis):
+                candidate = self.shadow_source.rules
+                if candidate is not None:
+                    self._check_version(candidate)
+                self.registry.set_shadow(candidate, self.shadow_sample_rate)
+                logger.info(
+                    f"Shadow risk rules {candidate.version} enabled" if candidate else "Shadow risk rules disabled"
+                )
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            logger.error(f"Risk rule reload failed, keeping {self.registry.active.version}: {e}")
+        return swapped
+
+    async def run(self):
+        """Poll the sources until cancelled"""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.reload()
+
+    def stats(self) -> Dict:
+        return {
+            "checks": self.checks,
+            "reloads": self.reloads,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "last_checked": self.last_checked,
+            "interval_seconds": self.interval,
+        }
+
+    def _check_version(self, rules: RuleSet):
+        known = self._seen.setdefault(rules.version, rules.fingerprint)
+        if known != rules.fingerprint:
+            raise ValueError(f"Rule set version {rules.version} was reused for different rules")
+
+
+def reloader_from_env(redis=None, registry: RuleRegistry = RULE_REGISTRY) -> RuleReloader:
+    return RuleReloader(
+        registry=registry,
+        redis=redis,
+        path=os.getenv("RISK_RULES_PATH") or None,
+        redis_key=os.getenv("RISK_RULES_REDIS_KEY") or None,
+        shadow_path=os.getenv("RISK_RULES_SHADOW_PATH") or None,
+        shadow_redis_key=os.getenv("RISK_RULES_SHADOW_REDIS_KEY") or None,
+        shadow_sample_rate=float(os.getenv("RISK_RULES_SHADOW_SAMPLE_RATE", "1.0")),
+        interval=float(os.getenv("RISK_RULES_RELOAD_INTERVAL", "5.0"))
+    )
@@ -0,0 +1,222 @@
+"""
+In-memory session cache in front of the assistant storage
+
+Every member run reads its session (memory with the chat history) from the
+`assistant_storage` table and, after the run, upserts it and reads it back.
+The cache keeps recent sessions in a bounded LRU keyed by run ID (one per
+agent session): reads are served from memory, and writes go through to
+Postgres, which stays the source of truth, and refresh the cached copy.
+Other workers drop their copy when a write is announced on Redis pubsub;
+entries also expire after a TTL in case an announcement is missed.
+"""
+import asyncio
+import copy
+import json
+import logging
+import os
+import threading
+import uuid
+from typing import Any, Dict, Optional
+
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "512"))
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "600"))
+SESSION_CACHE_CHANNEL = os.getenv("SESSION_CACHE_CHANNEL", "session_cache_invalidate")
+SESSION_CACHE_RECONNECT_MAX_BACKOFF = 5.0
+
+
+class SessionCache:
+    """
+    Cached session rows with cross-worker invalidation. Storage calls are
+    synchronous (threads or the event loop thread); announcements are
+    published on the loop given to attach().
+    """
+
+    def __init__(
+        self,
+        maxsize: int = SESSION_CACHE_SIZE,
+        ttl: float = SESSION_CACHE_TTL,
+        channel: str = SESSION_CACHE_CHANNEL
+    ):
+        self.rows = TTLCache(maxsize=maxsize, ttl=ttl, name="sessions")
+        self.channel = channel
+        # Tells this worker's own announcements apart from other workers'
+        self.origin = uuid.uuid4().hex
+        self.redis = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: set = set()
+        self._lock = threading.Lock()
+        # Bumped on every write or invalidation: a read that started before
+        # one must not cache what it read
+        self._writes = 0
+        self.db_reads = 0
+        self.db_writes = 0
+        self.invalidations = 0
+        self.reconnects = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rows.maxsize > 0 and self.rows.ttl > 0
+
+    def attach(self, redis, loop: asyncio.AbstractEventLoop):
+        """Announce writes on `redis` from now on"""
+        self.redis = redis
+        self._loop = loop
+
+    def get(self, run_id: str) -> Optional[Any]:
+        row = self.rows.get(run_id)
+        return copy.deepcopy(row) if row is not None else None
+
+    def begin_read(self) -> int:
+        with self._lock:
+            self.db_reads += 1
+            return self._writes
+
+    def fill(self, run_id: str, row: Optional[Any], marker: int):
+        """Cache a row read from the database, unless a write happened since begin_read"""
+        if row is None or not self.enabled:
+            return
+        with self._lock:
+            if marker == self._writes:
+                self.rows.set(run_id, copy.deepcopy(row))
+
+    def written(self, run_id: str, row: Any):
+        """A row this worker is writing; announce() it once committed"""
+        with self._lock:
+            self._writes += 1
+            self.db_writes += 1
+            if self.enabled:
+                self.rows.set(run_id, copy.deepcopy(row))
+
+    def invalidate(self, run_id: Optional[str] = None):
+        """Drop one session, or every session when run_id is None"""
+        with self._lock:
+            self._writes += 1
+            self.invalidations += 1
+            if run_id is None:
+                self.rows.clear()
+            else:
+                self.rows.pop(run_id)
+
+    def announce(self, run_id: str):
+        """Tell other workers to drop their copy of a session"""
+        if self.redis is None or self._loop is None or self._loop.is_closed():
+            return
+        message = json.dumps({"origin": self.origin, "run_id": run_id})
+        try:
+            self._loop.call_soon_threadsafe(self._publish, message)
+        except RuntimeError:
+            # Loop closed during shutdown
+            pass
+
+    def _publish(self, message: str):
+        task = asyncio.ensure_future(self.redis.publish(self.channel, message))
+        self._pending.add(task)
+        task.add_done_callback(self._published)
+
+    def _published(self, task: asyncio.Task):
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Session invalidation publish failed: {task.exception()}")
+
+    def handle(self, data):
+        try:
+            message = json.loads(data)
+            origin, run_id = message["origin"], message["run_id"]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Error processing session invalidation: {e}")
+            return
+        if origin != self.origin:
+            self.invalidate(run_id)
+
+    async def run(self, redis):
+        """Follow other workers' writes until cancelled, reconnecting on errors"""
+        backoff = 0.1
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Writes announced while unsubscribed were missed
+                self.invalidate()
+                backoff = 0.1
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message.get("type") == "message":
+                        self.handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.reconnects += 1
+                logger.error(f"Session invalidation channel lost ({e}); reconnecting in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, SESSION_CACHE_RECONNECT_MAX_BACKOFF)
+            finally:
+                try:
+                    await asyncio.shield(pubsub.reset())
+                except Exception:
+                    pass
+
+    def stats(self) -> Dict:
+        return {
+            "db_reads": self.db_reads,
+            "db_writes": self.db_writes,
+            "invalidations": self.invalidations,
+            "reconnects": self.reconnects,
+            "rows": self.rows.stats(),
+        }
+
+
+class SessionCachedStorage:
+    """
+    Mixin for an assistant storage class (read/upsert by run ID). Put it
+    first in the bases so the storage's own upsert reads back through it.
+    """
+
+    def __init__(self, *args, session_cache: Optional[SessionCache] = None, **kwargs):
+        self.session_cache = session_cache or SESSION_CACHE
+        super().__init__(*args, **kwargs)
+
+    def read(self, run_id: str):
+        cache = self.session_cache
+        row = cache.get(run_id)
+        if row is not None:
+            return row
+        marker = cache.begin_read()
+        row = super().read(run_id)
+        cache.fill(run_id, row, marker)
+        return row
+
+    def upsert(self, row):
+        cache = self.session_cache
+        # The storage reads the row back after writing; serve that from the cache
+        cache.written(row.run_id, row)
+        try:
+            stored = super().upsert(row)
+        except Exception:
+            cache.invalidate(row.run_id)
+            raise
+        # Deferred writes are announced by flushed() once committed
+        if not getattr(self, "writes_deferred", False):
+            cache.announce(row.run_id)
+        return stored
+
+    def flushed(self, run_ids):
+        for run_id in run_ids:
+            self.session_cache.announce(run_id)
+        super().flushed(run_ids)
+
+    def dropped(self, run_ids):
+        # The cached copy was never committed
+        for run_id in run_ids:
+            self.session_cache.invalidate(run_id)
+        super().dropped(run_ids)
+
+    def delete(self):
+        super().delete()
+        self.session_cache.invalidate()
+
+
+SESSION_CACHE = SessionCache()
@@ -0,0 +1,271 @@
+"""
+Write-behind persistence for assistant run state
+
+After every run each member upserts its whole run row, one transaction per
+member, on the request path. With write-behind the upsert only replaces the
+run's pending row in memory (repeated updates to one session merge into
+the latest), and a background thread writes pending rows in one batched
+upsert per flush: every `flush_interval` seconds, as soon as `batch_size`
+runs are pending, and on shutdown. Rows still pending are served to reads.
+
+A batch that fails because the database is unreachable is kept whole for
+the next flush. A batch the database rejects is written row by row to
+isolate the bad rows, which are retried on later flushes and dropped (and
+logged) after `max_retries` rejections. At most `max_pending` runs wait in
+memory; beyond that new runs are written through on the caller's thread.
+"""
+import atexit
+import copy
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .decision_stream import is_transient_error
+from .metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+STORAGE_WRITE_BEHIND = os.getenv("STORAGE_WRITE_BEHIND", "1") != "0"
+STORAGE_FLUSH_INTERVAL = float(os.getenv("STORAGE_FLUSH_INTERVAL", "0.5"))
+STORAGE_FLUSH_BATCH = int(os.getenv("STORAGE_FLUSH_BATCH", "64"))
+STORAGE_FLUSH_MAX_RETRIES = int(os.getenv("STORAGE_FLUSH_MAX_RETRIES", "3"))
+STORAGE_MAX_PENDING = int(os.getenv("STORAGE_MAX_PENDING", "4096"))
+
+
+class WriteBehindBuffer:
+    """Pending rows by run ID, flushed by `write(rows)` on a background thread"""
+
+    def __init__(
+        self,
+        write: Callable[[List[Any]], None],
+        flushed: Optional[Callable[[List[str]], None]] = None,
+        flush_interval: float = STORAGE_FLUSH_INTERVAL,
+        batch_size: int = STORAGE_FLUSH_BATCH,
+        enabled: bool = STORAGE_WRITE_BEHIND,
+        max_retries: int = STORAGE_FLUSH_MAX_RETRIES,
+        max_pending: int = STORAGE_MAX_PENDING,
+        dropped: Optional[Callable[[List[str]], None]] = None
+    ):
+        self._write = write
+        self._flushed = flushed
+        self._dropped = dropped
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.enabled = enabled
+        self.max_retries = max_retries
+        self.max_pending = max_pending
+        self._pending: Dict[str, Any] = {}
+        # Rejections so far of each run's pending row
+        self._rejections: Dict[str, int] = {}
+        # The batch being written: still served to reads until it commits
+        self._writing: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        # Serializes flushes between the writer thread and flush() callers
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.flush_latency = LatencyStats()
+
+        self.updates = 0
+        self.merged = 0
+        self.rows_written = 0
+        self.transactions = 0
+        self.write_errors = 0
+        self.dropped = 0
+        self.overflows = 0
+
+    def put(self, row: Any) -> bool:
+        """
+        Replace the pending row for row.run_id; the caller may keep mutating
+        its copy. Returns False, leaving the write to the caller, when
+        max_pending other runs are already waiting.
+        """
+        if self._thread is None:
+            self.start()
+        with self._lock:
+            if row.run_id in self._pending:
+                self.merged += 1
+            elif len(self._pending) >= self.max_pending and row.run_id not in self._writing:
+                self.overflows += 1
+                self._wake.set()
+                return False
+            self._pending[row.run_id] = copy.deepcopy(row)
+            self.updates += 1
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+        return True
+
+    def get(self, run_id: str) -> Optional[Any]:
+        with self._lock:
+            row = self._pending.get(run_id) or self._writing.get(run_id)
+        return copy.deepcopy(row) if row is not None else None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> int:
+        """Write every pending row, in one batch if possible; returns how many were written"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._writing = batch
+            if not batch:
+                return 0
+            start = time.perf_counter()
+            try:
+                self._write(list(batch.values()))
+                written, failed = list(batch), {}
+            except Exception as e:
+                self.write_errors += 1
+                if is_transient_error(e) or len(batch) == 1:
+                    logger.error(f"Failed to write {len(batch)} assistant runs ({e}); retrying on the next flush")
+                    written, failed = [], {run_id: e for run_id in batch}
+                else:
+                    logger.warning(f"Batch of {len(batch)} assistant runs rejected ({e}); writing them one by one")
+                    written, failed = self._write_each(batch)
+            else:
+                self.transactions += 1
+            self.flush_latency.record(time.perf_counter() - start, "error" if failed else "ok")
+            dropped = self._settle(batch, written, failed)
+            self.rows_written += len(written)
+        if written and self._flushed is not None:
+            try:
+                self._flushed(written)
+            except Exception:
+                logger.exception("Write-behind flush callback failed")
+        if dropped and self._dropped is not None:
+            try:
+                self._dropped(dropped)
+            except Exception:
+                logger.exception("Write-behind drop callback failed")
+        return len(written)
+
+    def _write_each(self, batch: Dict[str, Any]):
+        """One transaction per row, so only the rows the database rejects fail"""
+        written, failed = [], {}
+        for run_id, row in batch.items():
+            try:
+                self._write([row])
+            except Exception as e:
+                failed[run_id] = e
+                continue
+            written.append(run_id)
+            self.transactions += 1
+        return written, failed
+
+    def _settle(self, batch: Dict[str, Any], written: List[str], failed: Dict[str, Exception]) -> List[str]:
+        """Requeue failed rows, dropping ones rejected max_retries times; returns the dropped run IDs"""
+        dropped = []
+        with self._lock:
+            for run_id in written:
+                self._rejections.pop(run_id, None)
+            for run_id, error in failed.items():
+                # An unreachable database says nothing about the row itself
+                rejections = self._rejections.get(run_id, 0) + (not is_transient_error(error))
+                if rejections >= self.max_retries:
+                    self._rejections.pop(run_id, None)
+                    dropped.append(run_id)
+                    continue
+                self._rejections[run_id] = rejections
+                # Newer updates made during the failed write win
+                self._pending.setdefault(run_id, batch[run_id])
+            self._writing = {}
+        for run_id in dropped:
+            self.dropped += 1
+            logger.error(
+                f"Dropping assistant run {run_id} after {self.max_retries} rejected writes: {failed[run_id]}"
+            )
+        return dropped
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Flush everything pending and stop the writer thread"""
+        thread = self._thread
+        if thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            thread.join(timeout)
+            self._thread = None
+        # Also covers rows put while the thread was stopping, or a failed last flush
+        self.flush()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "pending": self.pending,
+            "updates": self.updates,
+            "merged": self.merged,
+            "rows_written": self.rows_written,
+            "transactions": self.transactions,
+            "write_errors": self.write_errors,
+            "dropped": self.dropped,
+            "overflows": self.overflows,
+            "flush_latency": self.flush_latency.snapshot(),
+        }
+
+
+class WriteBehindStorage:
+    """
+    Mixin for an assistant storage class: upserts go to a WriteBehindBuffer.
+    write_batch(rows) defaults to one upsert per row; storages that can
+    upsert many rows in one transaction override it.
+    """
+
+    def __init__(self, *args, write_behind: Optional[bool] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_behind = WriteBehindBuffer(
+            self.write_batch,
+            flushed=self.flushed,
+            dropped=self.dropped,
+            enabled=STORAGE_WRITE_BEHIND if write_behind is None else write_behind
+        )
+        atexit.register(self.write_behind.stop)
+
+    @property
+    def writes_deferred(self) -> bool:
+        return self.write_behind.enabled
+
+    def read(self, run_id: str):
+        row = self.write_behind.get(run_id)
+        if row is not None:
+            return row
+        return super().read(run_id)
+
+    def upsert(self, row):
+        if not self.write_behind.enabled:
+            return super().upsert(row)
+        if self.write_behind.put(row):
+            return copy.deepcopy(row)
+        # Too many runs pending: write this one through
+        stored = super().upsert(row)
+        self.flushed([row.run_id])
+        return stored
+
+    def write_batch(self, rows: Iterable[Any]):
+        for row in rows:
+            super().upsert(row)
+
+    def flushed(self, run_ids: List[str]):
+        """Runs whose rows are now committed"""
+
+    def dropped(self, run_ids: List[str]):
+        """Runs whose pending rows were given up on and never committed"""
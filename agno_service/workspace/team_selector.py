@@ -0,0 +1,158 @@
+"""
+Category-aware sub-team selection
+
+Each risk category (and a few task metadata hints) names the expertise it
+needs as requirements, each met by any one of a few seats. The selector
+returns the smallest set of seats meeting every requirement, so most tasks
+run on two to four members instead of eleven. Teams are built once per
+member set and cached; team size and run latency are tracked per size.
+"""
+import asyncio
+import itertools
+import logging
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Mapping, Optional, Sequence, Tuple
+
+from .epic_doctrine import BOARD_ROLES
+from .metrics import LatencyRegistry
+from .risk_management import RiskCategory
+
+logger = logging.getLogger(__name__)
+
+# Seat keys ("CEO", "CQO", ...) in board order
+BOARD_SEATS: Tuple[str, ...] = tuple(name.split("_")[0] for name in BOARD_ROLES)
+
+# A requirement is met by any one of its seats
+Requirement = Tuple[str, ...]
+
+CATEGORY_REQUIREMENTS: Dict[RiskCategory, Tuple[Requirement, ...]] = {
+    RiskCategory.FINANCIAL: (("CRO",), ("CEO",)),
+    RiskCategory.SECURITY: (("CSO",),),
+    RiskCategory.TECHNICAL: (("CTO",), ("CSO",)),
+    RiskCategory.PRIVACY: (("CSO", "CRO"), ("CDO",)),
+    RiskCategory.LEGAL: (("CRO",), ("CPHO",)),
+    RiskCategory.REPUTATIONAL: (("CCDO",), ("CEO", "CPHO")),
+    RiskCategory.OPERATIONAL: (("COO",),),
+}
+# CQO holds the MCP verification tools
+VERIFICATION_REQUIREMENT: Requirement = ("CQO",)
+# External recipients and public destinations bring in external relations
+EXTERNAL_REQUIREMENT: Requirement = ("CCDO",)
+EXTERNAL_MARKERS = ("external", "public")
+
+
+def task_requirements(task: Optional[Mapping]) -> Tuple[Requirement, ...]:
+    """Requirements from task metadata rather than risk categories"""
+    if not task:
+        return ()
+    requirements = [(seat,) for seat in task.get("members", ()) if seat in BOARD_SEATS]
+    if task.get("requires_verification"):
+        requirements.append(VERIFICATION_REQUIREMENT)
+    context = task.get("context") or {}
+    if isinstance(context, Mapping) and any(
+        marker in str(context.get(field, "")).lower()
+        for field in ("recipient", "destination")
+        for marker in EXTERNAL_MARKERS
+    ):
+        requirements.append(EXTERNAL_REQUIREMENT)
+    return tuple(requirements)
+
+
+@lru_cache(maxsize=512)
+def smallest_cover(requirements: FrozenSet[Requirement], seats: Tuple[str, ...] = BOARD_SEATS) -> Tuple[str, ...]:
+    """Fewest seats meeting every requirement; ties go to earlier seats in board order"""
+    candidates = [seat for seat in seats if any(seat in requirement for requirement in requirements)]
+    for size in range(1, len(candidates) + 1):
+        for combination in itertools.combinations(candidates, size):
+            chosen = set(combination)
+            if all(chosen.intersection(requirement) for requirement in requirements):
+                return combination
+    return ()
+
+
+class TeamSelector:
+    """Smallest qualifying member set for a task, with per-size metrics"""
+
+    def __init__(
+        self,
+        seats: Sequence[str] = BOARD_SEATS,
+        category_requirements: Optional[Mapping[RiskCategory, Sequence[Requirement]]] = None
+    ):
+        self.seats = tuple(seats)
+        self.category_requirements = dict(
+            CATEGORY_REQUIREMENTS if category_requirements is None else category_requirements
+        )
+        self.latency = LatencyRegistry()
+        self.selections: Counter = Counter()
+        self.prompt_tokens = 0
+        self.members_run = 0
+        self.runs = 0
+
+    def select(self, categories: Iterable[RiskCategory], task: Optional[Mapping] = None) -> Tuple[str, ...]:
+        """Seats (in board order) covering the categories and the task metadata; () if nothing applies"""
+        requirements = set(task_requirements(task))
+        for category in categories:
+            requirements.update(self.category_requirements.get(category, ()))
+        if not requirements:
+            return ()
+        return smallest_cover(frozenset(requirements), self.seats)
+
+    def record(self, members: Sequence[str], seconds: float, outcome: Optional[str] = None, prompt_tokens: int = 0):
+        """One team run: latency is tracked by team size"""
+        self.selections["+".join(members)] += 1
+        self.latency.record(f"{len(members)} members", seconds, outcome)
+        self.prompt_tokens += prompt_tokens
+        self.members_run += len(members)
+        self.runs += 1
+
+    def stats(self) -> Dict:
+        return {
+            "runs": self.runs,
+            "mean_team_size": self.members_run / self.runs if self.runs else None,
+            "mean_prompt_tokens": self.prompt_tokens / self.runs if self.runs else None,
+            "by_size": self.latency.snapshot(),
+            "teams": dict(self.selections.most_common(20)),
+        }
+
+
+class TeamCache:
+    """Teams built once per member set by `build(members)`, least recently used evicted"""
+
+    def __init__(self, build: Callable[[Tuple[str, ...]], Awaitable[Any]], maxsize: int = 32):
+        self._build = build
+        self.maxsize = maxsize
+        self._teams: "OrderedDict[Tuple[str, ...], Any]" = OrderedDict()
+        self._locks: Dict[Tuple[str, ...], asyncio.Lock] = {}
+        self.hits = 0
+        self.builds = 0
+
+    def __len__(self) -> int:
+        return len(self._teams)
+
+    async def get(self, members: Sequence[str]) -> Any:
+        key = tuple(members)
+        team = self._teams.get(key)
+        if team is not None:
+            self.hits += 1
+            self._teams.move_to_end(key)
+            return team
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            team = self._teams.get(key)
+            if team is None:
+                team = await self._build(key)
+                self.builds += 1
+                self._teams[key] = team
+                while len(self._teams) > self.maxsize:
+                    evicted, _ = self._teams.popitem(last=False)
+                    self._locks.pop(evicted, None)
+            else:
+                self.hits += 1
+        return team
+
+    def stats(self) -> Dict:
+        return {"size": len(self._teams), "maxsize": self.maxsize, "hits": self.hits, "builds": self.builds}
+
+
+TEAM_SELECTOR = TeamSelector()
@@ -78,7 +78,9 @@ CREATE TABLE IF NOT EXISTS board_decisions (
     approved BOOLEAN NOT NULL,
     reason TEXT,
     execution_result JSONB,
-    timestamp TIMESTAMPTZ DEFAULT NOW()
+    timestamp TIMESTAMPTZ DEFAULT NOW(),
+    -- Redis Stream entry ID; makes redelivered decisions idempotent
+    stream_id TEXT
 );
 
 -- Create indexes
@@ -86,6 +88,7 @@ CREATE INDEX idx_audit_log_user_id ON audit_log(user_id);
 CREATE INDEX idx_audit_log_timestamp ON audit_log(timestamp);
 CREATE INDEX idx_mcp_tool_logs_timestamp ON mcp_tool_logs(timestamp);
 CREATE INDEX idx_board_decisions_timestamp ON board_decisions(timestamp);
+CREATE UNIQUE INDEX idx_board_decisions_stream_id ON board_decisions(stream_id);
 
 -- Create Edward as first admin (password must be updated via script)
 INSERT INTO users (email, password_hash, full_name, role)
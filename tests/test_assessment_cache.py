@@ -0,0 +1,100 @@
+import time
+
+import pytest
+from agno_service.workspace.cache import TTLCache
+from agno_service.workspace.risk_management import ASSESSMENT_CACHE, RiskManagementFramework
+from agno_service.workspace.risk_rules import DEFAULT_KEYWORD_GROUPS, KeywordMatcher
+
+KEY_MEMBERS = ["CEO_Visionary", "CQO_Oracle", "CSO_Sentinel", "CRO_Guardian"]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    ASSESSMENT_CACHE.clear()
+    ASSESSMENT_CACHE.hits = ASSESSMENT_CACHE.misses = 0
+    yield
+    ASSESSMENT_CACHE.clear()
+
+
+class TestTTLCache:
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # "b" is now least recently used
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.evictions == 1
+
+    def test_ttl_expiry(self):
+        cache = TTLCache(maxsize=10, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+
+    def test_counters(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+    def test_disabled(self):
+        cache = TTLCache(maxsize=0, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+
+
+class TestSharedAssessmentCache:
+    @pytest.mark.asyncio
+    async def test_board_members_share_one_computation(self):
+        task = {"action": "Transfer payment to vendor", "context": {"amount": 5000}}
+        assessments = [await RiskManagementFramework(name).assess_risk(task) for name in KEY_MEMBERS]
+
+        assert ASSESSMENT_CACHE.misses == 1
+        assert ASSESSMENT_CACHE.hits == len(KEY_MEMBERS) - 1
+        assert [a.assessed_by for a in assessments] == KEY_MEMBERS
+        shared = {"assessed_by", "assessment_timestamp"}
+        dumps = [{k: v for k, v in a.to_dict().items() if k not in shared} for a in assessments]
+        assert all(dump == dumps[0] for dump in dumps)
+
+    @pytest.mark.asyncio
+    async def test_amount_is_bucketed(self):
+        framework = RiskManagementFramework("CEO_Visionary")
+        await framework.assess_risk({"action": "transfer", "context": {"amount": 2000}})
+        await framework.assess_risk({"action": "TRANSFER", "context": {"amount": 9000}})
+        assert ASSESSMENT_CACHE.hits == 1
+        high = await framework.assess_risk({"action": "transfer", "context": {"amount": 20000}})
+        assert ASSESSMENT_CACHE.misses == 2
+        assert high.risk_score == 5.0
+
+    @pytest.mark.asyncio
+    async def test_copies_are_independent(self):
+        task = {"action": "share_family_photos", "context": {}}
+        first = await RiskManagementFramework("CEO_Visionary").assess_risk(task)
+        first.cons.append("mutated by caller")
+        second = await RiskManagementFramework("CSO_Sentinel").assess_risk(task)
+        assert "mutated by caller" not in second.cons
+
+    @pytest.mark.asyncio
+    async def test_rule_change_invalidates(self):
+        task = {"action": "publish report", "context": {}}
+        before = await RiskManagementFramework("CEO_Visionary").assess_risk(task)
+
+        retuned = [
+            group._replace(weight=1.0) if group.name == "reputational" else group
+            for group in DEFAULT_KEYWORD_GROUPS
+        ]
+        after = await RiskManagementFramework("CEO_Visionary", matcher=KeywordMatcher(retuned)).assess_risk(task)
+        assert ASSESSMENT_CACHE.hits == 0
+        assert (before.risk_score, after.risk_score) == (4.0, 1.0)
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_amount_is_scored(self):
+        framework = RiskManagementFramework("CEO_Visionary")
+        assessment = await framework.assess_risk({"action": "read_file", "context": {"amount": "n/a"}})
+        assert assessment.risk_score == 0.0
+        assert len(ASSESSMENT_CACHE) == 0
@@ -0,0 +1,52 @@
+import pytest
+from pydantic import ValidationError
+from agno_service.workspace.risk_management import (
+    AssessmentRecord,
+    RiskAssessment,
+    RiskManagementFramework,
+    RiskLevel,
+)
+
+
+class TestAssessmentRecord:
+    @pytest.fixture
+    def risk_framework(self):
+        return RiskManagementFramework("TEST_AGENT")
+
+    @pytest.mark.asyncio
+    async def test_hot_path_returns_record(self, risk_framework):
+        assessment = await risk_framework.assess_risk({"action": "share_family_photos", "context": {}})
+        assert isinstance(assessment, AssessmentRecord)
+        assert not hasattr(assessment, "__dict__")
+
+    @pytest.mark.asyncio
+    async def test_to_model_and_to_dict_agree(self, risk_framework):
+        for action in ["read_file", "sudo delete admin token", "transfer payment", "publish family news"]:
+            record = await risk_framework.assess_risk({"action": action, "context": {"amount": 5000}})
+            model = record.to_model()
+            assert isinstance(model, RiskAssessment)
+            assert record.to_dict() == model.model_dump(mode="json")
+
+    def test_validation_happens_at_boundary(self):
+        record = AssessmentRecord(
+            risk_level=RiskLevel.LOW,
+            risk_score=42.0,
+            categories=[],
+            pros=[],
+            cons=[],
+            mitigation_strategies=[],
+            requires_human_approval=False,
+            confidence_level=0.85,
+            assessed_by="TEST_AGENT"
+        )
+        with pytest.raises(ValidationError):
+            record.to_model()
+
+    @pytest.mark.asyncio
+    async def test_copy_is_independent(self, risk_framework):
+        record = await risk_framework.assess_risk({"action": "publish report", "context": {}})
+        copy = record.copy(assessed_by="CSO_Sentinel")
+        copy.cons.append("extra")
+        assert copy.assessed_by == "CSO_Sentinel"
+        assert record.assessed_by == "TEST_AGENT"
+        assert "extra" not in record.cons
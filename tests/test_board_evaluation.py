@@ -0,0 +1,58 @@
+import pytest
+from agno_service.workspace.board_evaluation import BOARD_TABLES, evaluate_board
+from agno_service.workspace.epic_doctrine import BOARD_ROLES
+from agno_service.workspace.risk_event_log import RISK_EVENT_LOG
+from agno_service.workspace.risk_management import RiskManagementFramework, RiskLevel
+
+TASKS = [
+    {"action": "read_file", "context": {}},
+    {"action": "transfer_funds", "context": {"amount": 50000}},
+    {"action": "sudo delete admin token", "context": {}},
+    {"action": "share_family_photos", "context": {}},
+    {"action": "connect webhook", "context": {}},
+]
+
+
+class TestBoardEvaluation:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("task", TASKS)
+    async def test_matches_eleven_separate_assessments(self, task):
+        frameworks = [RiskManagementFramework(member) for member in BOARD_ROLES]
+        separate = [await framework.assess_risk(task) for framework in frameworks]
+
+        evaluation = evaluate_board(frameworks[0], task)
+        assert [a.assessed_by for a in evaluation.assessments] == list(BOARD_ROLES)
+
+        shared = {"assessment_timestamp"}
+        assert [{k: v for k, v in a.to_dict().items() if k not in shared} for a in evaluation.assessments] == \
+            [{k: v for k, v in a.to_dict().items() if k not in shared} for a in separate]
+
+        expected = await frameworks[0].get_board_consensus(separate)
+        assert evaluation.consensus() == expected
+        assert await frameworks[0].get_board_consensus(evaluation.assessments) == expected
+
+    def test_role_tables(self):
+        members = list(BOARD_TABLES.members)
+        assert BOARD_TABLES.tolerance[members.index("CINO_Pioneer")] == RiskLevel.HIGH.value
+        assert BOARD_TABLES.tolerance[members.index("CSO_Sentinel")] == RiskLevel.LOW.value
+        veto_members = {m for m, v in zip(members, BOARD_TABLES.veto_min) if v == RiskLevel.HIGH.value}
+        assert veto_members == {"CSO_Sentinel", "CRO_Guardian", "CQO_Oracle"}
+        # The CEO's veto_power flag is deliberately not a consensus veto
+        assert BOARD_ROLES["CEO_Visionary"]["veto_power"]
+        assert "CEO_Visionary" not in veto_members
+
+    def test_verdicts(self):
+        evaluation = evaluate_board(RiskManagementFramework("CEO_Visionary"), {"action": "sudo delete", "context": {}})
+        # sudo (3) + delete (2) = 5.0, MEDIUM
+        verdicts = evaluation.verdicts()
+        assert all(v["approves"] and not v["vetoes"] for v in verdicts.values())
+        assert verdicts["CINO_Pioneer"]["within_tolerance"]
+        assert not verdicts["CPHO_Sage"]["within_tolerance"]
+        assert evaluation.consensus() == (True, "Board approval granted (11/11 votes)")
+
+    def test_records_one_scoring_pass(self):
+        framework = RiskManagementFramework("CEO_Visionary")
+        submitted = RISK_EVENT_LOG.submitted
+        evaluate_board(framework, TASKS[2])
+        assert len(framework.risk_history) == 1
+        assert RISK_EVENT_LOG.submitted == submitted + 1
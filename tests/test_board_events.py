@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import pytest
+from agno_service.workspace.board_events import board_decision_events, format_sse, team_chunks
+
+
+def parse(frames):
+    """(event, data) pairs from SSE frames"""
+    events = []
+    for frame in frames:
+        fields = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def decision(approved=True):
+    async def decide():
+        return {
+            "approved": approved,
+            "reason": "Board approval granted (7/11 votes)" if approved else "Vetoed by CSO_Security",
+            "risk_assessments": [{"assessed_by": "CEO_Visionary", "risk_level": 1}],
+            "member_timings": [],
+        }
+    return decide
+
+
+class StubTeam:
+    """Streams canned chunks with a delay; records whether it was stopped early"""
+
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+        self.closed = False
+        self.finished = False
+
+    async def _stream(self):
+        try:
+            for chunk in self.chunks:
+                await asyncio.sleep(self.delay)
+                yield chunk
+            self.finished = True
+        finally:
+            self.closed = True
+
+    async def arun(self, query, stream=False):
+        return self._stream()
+
+
+async def never_disconnected():
+    return False
+
+
+class TestBoardDecisionEvents:
+    def test_format_sse(self):
+        assert format_sse("verdict", {"approved": True}, 3) == 'event: verdict\nid: 3\ndata: {"approved": true}\n\n'
+
+    @pytest.mark.asyncio
+    async def test_verdict_before_team_output(self):
+        team = StubTeam(["Hello", " board"])
+        frames = [frame async for frame in board_decision_events(
+            decision(), lambda: team_chunks(team, "q"), lambda: False, never_disconnected
+        )]
+        events = parse(frames)
+        assert [event for event, _ in events] == ["assessments", "verdict", "chunk", "chunk", "done"]
+        assert events[1][1]["approved"] is True
+        assert "".join(data["text"] for event, data in events if event == "chunk") == "Hello board"
+        assert team.finished
+
+    @pytest.mark.asyncio
+    async def test_rejected_never_runs_team(self):
+        started = False
+
+        def chunks():
+            nonlocal started
+            started = True
+            return team_chunks(StubTeam(["x"]), "q")
+
+        events = parse([frame async for frame in board_decision_events(
+            decision(approved=False), chunks, lambda: False, never_disconnected
+        )])
+        assert [event for event, _ in events] == ["assessments", "verdict", "rejected"]
+        assert not started
+
+    @pytest.mark.asyncio
+    async def test_halt_stops_slow_team_run(self):
+        team = StubTeam(["a"] * 100, delay=0.05)
+        halted = False
+        events = []
+        async for frame in board_decision_events(
+            decision(), lambda: team_chunks(team, "q"), lambda: halted, never_disconnected, poll_interval=0.01
+        ):
+            events.append(parse([frame])[0])
+            if events[-1][0] == "chunk":
+                halted = True
+
+        assert [event for event, _ in events][-1] == "halted"
+        assert team.closed and not team.finished
+
+    @pytest.mark.asyncio
+    async def test_disconnect_stops_stream(self):
+        team = StubTeam(["a"] * 100, delay=0.01)
+        gone = asyncio.Event()
+
+        async def is_disconnected():
+            return gone.is_set()
+
+        events = []
+        async for frame in board_decision_events(
+            decision(), lambda: team_chunks(team, "q"), lambda: False, is_disconnected, poll_interval=0.01
+        ):
+            events.append(parse([frame])[0][0])
+            if events.count("chunk") == 2:
+                gone.set()
+
+        assert events.count("chunk") == 2
+        assert "done" not in events
+        assert team.closed and not team.finished
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_team_yields_whole_answer(self):
+        class BlockingTeam:
+            async def run(self, query):
+                return {"content": f"answer to {query}"}
+
+        assert [text async for text in team_chunks(BlockingTeam(), "q")] == ["answer to q"]
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from agno_service.workspace.board_jobs import (
+    CANCELLED,
+    FAILED,
+    QUEUED,
+    REJECTED,
+    SUCCEEDED,
+    BoardJobQueue,
+    QueueFull,
+)
+
+
+class DictRedis:
+    """Redis GET/SET over a dict"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+class GatedExecutor:
+    """Board decisions that finish only when released"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.started = 0
+        self.concurrent = 0
+        self.peak = 0
+
+    async def __call__(self, task):
+        self.started += 1
+        self.concurrent += 1
+        self.peak = max(self.peak, self.concurrent)
+        try:
+            await self.release.wait()
+        finally:
+            self.concurrent -= 1
+        if task.get("fail"):
+            raise RuntimeError("team run failed")
+        if task.get("reject"):
+            return {"status_code": 403, "detail": "Board rejected: Vetoed by CSO_Security"}
+        return {"status_code": 200, "body": {"approved": True, "response": task["query"]}}
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestBoardJobQueue:
+    @pytest.mark.asyncio
+    async def test_bounded_workers_and_outcomes(self):
+        execute = GatedExecutor()
+        jobs = BoardJobQueue(execute, workers=2, max_depth=10)
+        jobs.start()
+        submitted = [
+            await jobs.submit({"query": "a"}),
+            await jobs.submit({"query": "b", "reject": True}),
+            await jobs.submit({"query": "c", "fail": True}),
+        ]
+        await settle()
+        assert execute.started == 2
+        assert (await jobs.get(submitted[2].id))["status"] == QUEUED
+
+        execute.release.set()
+        results = [await jobs.wait(job.id, timeout=1) for job in submitted]
+        assert [result["status"] for result in results] == [SUCCEEDED, REJECTED, FAILED]
+        assert results[0]["outcome"]["body"]["response"] == "a"
+        assert results[2]["error"] == "team run failed"
+        assert execute.peak == 2
+
+        stats = jobs.stats()
+        assert stats["queue_wait"]["count"] == 3
+        assert stats["execution"]["outcomes"] == {SUCCEEDED: 1, REJECTED: 1, FAILED: 1}
+        await jobs.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_refused(self):
+        jobs = BoardJobQueue(GatedExecutor(), workers=1, max_depth=2)
+        await jobs.submit({"query": "a"})
+        await jobs.submit({"query": "b"})
+        with pytest.raises(QueueFull):
+            await jobs.submit({"query": "c"})
+        assert jobs.stats()["refused"] == 1
+
+    @pytest.mark.asyncio
+    async def test_state_visible_from_other_process(self):
+        redis = DictRedis()
+        execute = GatedExecutor()
+        execute.release.set()
+        owner = BoardJobQueue(execute, redis=redis, workers=1)
+        other = BoardJobQueue(execute, redis=redis, workers=1)
+        owner.start()
+        job = await owner.submit({"query": "a"})
+        await owner.wait(job.id, timeout=1)
+
+        result = await other.get(job.id)
+        assert result["status"] == SUCCEEDED
+        assert result["wait_ms"] >= 0 and result["exec_ms"] >= 0
+        assert await other.get("unknown") is None
+        await owner.stop()
+
+    @pytest.mark.asyncio
+    async def test_halt_cancels_queued_jobs(self):
+        halted = True
+        jobs = BoardJobQueue(GatedExecutor(), workers=1, is_halted=lambda: halted)
+        jobs.start()
+        job = await jobs.submit({"query": "a"})
+        result = await jobs.wait(job.id, timeout=1)
+        assert result["status"] == CANCELLED
+        assert result["started_at"] is None
+        await jobs.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_running_and_queued(self):
+        jobs = BoardJobQueue(GatedExecutor(), workers=1)
+        jobs.start()
+        running = await jobs.submit({"query": "a"})
+        queued = await jobs.submit({"query": "b"})
+        await settle()
+        await jobs.stop()
+        assert (await jobs.get(running.id))["status"] == CANCELLED
+        assert (await jobs.get(queued.id))["status"] == CANCELLED
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_evicted_past_retention(self):
+        execute = GatedExecutor()
+        execute.release.set()
+        jobs = BoardJobQueue(execute, workers=1, retention=2)
+        jobs.start()
+        first = await jobs.submit({"query": "a"})
+        await jobs.wait(first.id, timeout=1)
+        for query in "bc":
+            await jobs.wait((await jobs.submit({"query": query})).id, timeout=1)
+        assert await jobs.get(first.id) is None
+        await jobs.stop()
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from agno_service.workspace.board_registry import BoardRegistry, parse_warmup
+
+SEATS = ["CEO", "CQO", "CTO", "CSO", "CRO"]
+
+
+class CountingBuilder:
+    """Slow member builds, counted per seat"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.built = []
+        self.lock = threading.Lock()
+
+    def __call__(self, key):
+        time.sleep(self.delay)
+        with self.lock:
+            self.built.append(key)
+        return {"seat": key}
+
+
+class TestBoardRegistry:
+    def test_members_built_on_first_use(self):
+        builder = CountingBuilder()
+        board = BoardRegistry(builder, SEATS)
+        assert len(board) == 5
+        assert board.built_count == 0
+
+        assert board["CSO"] == {"seat": "CSO"}
+        assert board["CSO"] is board["CSO"]
+        assert builder.built == ["CSO"]
+        assert board.stats()["built"] == ["CSO"]
+        assert list(board) == SEATS
+        with pytest.raises(KeyError):
+            board["CFO"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_use_builds_once(self):
+        builder = CountingBuilder(delay=0.02)
+        board = BoardRegistry(builder, SEATS)
+        members = await asyncio.gather(*(board.get("CEO") for _ in range(8)))
+        assert builder.built == ["CEO"]
+        assert all(member is members[0] for member in members)
+
+    @pytest.mark.asyncio
+    async def test_warm_up_in_background(self):
+        builder = CountingBuilder(delay=0.02)
+        board = BoardRegistry(builder, SEATS)
+        warmup = asyncio.create_task(board.warm_up(["CEO", "CSO"]))
+        # The event loop keeps serving while members are built
+        await asyncio.sleep(0)
+        assert board.warmup["status"] == "running"
+        await warmup
+        assert board.warmup["status"] == "done"
+        assert sorted(builder.built) == ["CEO", "CSO"]
+
+        agents = await board.build_all()
+        assert [agent["seat"] for agent in agents] == SEATS
+        assert board.built_count == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_warm_up_reported(self):
+        def build(key):
+            raise RuntimeError("OPENAI_API_KEY not set")
+
+        board = BoardRegistry(build, SEATS)
+        await board.warm_up(["CEO"])
+        assert board.warmup["status"] == "failed"
+        assert board.built_count == 0
+
+    def test_parse_warmup(self):
+        assert parse_warmup("CSO, CEO", SEATS) == ["CEO", "CSO"]
+        assert parse_warmup("all", SEATS) == SEATS
+        assert parse_warmup("", SEATS) == []
+        with pytest.raises(ValueError):
+            parse_warmup("CEO,CFO", SEATS)
@@ -0,0 +1,144 @@
+import asyncio
+import random
+
+import pytest
+from agno_service.workspace.consensus import StreamingConsensus, consensus_as_completed
+from agno_service.workspace.epic_doctrine import BOARD_ROLES
+from agno_service.workspace.risk_management import RiskManagementFramework, RiskLevel
+
+BOARD = list(BOARD_ROLES)
+
+
+async def assessment_for(member, level):
+    assessment = await RiskManagementFramework(member).assess_risk({"action": "sudo delete", "context": {}})
+    assessment.risk_level = level
+    return assessment
+
+
+class TestStreamingConsensus:
+    @pytest.mark.asyncio
+    async def test_same_answers_as_batch_consensus(self):
+        framework = RiskManagementFramework("TEST_AGENT")
+        rng = random.Random(5)
+        levels = list(RiskLevel)
+        for _ in range(300):
+            members = rng.sample(BOARD, rng.randint(1, len(BOARD)))
+            assessments = [
+                await assessment_for(member, rng.choice(levels[:3] if rng.random() < 0.8 else levels))
+                for member in members
+            ]
+            expected = await framework.get_board_consensus(assessments)
+
+            evaluator = StreamingConsensus(members)
+            early = None
+            for received, assessment in enumerate(assessments, 1):
+                decision = evaluator.add(assessment)
+                if decision and early is None:
+                    early = decision
+                    # The early reason is the batch answer over what has arrived
+                    assert early == await framework.get_board_consensus(assessments[:received])
+                    assert len(evaluator.assessments) == received
+            assert evaluator.finish() == expected
+            assert evaluator.decision == expected
+            assert early is not None
+            assert early[0] == expected[0]
+
+    @pytest.mark.asyncio
+    async def test_veto_decides_immediately(self):
+        evaluator = StreamingConsensus(BOARD)
+        assert evaluator.add(await assessment_for("CEO_Visionary", RiskLevel.LOW)) is None
+        approved, reason = evaluator.add(await assessment_for("CSO_Sentinel", RiskLevel.CRITICAL))
+        assert not approved
+        assert reason.startswith("VETO by CSO_Sentinel")
+        assert len(evaluator.assessments) == 2
+
+    @pytest.mark.asyncio
+    async def test_approval_waits_for_veto_agents(self):
+        evaluator = StreamingConsensus(BOARD)
+        non_veto = [m for m in BOARD if m not in ("CSO_Sentinel", "CRO_Guardian", "CQO_Oracle")]
+        for member in non_veto:
+            assert evaluator.add(await assessment_for(member, RiskLevel.LOW)) is None
+        evaluator.add(await assessment_for("CSO_Sentinel", RiskLevel.LOW))
+        assert evaluator.add(await assessment_for("CRO_Guardian", RiskLevel.MEDIUM)) is None
+        approved, reason = evaluator.add(await assessment_for("CQO_Oracle", RiskLevel.LOW))
+        assert approved
+        assert len(evaluator.assessments) == 11
+
+    @pytest.mark.asyncio
+    async def test_approval_once_veto_agents_are_in(self):
+        evaluator = StreamingConsensus(BOARD)
+        first = ["CSO_Sentinel", "CRO_Guardian", "CQO_Oracle", "CEO_Visionary", "CTO_Architect",
+                 "CDO_Alchemist", "COO_Orchestrator"]
+        decisions = [evaluator.add(await assessment_for(member, RiskLevel.LOW)) for member in first]
+        assert decisions[:-1] == [None] * 6
+        assert decisions[-1] == (True, "Board approval granted (7/7 votes)")
+        assert len(evaluator.pending) == 4
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_threshold_unreachable(self):
+        evaluator = StreamingConsensus(BOARD)
+        approving = ["CSO_Sentinel", "CRO_Guardian", "CQO_Oracle"]
+        rejecting = ["CEO_Visionary", "CTO_Architect", "CDO_Alchemist", "COO_Orchestrator", "CINO_Pioneer"]
+        decisions = [evaluator.add(await assessment_for(member, RiskLevel.LOW)) for member in approving]
+        decisions += [evaluator.add(await assessment_for(member, RiskLevel.HIGH)) for member in rejecting]
+        # 3 approvals + 4 pending can still reach 7; 3 + 3 cannot
+        assert decisions[:-1] == [None] * 7
+        assert decisions[-1] == (False, "Insufficient board approval (3/8 votes required: 7/11)")
+
+    @pytest.mark.asyncio
+    async def test_unreachable_threshold_waits_for_veto_agents(self):
+        evaluator = StreamingConsensus(BOARD)
+        members = ["CEO_Visionary", "CTO_Architect", "CDO_Alchemist", "COO_Orchestrator", "CINO_Pioneer"]
+        decisions = [evaluator.add(await assessment_for(member, RiskLevel.HIGH)) for member in members]
+        # 0 + 6 pending cannot reach 7, but a pending veto agent could still veto
+        assert decisions == [None] * 5
+        assert evaluator.add(await assessment_for("CSO_Sentinel", RiskLevel.LOW)) is None
+        approved, reason = evaluator.add(await assessment_for("CRO_Guardian", RiskLevel.CRITICAL))
+        assert not approved
+        assert reason.startswith("VETO by CRO_Guardian")
+
+    @pytest.mark.asyncio
+    async def test_key_members_wait_for_veto_agents(self):
+        # Four members can never reach 7 approvals, yet the CEO alone does not decide
+        members = ["CEO_Visionary", "CQO_Oracle", "CSO_Sentinel", "CRO_Guardian"]
+        evaluator = StreamingConsensus(members)
+        assert evaluator.add(await assessment_for("CEO_Visionary", RiskLevel.LOW)) is None
+        assert evaluator.add(await assessment_for("CQO_Oracle", RiskLevel.LOW)) is None
+        approved, reason = evaluator.add(await assessment_for("CSO_Sentinel", RiskLevel.HIGH))
+        assert reason.startswith("VETO by CSO_Sentinel")
+
+    @pytest.mark.asyncio
+    async def test_skipped_members_count_as_missing(self):
+        evaluator = StreamingConsensus(BOARD)
+        non_veto = [m for m in BOARD if m not in ("CSO_Sentinel", "CRO_Guardian", "CQO_Oracle")]
+        for member in non_veto[:4]:
+            evaluator.skip(member)
+        for member in ("CSO_Sentinel", "CRO_Guardian"):
+            evaluator.add(await assessment_for(member, RiskLevel.LOW))
+        assert evaluator.decision is None
+        assert evaluator.skip("CQO_Oracle") == (False, "Insufficient board approval (2/2 votes required: 7/11)")
+
+
+class TestConsensusAsCompleted:
+    @pytest.mark.asyncio
+    async def test_cancels_pending_members_after_veto(self):
+        cancelled = []
+
+        async def slow(member):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(member)
+                raise
+
+        async def fast_veto():
+            return await assessment_for("CSO_Sentinel", RiskLevel.EXTREME)
+
+        members = {"CSO_Sentinel": fast_veto(), "CEO_Visionary": slow("CEO_Visionary"), "CRO_Guardian": slow("CRO_Guardian")}
+        decision, not_run = await asyncio.wait_for(
+            consensus_as_completed(StreamingConsensus(members), members), timeout=1
+        )
+        await asyncio.sleep(0)
+        assert not decision[0]
+        assert not_run == ["CEO_Visionary", "CRO_Guardian"]
+        assert sorted(cancelled) == not_run
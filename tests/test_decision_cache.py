@@ -0,0 +1,132 @@
+import asyncio
+import fnmatch
+import json
+
+import pytest
+from agno_service.workspace.decision_cache import DecisionCache, SingleFlight, task_key
+
+
+class DictRedis:
+    """The few Redis string commands the decision cache uses, over a dict"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def scan_iter(self, match="*", count=None):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+
+APPROVED = {"status_code": 200, "body": {"approved": True, "reason": "Board approval granted (7/11 votes)"}}
+
+
+class TestTaskKey:
+    def test_canonical(self):
+        assert task_key({"a": 1, "b": {"c": 2, "d": 3}}) == task_key({"b": {"d": 3, "c": 2}, "a": 1})
+
+    def test_scope_changes_key(self):
+        task = {"action": "read_file"}
+        assert task_key(task, "key", "builtin") != task_key(task, "key", "v2")
+        assert task_key(task, "key") != task_key(task, "full")
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flights = SingleFlight()
+        calls = 0
+
+        async def execute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return calls
+
+        results = await asyncio.gather(*(flights.do("k", execute) for _ in range(10)))
+        assert results == [1] * 10
+        assert calls == 1
+        assert flights.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 9}
+
+        # Finished executions are not reused
+        assert await flights.do("k", execute) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("team run failed")
+
+        results = await asyncio.gather(*(flights.do("k", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert "k" not in flights
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_execution(self):
+        flights = SingleFlight()
+
+        async def execute():
+            await asyncio.sleep(0.03)
+            return "done"
+
+        leader = asyncio.ensure_future(flights.do("k", execute))
+        follower = asyncio.ensure_future(flights.do("k", execute))
+        await asyncio.sleep(0.005)
+        leader.cancel()
+        assert await follower == "done"
+
+
+class TestDecisionCache:
+    @pytest.mark.asyncio
+    async def test_local_and_redis_levels(self):
+        redis = DictRedis()
+        cache = DecisionCache(ttl=30, maxsize=16)
+        assert await cache.get(redis, "k") is None
+        assert await cache.set(redis, "k", APPROVED, cache.generation)
+        assert json.loads(redis.data[cache.prefix + "k"]) == APPROVED
+
+        # Another process: empty local cache, same Redis
+        other = DecisionCache(ttl=30, maxsize=16)
+        assert await other.get(redis, "k") == APPROVED
+        assert other.redis_hits == 1
+        assert await other.get(redis, "k") == APPROVED
+        assert other.redis_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_clears_both_levels(self):
+        redis = DictRedis()
+        redis.data["unrelated"] = "keep"
+        cache = DecisionCache(ttl=30, maxsize=16)
+        for n in range(3):
+            await cache.set(redis, f"k{n}", APPROVED, cache.generation)
+
+        assert await cache.invalidate(redis) == 3
+        assert await cache.get(redis, "k0") is None
+        assert redis.data == {"unrelated": "keep"}
+
+    @pytest.mark.asyncio
+    async def test_outcome_from_before_invalidation_not_stored(self):
+        redis = DictRedis()
+        cache = DecisionCache(ttl=30, maxsize=16)
+        generation = cache.generation
+        await cache.invalidate(redis)  # HALT arrives while the decision is running
+        assert not await cache.set(redis, "k", APPROVED, generation)
+        assert await cache.get(redis, "k") is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_with_zero_ttl(self):
+        redis = DictRedis()
+        cache = DecisionCache(ttl=0, maxsize=16)
+        assert not await cache.set(redis, "k", APPROVED, cache.generation)
+        assert redis.data == {}
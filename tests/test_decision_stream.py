@@ -0,0 +1,208 @@
+import asyncio
+import json
+
+import pytest
+from agno_service.workspace.decision_stream import (
+    DecisionStreamWorker,
+    decision_row,
+    entry_timestamp,
+    publish_decision,
+)
+
+
+class RecordingRedis:
+    """Records the stream commands the worker issues"""
+
+    def __init__(self):
+        self.added = []
+        self.acked = []
+
+    async def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self.added.append((stream, fields, maxlen, approximate))
+        return f"{1700000000000 + len(self.added)}-0"
+
+    async def xack(self, stream, group, *ids):
+        self.acked.extend(ids)
+        return len(ids)
+
+
+class FlakyDatabase:
+    """insert_rows double: fails the first `failures` calls, rejects rows by reason"""
+
+    def __init__(self, failures=0, error=ConnectionError("connection refused"), reject_reason=None):
+        self.failures = failures
+        self.error = error
+        self.reject_reason = reject_reason
+        self.rows = {}
+        self.calls = 0
+
+    def insert(self, rows):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        if self.reject_reason and any(row[4] == self.reject_reason for row in rows):
+            raise ValueError("invalid input syntax for type json")
+        new = [row for row in rows if row[0] not in self.rows]
+        self.rows.update((row[0], row) for row in new)
+        return len(new)
+
+
+class DroppingRedis(RecordingRedis):
+    """Loses the connection on the first read, then delivers `entries` once"""
+
+    def __init__(self, entries):
+        super().__init__()
+        self.entries = list(entries)
+        self.groups_created = 0
+        self.reads = 0
+
+    async def xgroup_create(self, stream, group, id="0", mkstream=False):
+        self.groups_created += 1
+        if self.groups_created > 1:
+            raise Exception("BUSYGROUP Consumer Group name already exists")
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        if streams[next(iter(streams))] == "0":
+            return []
+        self.reads += 1
+        if self.reads == 1:
+            raise ConnectionError("Connection closed by server.")
+        if self.entries:
+            entries, self.entries = self.entries, []
+            return [(next(iter(streams)), entries)]
+        await asyncio.sleep(block / 1000.0)
+        return []
+
+
+def entry(n, reason="ok", approved=True):
+    decision = {"task": {"action": f"task {n}"}, "assessments": [], "approved": approved, "reason": reason}
+    return f"17000000{n:05d}-0", {"decision": json.dumps(decision)}
+
+
+def make_worker(database, redis=None, **kwargs):
+    return DecisionStreamWorker(redis or RecordingRedis(), database.insert, consumer="test", retry_backoff=0.0, **kwargs)
+
+
+class TestDecisionRows:
+    def test_decision_row(self):
+        entry_id, fields = entry(1, reason="Board approval granted")
+        row = decision_row(entry_id, fields)
+        assert row[0] == entry_id
+        assert json.loads(row[1]) == {"action": "task 1"}
+        assert row[3:5] == (True, "Board approval granted")
+        assert row[5] == entry_timestamp(entry_id)
+        assert row[6] is None
+        assert entry_timestamp("1700000000123-4").timestamp() == 1700000000.123
+
+    def test_execution_plan_recorded(self):
+        plan = {"tier": "fast", "members": ["COO"], "risk_level": "LOW", "categories": [], "reason": "LOW risk"}
+        decision = {"task": {}, "assessments": [], "approved": True, "execution_plan": plan}
+        row = decision_row("1-0", {"decision": json.dumps(decision)})
+        assert json.loads(row[6]) == {"execution_plan": plan}
+
+    @pytest.mark.parametrize("fields", [{}, {"decision": "not json"}, {"decision": json.dumps({"task": {}})}])
+    def test_malformed_rows(self, fields):
+        with pytest.raises(ValueError):
+            decision_row("1-0", fields)
+
+    @pytest.mark.asyncio
+    async def test_publish_is_capped(self):
+        redis = RecordingRedis()
+        await publish_decision(redis, {"task": {}, "assessments": [], "approved": False}, stream="s", maxlen=50)
+        stream, fields, maxlen, approximate = redis.added[0]
+        assert (stream, maxlen, approximate) == ("s", 50, True)
+        assert json.loads(fields["decision"])["approved"] is False
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_does_not_raise(self):
+        class DownRedis:
+            async def xadd(self, *args, **kwargs):
+                raise ConnectionError("Connection closed by server.")
+
+        assert await publish_decision(DownRedis(), {"task": {}, "assessments": [], "approved": True}) is None
+
+
+class TestDecisionStreamWorker:
+    @pytest.mark.asyncio
+    async def test_batch_inserted_then_acked(self):
+        database = FlakyDatabase()
+        worker = make_worker(database)
+        entries = [entry(n) for n in range(5)]
+        await worker.process(entries)
+
+        assert database.calls == 1
+        assert len(database.rows) == 5
+        assert worker.redis.acked == [entry_id for entry_id, _ in entries]
+        assert (worker.batches, worker.inserted, worker.acked) == (1, 5, 5)
+
+    @pytest.mark.asyncio
+    async def test_redelivery_is_idempotent(self):
+        database = FlakyDatabase()
+        worker = make_worker(database)
+        entries = [entry(n) for n in range(3)]
+        await worker.process(entries)
+        await worker.process(entries)
+        assert len(database.rows) == 3
+        assert worker.duplicates == 3
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_retried(self):
+        database = FlakyDatabase(failures=2)
+        worker = make_worker(database, max_retries=3)
+        await worker.process([entry(1)])
+        assert worker.retries == 2
+        assert worker.acked == 1
+        assert worker.batch_latency.snapshot()["outcomes"] == {"error": 2, "ok": 1}
+
+    @pytest.mark.asyncio
+    async def test_outage_leaves_entries_pending(self):
+        database = FlakyDatabase(failures=10)
+        worker = make_worker(database, max_retries=2)
+        await worker.process([entry(1), entry(2)])
+        assert worker.redis.acked == []
+        assert worker.redis.added == []
+        assert worker.stalled == 2
+
+    @pytest.mark.asyncio
+    async def test_rejected_rows_isolated_and_dead_lettered(self):
+        database = FlakyDatabase(reject_reason="bad")
+        worker = make_worker(database)
+        entries = [entry(n, reason="bad" if n == 5 else "ok") for n in range(8)]
+        await worker.process(entries)
+
+        assert sorted(database.rows) == sorted(entry_id for entry_id, _ in entries if entry_id != entries[5][0])
+        assert sorted(worker.redis.acked) == sorted(entry_id for entry_id, _ in entries)
+        assert worker.dead_lettered == 1
+        dead_stream, dead_fields, _, _ = worker.redis.added[0]
+        assert dead_stream == worker.dead_letter_stream
+        assert dead_fields["entry_id"] == entries[5][0]
+
+    @pytest.mark.asyncio
+    async def test_malformed_entries_dead_lettered(self):
+        database = FlakyDatabase()
+        worker = make_worker(database)
+        await worker.process([("1-0", {"decision": "{"}), ("2-0", {}), entry(3)])
+        assert worker.dead_lettered == 2
+        assert len(database.rows) == 1
+        assert sorted(worker.redis.acked) == sorted(["1-0", "2-0", entry(3)[0]])
+
+    @pytest.mark.asyncio
+    async def test_run_reconnects_after_connection_loss(self):
+        database = FlakyDatabase()
+        redis = DroppingRedis([entry(1), entry(2)])
+        worker = make_worker(database, redis=redis)
+        task = asyncio.create_task(worker.run())
+        try:
+            for _ in range(100):
+                if worker.acked == 2:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        assert worker.reconnects == 1
+        assert redis.groups_created == 2
+        assert len(database.rows) == 2
+        assert (await worker.stats())["reconnects"] == 1
@@ -0,0 +1,41 @@
+from agno_service.workspace import doctrine_prompt
+from agno_service.workspace.doctrine_prompt import (
+    DOCTRINE_PROMPT,
+    ESTIMATE_TOKENIZER,
+    DoctrinePrompt,
+    count_tokens,
+)
+from agno_service.workspace.epic_doctrine import BOARD_ROLES, EPIC_DOCTRINE
+
+
+class TestDoctrinePrompt:
+    def test_prefix_shared_across_agents(self):
+        cso = DOCTRINE_PROMPT.instructions("CSO_Sentinel", ["Block suspicious activity"])
+        cto = DOCTRINE_PROMPT.instructions("CTO_Architect")
+        n = len(DOCTRINE_PROMPT.shared)
+        assert cso[:n] == cto[:n]
+        assert all(a is b for a, b in zip(cso[:n], cto[:n]))
+        assert cso[n] == "\nYOUR ROLE: CSO_Sentinel"
+        assert cso[-1] == "Block suspicious activity"
+
+    def test_doctrine_content(self):
+        assert "DOCTRINE: PRIMARY_DIRECTIVE = Every action must benefit Edward Ip and family first" in DOCTRINE_PROMPT.shared
+        assert "  - CRITICAL: Automatic rejection" in DOCTRINE_PROMPT.shared
+        assert DOCTRINE_PROMPT.shared[-1] == "- You MUST prioritize Edward Ip's interests above all else"
+        assert set(DOCTRINE_PROMPT.sections) == set(BOARD_ROLES)
+
+    def test_version_tracks_wording(self):
+        assert DoctrinePrompt().version == DOCTRINE_PROMPT.version
+        changed = dict(EPIC_DOCTRINE, FAIL_SAFE="When uncertain, ask Edward")
+        assert DoctrinePrompt(changed).version != DOCTRINE_PROMPT.version
+
+    def test_token_counts_without_tokenizer(self, monkeypatch):
+        monkeypatch.setattr(doctrine_prompt, "tiktoken", None)
+        prompt = DoctrinePrompt()
+        counts = prompt.token_counts("gpt-4o")
+        assert counts["tokenizer"] == ESTIMATE_TOKENIZER
+        assert counts["shared"] == count_tokens(prompt.text)
+        assert prompt.token_counts("gpt-4o") is counts
+        role = counts["roles"]["CSO_Sentinel"]
+        assert prompt.prompt_tokens("CSO_Sentinel", model_id="gpt-4o") == counts["shared"] + role
+        assert prompt.prompt_tokens("CSO_Sentinel", ["abcd" * 10], model_id="gpt-4o") == counts["shared"] + role + 10
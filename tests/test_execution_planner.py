@@ -0,0 +1,65 @@
+import pytest
+from agno_service.workspace.execution_planner import (
+    BOARD_SEATS,
+    FAST,
+    FULL,
+    SUBTEAM,
+    ExecutionPlanner,
+)
+from agno_service.workspace.risk_management import RiskCategory, RiskLevel, RiskManagementFramework
+
+
+class TestExecutionPlanner:
+    def test_tiers(self):
+        planner = ExecutionPlanner()
+        assert planner.plan(RiskLevel.LOW).tier == FAST
+        assert planner.plan(RiskLevel.LOW).members == ("COO",)
+        assert planner.plan(RiskLevel.MEDIUM, [RiskCategory.FINANCIAL]).tier == SUBTEAM
+        for level in (RiskLevel.HIGH, RiskLevel.CRITICAL, RiskLevel.EXTREME):
+            plan = planner.plan(level)
+            assert plan.tier == FULL
+            assert plan.members == BOARD_SEATS
+
+    def test_subteam_follows_categories(self):
+        planner = ExecutionPlanner()
+        assert planner.plan(RiskLevel.MEDIUM, [RiskCategory.FINANCIAL]).members == ("CEO", "CRO")
+        assert planner.plan(RiskLevel.MEDIUM, [RiskCategory.TECHNICAL]).members == ("CTO", "CSO")
+        assert planner.plan(RiskLevel.MEDIUM).members == ("CEO", "COO")
+
+        # More members than a sub-team allows: the full board runs it
+        wide = ExecutionPlanner(max_subteam=3).plan(
+            RiskLevel.MEDIUM, [RiskCategory.FINANCIAL, RiskCategory.TECHNICAL]
+        )
+        assert wide.tier == FULL
+
+    def test_task_metadata_leaves_fast_path(self):
+        planner = ExecutionPlanner()
+        plan = planner.plan(RiskLevel.LOW, task={"action": "read_file", "requires_verification": True})
+        assert (plan.tier, plan.members) == (SUBTEAM, ("CQO",))
+
+    @pytest.mark.asyncio
+    async def test_plan_from_assessments(self):
+        framework = RiskManagementFramework("CEO_Visionary")
+        planner = ExecutionPlanner()
+        low = await framework.assess_risk({"action": "read_file"})
+        assert planner.plan_assessments([low]).tier == FAST
+
+        high = await framework.assess_risk({"action": "sudo delete admin token"})
+        plan = planner.plan_assessments([low, high])
+        assert plan.tier == FULL
+        assert plan.to_dict()["risk_level"] == high.risk_level.name
+        assert planner.plan_assessments([]).tier == FULL
+
+    def test_latency_per_tier(self):
+        planner = ExecutionPlanner()
+        planner.record(planner.plan(RiskLevel.LOW), 0.2, "miss")
+        planner.record(planner.plan(RiskLevel.LOW), 0.0, "hit")
+        planner.record(planner.plan(RiskLevel.HIGH), 4.0, "miss")
+        tiers = planner.stats()["tiers"]
+        assert tiers[FAST]["count"] == 2
+        assert tiers[FAST]["outcomes"] == {"miss": 1, "hit": 1}
+        assert tiers[FULL]["max_ms"] == 4000.0
+
+    def test_unknown_seat_rejected(self):
+        with pytest.raises(ValueError):
+            ExecutionPlanner(fast_member="CFO")
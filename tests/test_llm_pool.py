@@ -0,0 +1,345 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from typing import ClassVar
+
+import pytest
+from agno_service.workspace.llm_pool import (
+    ANTHROPIC,
+    COMPLETION_TOKENS,
+    OPENAI,
+    ConcurrencyLimit,
+    PooledLLM,
+    PooledStreamManagerLLM,
+    ProviderLimiter,
+    ProviderPool,
+    TokenBucket,
+    estimate_request_tokens,
+)
+
+MESSAGES = [{"role": "user", "content": "Assess the quarterly transfer"}]
+
+
+class ChunkLLM:
+    """Shaped like phi's OpenAIChat and Gemini: invoke_stream yields chunks"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def invoke_stream(self, messages):
+        yield from self.chunks
+
+    def response_stream(self, messages):
+        for chunk in self.invoke_stream(messages=messages):
+            yield chunk
+
+
+class StreamManager:
+    """Shaped like the Anthropic SDK's MessageStreamManager"""
+
+    def __init__(self, events):
+        self.events = events
+        self.entered = False
+        self.exited = False
+
+    def __enter__(self):
+        self.entered = True
+        return iter(self.events)
+
+    def __exit__(self, *exc_info):
+        self.exited = True
+
+
+class ManagerLLM:
+    """Shaped like phi's Claude: response_stream enters what invoke_stream returns"""
+
+    def __init__(self, events):
+        self.manager = StreamManager(events)
+
+    def invoke_stream(self, messages):
+        return self.manager
+
+    def response_stream(self, messages):
+        response = self.invoke_stream(messages=messages)
+        with response as stream:
+            for event in stream:
+                yield event
+
+
+class TestTokenBucket:
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(per_minute=60)
+        assert all(bucket.reserve() == 0.0 for _ in range(60))
+        # One a second once the burst is spent
+        assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+        assert bucket.reserve() == pytest.approx(2.0, abs=0.05)
+
+    def test_oversized_request_waits_for_full_bucket(self):
+        bucket = TokenBucket(per_minute=600)
+        assert bucket.reserve(10000) == 0.0
+        assert bucket.reserve(10000) == pytest.approx(60.0, abs=0.1)
+
+    def test_disabled(self):
+        bucket = TokenBucket(per_minute=0)
+        assert not bucket.enabled
+        assert bucket.reserve(10 ** 9) == 0.0
+
+
+class TestConcurrencyLimit:
+    @pytest.mark.asyncio
+    async def test_limit_respected(self):
+        limit = ConcurrencyLimit(2)
+        running, peak = 0, 0
+
+        async def call():
+            nonlocal running, peak
+            await limit.aacquire()
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            limit.release()
+
+        await asyncio.gather(*(call() for _ in range(10)))
+        assert peak == 2
+        assert limit.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        limit = ConcurrencyLimit(1)
+        await limit.aacquire()
+        waiter = asyncio.create_task(limit.aacquire())
+        await asyncio.sleep(0)
+        assert limit.waiting == 1
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert limit.waiting == 0
+        limit.release()
+        assert limit.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_shared_by_threads_and_tasks(self):
+        limit = ConcurrencyLimit(1)
+        limit.acquire()
+        order = []
+
+        def sync_call():
+            limit.acquire()
+            order.append("thread")
+            limit.release()
+
+        async def async_call():
+            await limit.aacquire()
+            order.append("task")
+            limit.release()
+
+        thread = threading.Thread(target=sync_call)
+        thread.start()
+        while limit.waiting < 1:
+            await asyncio.sleep(0.001)
+        task = asyncio.create_task(async_call())
+        while limit.waiting < 2:
+            await asyncio.sleep(0.001)
+        limit.release()
+        await task
+        thread.join(1)
+        assert order == ["thread", "task"]
+        assert limit.in_use == 0
+
+
+class TestProviderLimiter:
+    def test_estimate_request_tokens(self):
+        messages = [{"role": "system", "content": "x" * 400}, {"role": "user", "content": None}]
+        assert estimate_request_tokens(messages) == 100 + COMPLETION_TOKENS
+        assert estimate_request_tokens(messages, max_tokens=50) == 150
+
+    def test_token_limit_queues(self):
+        limiter = ProviderLimiter("stub", max_concurrency=4, rpm=0, tpm=6000)
+        with limiter.slot(6000) as waited:
+            assert waited < 0.05
+        start = time.perf_counter()
+        with limiter.slot(10) as waited:
+            pass
+        # 10 tokens at 100 tokens/second
+        assert waited == pytest.approx(0.1, abs=0.05)
+        assert time.perf_counter() - start >= 0.08
+        stats = limiter.stats()
+        assert stats["throttled"] == 1
+        assert stats["tokens_reserved"] == 6010
+        assert stats["queue_wait"]["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stats_after_burst(self):
+        limiter = ProviderLimiter("stub", max_concurrency=3)
+
+        async def call():
+            async with limiter.aslot(100):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(call() for _ in range(9)))
+        stats = limiter.stats()
+        assert stats["peak_in_flight"] == 3
+        assert stats["in_flight"] == 0
+        assert stats["call_time"]["outcomes"] == {"ok": 9}
+        assert stats["throttled"] >= 6
+
+    @pytest.mark.asyncio
+    async def test_error_releases_slot(self):
+        limiter = ProviderLimiter("stub", max_concurrency=1)
+        with pytest.raises(RuntimeError):
+            async with limiter.aslot():
+                raise RuntimeError("provider error")
+        assert limiter.stats()["in_flight"] == 0
+        assert limiter.call_time.outcomes["error"] == 1
+
+
+class TestProviderPool:
+    def test_one_http_client_per_pool(self):
+        pool = ProviderPool({"openai": {"max_concurrency": 2, "rpm": 0, "tpm": 0}})
+        assert pool.http_client() is pool.http_client()
+        assert pool.limiter("openai").concurrency.limit == 2
+        assert pool.stats()["clients"] == ["http"]
+        asyncio.run(pool.aclose())
+        assert pool.stats()["clients"] == []
+
+
+class TestPooledLLM:
+    def test_chunk_stream_holds_slot_until_exhausted(self):
+        pool = ProviderPool()
+
+        class PooledChunkLLM(PooledLLM, ChunkLLM):
+            pool_provider = OPENAI
+            llm_pool = pool
+
+        limiter = pool.limiter(OPENAI)
+        in_flight = [limiter.stats()["in_flight"] for _ in PooledChunkLLM(["a", "b"]).response_stream(MESSAGES)]
+        assert in_flight == [1, 1]
+        assert limiter.stats()["in_flight"] == 0
+        assert limiter.call_time.outcomes == {"ok": 1}
+
+    def test_abandoned_chunk_stream_releases_slot(self):
+        pool = ProviderPool()
+
+        class PooledChunkLLM(PooledLLM, ChunkLLM):
+            pool_provider = OPENAI
+            llm_pool = pool
+
+        stream = PooledChunkLLM(["a", "b", "c"]).response_stream(MESSAGES)
+        assert next(stream) == "a"
+        stream.close()
+        assert pool.limiter(OPENAI).stats()["in_flight"] == 0
+
+    def test_stream_manager_entered_inside_slot(self):
+        pool = ProviderPool()
+
+        class PooledManagerLLM(PooledStreamManagerLLM, ManagerLLM):
+            pool_provider = ANTHROPIC
+            llm_pool = pool
+
+        llm = PooledManagerLLM(["start", "delta", "stop"])
+        limiter = pool.limiter(ANTHROPIC)
+        seen = []
+        for event in llm.response_stream(MESSAGES):
+            seen.append((event, limiter.stats()["in_flight"]))
+        assert seen == [("start", 1), ("delta", 1), ("stop", 1)]
+        assert llm.manager.entered and llm.manager.exited
+        assert limiter.stats()["in_flight"] == 0
+        assert limiter.stats()["tokens_reserved"] == estimate_request_tokens(MESSAGES)
+
+    def test_generator_mixin_cannot_serve_a_stream_manager(self):
+        # Why Claude needs PooledStreamManagerLLM: a generator has no __enter__
+        class GeneratorManagerLLM(PooledLLM, ManagerLLM):
+            pool_provider = ANTHROPIC
+            llm_pool = ProviderPool()
+
+        with pytest.raises((AttributeError, TypeError)):
+            list(GeneratorManagerLLM(["start"]).response_stream(MESSAGES))
+
+
+def phi_agent_factory():
+    """agent_factory needs phi and every provider SDK; skip where they are not installed"""
+    return pytest.importorskip("agno_service.workspace.agent_factory", exc_type=ImportError)
+
+
+class TestPhiResponseStream:
+    """Each pooled phi LLM class driving phi's own response_stream against a stub provider client"""
+
+    def test_openai_chat(self):
+        agent_factory = phi_agent_factory()
+        from openai.types.chat import ChatCompletionChunk
+        from phi.llm.message import Message
+
+        pool = ProviderPool()
+        chunk = ChatCompletionChunk.model_validate({
+            "id": "chunk-1", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o",
+            "choices": [{"index": 0, "delta": {"role": "assistant", "content": "Approved"}, "finish_reason": None}],
+        })
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: iter([chunk]))))
+
+        class StubOpenAIChat(agent_factory.PooledOpenAIChat):
+            llm_pool: ClassVar[ProviderPool] = pool
+
+            def get_client(self):
+                return client
+
+        llm = StubOpenAIChat(model="gpt-4o")
+        assert "".join(llm.response_stream([Message(role="user", content="Assess")])) == "Approved"
+        assert pool.limiter(OPENAI).call_time.outcomes == {"ok": 1}
+        assert pool.limiter(OPENAI).stats()["in_flight"] == 0
+
+    def test_anthropic(self):
+        agent_factory = phi_agent_factory()
+        from anthropic.types import RawContentBlockDeltaEvent, TextDelta
+        from phi.llm.message import Message
+
+        pool = ProviderPool()
+        manager = StreamManager([
+            RawContentBlockDeltaEvent(type="content_block_delta", index=0, delta=TextDelta(type="text_delta", text="Vetoed")),
+        ])
+        client = SimpleNamespace(messages=SimpleNamespace(stream=lambda **kwargs: manager))
+
+        class StubAnthropic(agent_factory.PooledAnthropic):
+            llm_pool: ClassVar[ProviderPool] = pool
+
+            @property
+            def client(self):
+                return client
+
+        llm = StubAnthropic(model="claude-3-5-sonnet-20241022")
+        assert "".join(llm.response_stream([Message(role="user", content="Assess")])).strip() == "Vetoed"
+        assert manager.entered and manager.exited
+        assert pool.limiter(ANTHROPIC).call_time.outcomes == {"ok": 1}
+        assert pool.limiter(ANTHROPIC).stats()["in_flight"] == 0
+
+    def test_gemini(self):
+        agent_factory = phi_agent_factory()
+        from agno_service.workspace.llm_pool import GEMINI
+        from phi.llm.message import Message
+
+        class Part:
+            def __init__(self, text):
+                self.text = text
+
+            @staticmethod
+            def to_dict(part):
+                return {"text": part.text}
+
+        pool = ProviderPool()
+        response = SimpleNamespace(
+            candidates=[SimpleNamespace(content=SimpleNamespace(role="model", parts=[Part("Approved")]))],
+            usage_metadata=None,
+        )
+        client = SimpleNamespace(generate_content=lambda **kwargs: iter([response]))
+
+        class StubGemini(agent_factory.PooledGemini):
+            llm_pool: ClassVar[ProviderPool] = pool
+
+            @property
+            def client(self):
+                return client
+
+        llm = StubGemini(model="gemini-1.5-flash")
+        assert "".join(llm.response_stream([Message(role="user", content="Assess")])) == "Approved"
+        assert pool.limiter(GEMINI).call_time.outcomes == {"ok": 1}
+        assert pool.limiter(GEMINI).stats()["in_flight"] == 0
@@ -0,0 +1,161 @@
+import asyncio
+import time
+
+import pytest
+from agno_service.workspace.epic_doctrine import BOARD_ROLES
+from agno_service.workspace.member_assessment import (
+    ABSTAIN,
+    FAIL_CLOSED,
+    assess_members,
+    parse_deadlines,
+)
+from agno_service.workspace.metrics import LatencyRegistry
+from agno_service.workspace.risk_management import RiskManagementFramework
+
+BOARD = list(BOARD_ROLES)
+KEY_MEMBERS = ["CEO_Visionary", "CQO_Oracle", "CSO_Sentinel", "CRO_Guardian"]
+
+
+class SlowMember:
+    """Board member whose assessment takes a fixed time"""
+
+    def __init__(self, name, delay=0.0, fails=False, framework=True):
+        self.name = name
+        self.delay = delay
+        self.fails = fails
+        self.risk_framework = RiskManagementFramework(name) if framework else None
+        self.cancelled = False
+
+    async def assess_risk(self, task):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fails:
+            raise RuntimeError("assessment backend unavailable")
+        return await self.risk_framework.assess_risk(task) if self.risk_framework else None
+
+
+LOW_TASK = {"action": "read_file", "context": {}}
+HIGH_TASK = {"action": "sudo delete admin token", "context": {}}
+HIGH_RISK_TRANSFER = {"action": "transfer all treasury funds with admin credentials", "context": {"amount": 5000000}}
+
+
+def board(delay=0.0, **overrides):
+    """Full board; overrides map a member name to SlowMember keyword arguments"""
+    return [SlowMember(name, **{"delay": delay, **overrides.get(name, {})}) for name in BOARD]
+
+
+class TestAssessMembers:
+    @pytest.mark.asyncio
+    async def test_members_run_concurrently(self):
+        members = board(delay=0.05)
+        started = time.perf_counter()
+        result = await assess_members(members, LOW_TASK, deadlines={}, default_deadline=1.0, metrics=None)
+        elapsed = time.perf_counter() - started
+
+        # Eleven 50ms assessments in about 50ms, not 550ms
+        assert elapsed < 0.2
+        assert result.decision[0] is True
+        names = [t.member for t in result.timings]
+        assert names == sorted(names, key=BOARD.index)
+        assert all(t.elapsed >= 0.05 for t in result.timings if t.status == "ok")
+
+    @pytest.mark.asyncio
+    async def test_key_members_wait_for_veto_agents(self):
+        # Four members can never reach 7 approvals, but the first report must
+        # not settle it while a veto agent is still assessing
+        members = [SlowMember("CEO_Visionary")] + [SlowMember(name, delay=0.02) for name in KEY_MEMBERS[1:]]
+        result = await assess_members(members, LOW_TASK, deadlines={}, default_deadline=1.0, metrics=None)
+        expected = await RiskManagementFramework("CEO_Visionary").get_board_consensus(result.assessments)
+        assert result.decision == expected == (False, "Insufficient board approval (4/4 votes required: 7/11)")
+        assert result.cancelled == []
+        assert not any(member.cancelled for member in members)
+
+    @pytest.mark.asyncio
+    async def test_key_members_on_high_risk_transfer(self):
+        metrics = LatencyRegistry()
+        members = [SlowMember(name) for name in KEY_MEMBERS]
+        result = await assess_members(members, HIGH_RISK_TRANSFER, deadlines={}, default_deadline=1.0, metrics=metrics)
+
+        assert len(result.assessments) == 4
+        approved, reason = result.decision
+        assert not approved
+        assert reason.startswith("VETO by ")
+        expected = await RiskManagementFramework("CEO_Visionary").get_board_consensus(result.assessments)
+        assert result.decision == expected
+        assert result.cancelled == []
+        assert [t.status for t in result.timings] == ["ok"] * 4
+        snapshot = metrics.snapshot()
+        assert all(snapshot[name]["outcomes"] == {"ok": 1} for name in KEY_MEMBERS)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("task", [LOW_TASK, HIGH_TASK])
+    async def test_matches_sequential_consensus(self, task):
+        result = await assess_members(board(), task, deadlines={}, default_deadline=1.0, metrics=None)
+        sequential = [await RiskManagementFramework(name).assess_risk(task) for name in BOARD]
+        expected = await RiskManagementFramework("CEO_Visionary").get_board_consensus(sequential)
+        assert result.decision[0] is expected[0]
+        assert result.decision == await RiskManagementFramework("CEO_Visionary").get_board_consensus(result.assessments)
+
+    @pytest.mark.asyncio
+    async def test_deadline_fail_closed_cancels_the_rest(self):
+        members = board(delay=0.01, CEO_Visionary={"delay": 5.0}, CRO_Guardian={"delay": 5.0})
+        result = await assess_members(
+            members, LOW_TASK,
+            deadlines={"CRO_Guardian": 0.05}, default_deadline=1.0, policy=FAIL_CLOSED, metrics=None
+        )
+
+        assert result.decision == (False, "Failed closed: CRO_Guardian missed its assessment deadline")
+        assert result.cancelled == ["CEO_Visionary"]
+        assert members[BOARD.index("CEO_Visionary")].cancelled
+        statuses = {t.member: t.status for t in result.timings}
+        assert statuses["CEO_Visionary"] == "cancelled"
+        assert statuses["CRO_Guardian"] == "timeout"
+        assert sum(status == "ok" for status in statuses.values()) == 9
+        assert result.elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_deadline_abstain_skips_member(self):
+        members = board(CRO_Guardian={"delay": 5.0})
+        result = await assess_members(
+            members, LOW_TASK, deadlines={"CRO_Guardian": 0.02}, policy=ABSTAIN, metrics=None
+        )
+        assert "CRO_Guardian" not in [a.assessed_by for a in result.assessments]
+        assert result.decision == (True, "Board approval granted (10/10 votes)")
+
+    @pytest.mark.asyncio
+    async def test_errors_follow_policy(self):
+        members = board(CRO_Guardian={"fails": True})
+        result = await assess_members(members, LOW_TASK, deadlines={}, policy=FAIL_CLOSED, metrics=None)
+        assert result.decision == (False, "Failed closed: CRO_Guardian risk assessment failed")
+        assert {t.member: t.status for t in result.timings}["CRO_Guardian"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_member_without_framework_abstains(self):
+        members = board(CRO_Guardian={"framework": False})
+        result = await assess_members(members, LOW_TASK, deadlines={}, policy=FAIL_CLOSED, metrics=None)
+        assert {t.member: t.status for t in result.timings}["CRO_Guardian"] == "abstained"
+        assert result.decision[0] is True
+
+    @pytest.mark.asyncio
+    async def test_metrics_recorded(self):
+        metrics = LatencyRegistry()
+        members = board(CRO_Guardian={"delay": 1.0})
+        await assess_members(
+            members, LOW_TASK, deadlines={"CRO_Guardian": 0.01}, policy=ABSTAIN, metrics=metrics
+        )
+        snapshot = metrics.snapshot()
+        assert snapshot["CSO_Sentinel"]["outcomes"] == {"ok": 1}
+        assert snapshot["CRO_Guardian"]["outcomes"] == {"timeout": 1}
+        assert snapshot["CRO_Guardian"]["p50_ms"] >= 10.0
+
+    @pytest.mark.asyncio
+    async def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            await assess_members([], LOW_TASK, policy="retry")
+
+    def test_parse_deadlines(self):
+        assert parse_deadlines("CSO_Sentinel=1.5, CEO_Visionary=3") == {"CSO_Sentinel": 1.5, "CEO_Visionary": 3.0}
+        assert parse_deadlines(None) == {}
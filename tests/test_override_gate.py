@@ -0,0 +1,186 @@
+import asyncio
+import contextlib
+import json
+import time
+
+import pytest
+from agno_service.workspace.override_gate import OverrideGate, OverrideHalted
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.messages = asyncio.Queue()
+        self.broken = False
+
+    async def subscribe(self, channel):
+        if self.redis.down:
+            raise ConnectionError("Connection refused")
+        self.redis.subscribers.append(self)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        try:
+            message = await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if self.broken:
+            raise ConnectionError("Connection closed by server")
+        return message
+
+    async def reset(self):
+        if self in self.redis.subscribers:
+            self.redis.subscribers.remove(self)
+
+
+class FakeRedis:
+    """Status key plus one pubsub channel; the connection can be dropped"""
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = []
+        self.down = False
+
+    async def get(self, key):
+        if self.down:
+            raise ConnectionError("Connection refused")
+        return self.data.get(key)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def publish(self, channel, message):
+        for subscriber in self.subscribers:
+            subscriber.messages.put_nowait({"type": "message", "channel": channel, "data": message})
+
+    async def override(self, action, publish=True):
+        """What the control panel does on HALT or RESUME"""
+        self.data["EDWARD_OVERRIDE_STATUS"] = "HALT" if action == "HALT" else "ACTIVE"
+        if publish:
+            await self.publish("edward_override_channel", json.dumps({"action": action}))
+
+    def drop(self):
+        self.down = True
+        for subscriber in self.subscribers:
+            subscriber.broken = True
+            subscriber.messages.put_nowait(None)
+        self.subscribers = []
+
+
+async def until(condition, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.005)
+
+
+async def team_run():
+    await asyncio.sleep(30)
+    return "answer"
+
+
+@contextlib.asynccontextmanager
+async def running_gate(resync_interval=10.0):
+    redis = FakeRedis()
+    gate = OverrideGate(redis, resync_interval=resync_interval, cancel_grace=0.5)
+    runner = asyncio.create_task(gate.run())
+    await until(lambda: redis.subscribers)
+    try:
+        yield redis, gate
+    finally:
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+
+
+class TestOverrideGate:
+    @pytest.mark.asyncio
+    async def test_halt_stops_all_in_flight_runs(self):
+        async with running_gate() as (redis, gate):
+            runs = [asyncio.create_task(gate.guard(team_run())) for _ in range(20)]
+            await until(lambda: gate.stats()["in_flight"] == 20)
+
+            start = time.perf_counter()
+            await redis.override("HALT")
+            await asyncio.wait(runs, timeout=1)
+            halt_to_stopped = time.perf_counter() - start
+
+            assert all(run.done() for run in runs)
+            assert all(isinstance(run.exception(), OverrideHalted) for run in runs)
+            assert halt_to_stopped < 0.1
+            stats = gate.stats()
+            assert stats["halted"] and stats["version"] == 1
+            assert (stats["cancelled"], stats["overdue"], stats["in_flight"]) == (20, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_halted_gate_refuses_new_runs(self):
+        async with running_gate() as (redis, gate):
+            await redis.override("HALT")
+            await until(lambda: gate.halted)
+            with pytest.raises(OverrideHalted):
+                await gate.guard(team_run())
+
+            await redis.override("RESUME")
+            await until(lambda: not gate.halted)
+            assert gate.version == 2
+            assert await gate.guard(asyncio.sleep(0, result="answer")) == "answer"
+
+    @pytest.mark.asyncio
+    async def test_resync_after_reconnect(self):
+        async with running_gate() as (redis, gate):
+            redis.drop()
+            await until(lambda: gate.reconnects >= 1)
+            # HALT published while the service was disconnected
+            await redis.override("HALT")
+            assert not gate.halted
+
+            redis.down = False
+            await until(lambda: gate.halted, timeout=2)
+            assert redis.subscribers
+
+    @pytest.mark.asyncio
+    async def test_periodic_resync_catches_missed_message(self):
+        async with running_gate(resync_interval=0.02) as (redis, gate):
+            await redis.override("HALT", publish=False)
+            await until(lambda: gate.halted, timeout=0.5)
+
+    @pytest.mark.asyncio
+    async def test_stop_is_bounded_for_runs_ignoring_cancellation(self):
+        gate = OverrideGate(cancel_grace=0.05)
+        stubborn_done = asyncio.Event()
+
+        async def stubborn():
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                await asyncio.sleep(0.3)
+                stubborn_done.set()
+
+        run = asyncio.create_task(gate.guard(stubborn()))
+        await until(lambda: gate.stats()["in_flight"] == 1)
+        start = time.perf_counter()
+        await gate.set_state("HALT")
+        assert time.perf_counter() - start < 0.2
+        assert gate.overdue == 1
+        await stubborn_done.wait()
+        await asyncio.gather(run, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_listeners_and_caller_cancellation(self):
+        gate = OverrideGate()
+        changes = []
+
+        async def listener(halted):
+            changes.append(halted)
+
+        gate.on_change(listener)
+        run = asyncio.create_task(gate.guard(team_run()))
+        await until(lambda: gate.stats()["in_flight"] == 1)
+        # A caller going away is not a HALT
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        assert gate.stats()["in_flight"] == 0
+
+        await gate.set_state("HALT")
+        await gate.set_state("HALT")
+        await gate.set_state("RESUME")
+        assert changes == [True, False]
@@ -0,0 +1,213 @@
+from typing import Any, List
+
+import asyncio
+import threading
+
+import pytest
+
+from agno_service.workspace.doctrine_prompt import DOCTRINE_PROMPT
+from agno_service.workspace.prompt_budget import (
+    MESSAGE_OVERHEAD_TOKENS, PROMPT_RUN, PromptAssembler, TokenCounter, parse_budgets, prompt_run
+)
+
+# Estimated tokenizer: 4 characters per token
+MODEL = "claude-3-5-sonnet-20241022"
+
+
+def turn(n, words=100):
+    """A user message and the assistant's reply, about `words` tokens each"""
+    return [
+        {"role": "user", "content": f"question {n} " + "word " * (words - 3)},
+        {"role": "assistant", "content": f"answer {n} " + "word " * (words - 3)},
+    ]
+
+
+def history(turns, words=100):
+    return [message for n in range(turns) for message in turn(n, words)]
+
+
+class CountingCounter(TokenCounter):
+    def __init__(self):
+        super().__init__()
+        self.tokenized = 0
+
+    def count(self, text, tokenizer):
+        if text and self.cache.get((tokenizer, text)) is None:
+            self.tokenized += 1
+        return super().count(text, tokenizer)
+
+
+class TestPromptAssembler:
+    def test_everything_fits(self):
+        assembler = PromptAssembler(default_budget=100000)
+        messages = history(10)
+        kept, report = assembler.fit(MODEL, messages, prefix=DOCTRINE_PROMPT.text, tail="next question")
+        assert kept == messages
+        assert report.tokens_saved == 0
+        assert report.dropped_messages == 0
+
+    def test_oldest_turns_dropped_first(self):
+        assembler = PromptAssembler(default_budget=1200)
+        messages = history(10)
+        kept, report = assembler.fit(MODEL, messages, prefix="system prompt " * 40, tail="next question")
+        assert kept == messages[-len(kept):]
+        assert kept[0]["role"] == "user"
+        assert report.prompt_tokens <= 1200
+        assert report.dropped_messages == len(messages) - len(kept)
+        assert report.tokens_saved == report.history_tokens - report.kept_tokens > 0
+        assert assembler.stats()["tokens_saved"] == report.tokens_saved
+
+    def test_never_starts_on_a_reply_or_tool_result(self):
+        assembler = PromptAssembler(default_budget=700)
+        messages = [
+            {"role": "user", "content": "check " * 100},
+            {"role": "assistant", "content": None, "tool_calls": [{"id": "1", "function": {"name": "scan"}}]},
+            {"role": "tool", "content": "result " * 100},
+            {"role": "assistant", "content": "done " * 100},
+            {"role": "user", "content": "again " * 100},
+            {"role": "assistant", "content": "fine " * 100},
+        ]
+        kept, _ = assembler.fit(MODEL, messages)
+        assert kept == messages[4:]
+
+    def test_system_prompt_kept_when_over_budget(self):
+        assembler = PromptAssembler(default_budget=100)
+        kept, report = assembler.fit(MODEL, history(3), prefix=DOCTRINE_PROMPT.text)
+        assert kept == []
+        assert report.over_budget
+        assert report.fixed_tokens >= DOCTRINE_PROMPT.token_counts(MODEL)["shared"]
+        assert assembler.stats()["over_budget"] == 1
+
+    def test_tools_and_messages_count_against_budget(self):
+        assembler = PromptAssembler(default_budget=100000)
+        tools = [{"type": "function", "function": {"name": "scan_for_threats", "parameters": {}}}]
+        _, bare = assembler.fit(MODEL, [], tail="hello")
+        _, with_tools = assembler.fit(MODEL, [], tools=tools, tail=[{"role": "user", "content": "hello"}])
+        assert with_tools.fixed_tokens > bare.fixed_tokens
+
+    def test_per_model_budgets(self):
+        assembler = PromptAssembler(default_budget=16000, budgets=parse_budgets("gpt-4o-mini=8000, gpt-4o=32000"))
+        assert assembler.budget_for("gpt-4o-mini") == 8000
+        assert assembler.budget_for("gpt-4o") == 32000
+        assert assembler.budget_for(MODEL) == 16000
+
+
+class TestTokenCounter:
+    def test_history_tokenized_once(self):
+        counter = CountingCounter()
+        assembler = PromptAssembler(default_budget=100000, counter=counter)
+        messages = history(10)
+        assembler.fit(MODEL, messages, prefix=DOCTRINE_PROMPT.text)
+        first = counter.tokenized
+        # The next turn replays the same history plus one new exchange
+        assembler.fit(MODEL, messages + turn(10), prefix=DOCTRINE_PROMPT.text)
+        assert counter.tokenized - first == 2
+
+    def test_message_overhead(self):
+        counter = TokenCounter()
+        assert counter.message({"role": "user", "content": "x" * 40}, "estimate") == 10 + MESSAGE_OVERHEAD_TOKENS
+        assert counter.message({"role": "assistant", "content": None}, "estimate") == MESSAGE_OVERHEAD_TOKENS
+
+
+class TestPromptRun:
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_keep_their_own_state(self):
+        assembler = PromptAssembler(default_budget=100000)
+
+        async def member(n):
+            with prompt_run(f"question {n}") as run:
+                run.prefix = f"system prompt {n}"
+                await asyncio.sleep(0.01 * (3 - n))
+                current = PROMPT_RUN.get()
+                _, report = assembler.fit(MODEL, history(n + 1), prefix=current.prefix, tail=current.tail)
+                current.record(report)
+                return run, current
+
+        results = await asyncio.gather(*(member(n) for n in range(3)))
+        for n, (run, current) in enumerate(results):
+            assert current is run
+            assert (run.prefix, run.tail) == (f"system prompt {n}", f"question {n}")
+            assert run.report.history_tokens == sum(
+                assembler.counter.message(message, "estimate") for message in history(n + 1)
+            )
+        assert PROMPT_RUN.get() is None
+
+    def test_enclosing_run_collects_reports(self):
+        assembler = PromptAssembler(default_budget=100000)
+        with prompt_run() as board:
+            for n in range(2):
+                with prompt_run("next question") as member:
+                    _, report = assembler.fit(MODEL, history(n + 1), tail=member.tail)
+                    member.record(report)
+                assert member.reports == [report]
+                assert PROMPT_RUN.get() is board
+        assert len(board.reports) == 2
+        assert board.reports[0].history_tokens < board.reports[1].history_tokens
+
+
+def stub_assistant(agent_factory, model, turns):
+    """A board member on an LLM that records each prompt and answers "ok", with `turns` exchanges of history"""
+    from phi.llm.base import LLM
+    from phi.llm.message import Message
+
+    class StubLLM(LLM):
+        sent: List[Any] = []
+
+        def response(self, messages):
+            self.sent.append(list(messages))
+            return "ok"
+
+    assistant = agent_factory.DoctrineCompliantAssistant(
+        name="CRO_Guardian",
+        llm=StubLLM(model=model),
+        instructions=["Assess risk"],
+        add_chat_history_to_messages=True,
+        num_history_messages=100,
+    )
+    for message in history(turns):
+        assistant.memory.add_llm_message(Message(**message))
+    return assistant
+
+
+class TestBudgetedAssistant:
+    def test_member_turn_trims_history(self, monkeypatch):
+        agent_factory = pytest.importorskip("agno_service.workspace.agent_factory", exc_type=ImportError)
+        model = "stub-board-model"
+        monkeypatch.setitem(agent_factory.PROMPT_ASSEMBLER.budgets, model, 1500)
+        assistant = stub_assistant(agent_factory, model, 20)
+
+        with prompt_run() as run:
+            assert assistant.run("next question", stream=False) == "ok"
+
+        sent = assistant.llm.sent[-1]
+        assert sent[0].role == "system"
+        assert sent[-1].role == "user" and sent[-1].content == "next question"
+        replayed = sent[1:-1]
+        assert 0 < len(replayed) < 40
+        assert replayed[0].role == "user"
+        assert len(run.reports) == 1
+        assert run.report.dropped_messages == 40 - len(replayed)
+        assert run.report.prompt_tokens <= 1500
+        assert PROMPT_RUN.get() is None
+
+    def test_concurrent_turns_on_a_shared_member(self, monkeypatch):
+        agent_factory = pytest.importorskip("agno_service.workspace.agent_factory", exc_type=ImportError)
+        model = "stub-board-model"
+        monkeypatch.setitem(agent_factory.PROMPT_ASSEMBLER.budgets, model, 1500)
+        assistant = stub_assistant(agent_factory, model, 20)
+        questions = {"short": "next question", "long": "next question " + "detail " * 400}
+        reports = {}
+
+        def turn(key):
+            with prompt_run() as run:
+                assistant.run(questions[key], stream=False)
+            reports[key] = run.report
+
+        threads = [threading.Thread(target=turn, args=(key,)) for key in questions]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Each turn was fitted around its own message
+        assert reports["long"].fixed_tokens - reports["short"].fixed_tokens >= 400
+        assert reports["long"].dropped_messages > reports["short"].dropped_messages
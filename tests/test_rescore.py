@@ -0,0 +1,121 @@
+import io
+import json
+
+import pytest
+from agno_service.workspace.rescore import chunked, iter_redis_decisions, rescore_chunk, run_rescore
+from agno_service.workspace.risk_management import RiskManagementFramework
+
+KEY_MEMBERS = ["CEO_Visionary", "CQO_Oracle", "CSO_Sentinel", "CRO_Guardian"]
+
+
+def stored_decision(decision_id, task, level, approved, reason="stored"):
+    return {
+        "id": decision_id,
+        "task": task,
+        "assessments": [
+            {"assessed_by": member, "risk_level": level, "risk_score": 0.0, "cons": []}
+            for member in KEY_MEMBERS
+        ],
+        "approved": approved,
+        "reason": reason,
+    }
+
+
+class PushedList:
+    """A Redis list that gains a new head entry every time a page is read"""
+
+    def __init__(self, values):
+        self.values = list(values)
+        self.pushed = 0
+
+    def llen(self, key):
+        return len(self.values)
+
+    def lrange(self, key, start, end):
+        length = len(self.values)
+        start, end = (start + length if start < 0 else start), (end + length if end < 0 else end)
+        page = self.values[max(start, 0):end + 1]
+        # A writer LPUSHes between pages
+        self.pushed += 1
+        self.values.insert(0, json.dumps({"n": -self.pushed}))
+        return page
+
+
+class TestRescore:
+    def test_chunked(self):
+        assert [len(chunk) for chunk in chunked(({"i": i} for i in range(7)), 3)] == [3, 3, 1]
+
+    def test_unchanged_decision_not_reported(self):
+        result = rescore_chunk([stored_decision("a", {"action": "read_file", "context": {}}, 1, False)])
+        # 4 LOW approvals cannot reach 7/11, so the stored rejection stands
+        assert result["processed"] == 1
+        assert result["changes"] == []
+
+    def test_level_change_and_consensus_flip(self):
+        task = {"action": "sudo delete admin token", "context": {}}
+        result = rescore_chunk([stored_decision("b", task, "LOW", True)])
+        change = result["changes"][0]
+        assert change["id"] == "b"
+        assert {c["member"] for c in change["level_changes"]} == set(KEY_MEMBERS)
+        assert change["level_changes"][0]["old_level"] == "LOW"
+        assert change["old_approved"] is True and change["new_approved"] is False
+        assert change["new_reason"].startswith("VETO by CQO_Oracle")
+        assert result["level_changes"] == 1 and result["consensus_flips"] == 1
+
+    @pytest.mark.asyncio
+    async def test_new_consensus_matches_framework(self):
+        task = {"action": "sudo delete admin token", "context": {}}
+        change = rescore_chunk([stored_decision("c", task, 1, True)])["changes"][0]
+        assessments = [await RiskManagementFramework(member).assess_risk(task) for member in KEY_MEMBERS]
+        expected = await RiskManagementFramework("CEO_Visionary").get_board_consensus(assessments)
+        assert (change["new_approved"], change["new_reason"]) == expected
+
+    def test_malformed_records_counted(self):
+        records = [
+            {"id": "x", "task": "not a task"},
+            {"id": "y", "task": {"action": 5}, "assessments": []},
+            stored_decision("z", {"action": "read_file"}, 1, False),
+        ]
+        result = rescore_chunk(records)
+        assert result["errors"] == 2
+        assert result["processed"] == 1
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_run_rescore_writes_ndjson(self, workers):
+        records = [
+            stored_decision(f"r{i}", {"action": "transfer_funds" if i % 2 else "read_file", "context": {"amount": 50000}}, 1, False)
+            for i in range(10)
+        ]
+        output = io.StringIO()
+        summary = run_rescore(iter(records), output, chunk_size=3, workers=workers)
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert summary["processed"] == 10
+        # Only the transfers leave LOW; nothing reaches 7/11 approvals either way
+        assert summary["level_changes"] == len(lines) == 5
+        assert summary["consensus_flips"] == 0
+        assert sorted(line["id"] for line in lines) == sorted(f"r{i}" for i in range(1, 10, 2))
+
+    def test_candidate_rule_file(self, tmp_path):
+        from agno_service.workspace.risk_rules import DEFAULT_RULE_SET
+
+        rules = DEFAULT_RULE_SET.to_dict()
+        rules["version"] = "candidate"
+        for group in rules["keyword_groups"]:
+            if group["name"] == "reputational":
+                group["weight"] = 9.0
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps(rules))
+
+        task = {"action": "publish report", "context": {}}
+        assert rescore_chunk([stored_decision("p", task, "MEDIUM", False)])["changes"] == []
+        change = rescore_chunk([stored_decision("p", task, "MEDIUM", False)], str(path))["changes"][0]
+        assert change["rule_version"] == "candidate"
+        assert change["level_changes"][0]["new_level"] == "CRITICAL"
+
+    def test_redis_list_paging_survives_concurrent_pushes(self):
+        # LPUSH order: newest first
+        client = PushedList(json.dumps({"n": n}) for n in reversed(range(25)))
+        records = list(iter_redis_decisions("redis://unused", page_size=4, client=client))
+        assert [record["n"] for record in records] == list(range(25))
+        assert [record["id"] for record in records] == [f"redis:board_decisions:{n}" for n in range(25)]
+        assert client.pushed == 7
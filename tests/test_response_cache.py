@@ -0,0 +1,116 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+from agno_service.workspace.response_cache import BYPASS, HIT, MISS, ResponseCache, normalize_query, response_key
+
+TEAM = [("CEO_Visionary", "gpt-4o"), ("CTO_Architect", "claude-3-5-sonnet-20241022")]
+
+
+class DictRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+class StubLLM:
+    """Answers after a fixed delay and counts calls"""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = 0
+
+    async def run(self, query):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"content": f"report for {query}"}
+
+
+async def ask(cache, redis, llm, query, team=TEAM, doctrine="v1", use_cache=True):
+    return await cache.run(redis, response_key(query, team, doctrine), lambda: llm.run(query), use_cache=use_cache)
+
+
+class TestResponseKey:
+    def test_whitespace_normalized(self):
+        assert normalize_query("  Daily   portfolio\nreport ") == "Daily portfolio report"
+        assert response_key("Daily report", TEAM, "v1") == response_key(" Daily  report", TEAM, "v1")
+        assert response_key("Daily report", TEAM, "v1") != response_key("daily report", TEAM, "v1")
+
+    def test_team_models_and_doctrine_in_key(self):
+        key = response_key("q", TEAM, "v1")
+        assert key == response_key("q", list(reversed(TEAM)), "v1")
+        assert key != response_key("q", TEAM[:1], "v1")
+        assert key != response_key("q", [("CEO_Visionary", "gpt-4o-mini"), TEAM[1]], "v1")
+        assert key != response_key("q", TEAM, "v2")
+
+
+class TestResponseCache:
+    @pytest.mark.asyncio
+    async def test_repeat_query_served_from_cache(self):
+        cache, redis, llm = ResponseCache(ttl=60, maxsize=8), DictRedis(), StubLLM()
+        first = await ask(cache, redis, llm, "daily report")
+        second = await ask(cache, redis, llm, "daily  report")
+        assert first == ({"content": "report for daily report"}, MISS)
+        assert second == (first[0], HIT)
+        assert llm.calls == 1
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+        assert stats["saved_seconds"] >= llm.delay
+
+    @pytest.mark.asyncio
+    async def test_shared_through_redis(self):
+        redis, llm = DictRedis(), StubLLM()
+        await ask(ResponseCache(ttl=60, maxsize=8), redis, llm, "daily report")
+        other = ResponseCache(ttl=60, maxsize=8)
+        assert (await ask(other, redis, llm, "daily report"))[1] == HIT
+        assert other.redis_hits == 1
+        assert llm.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_opt_out_and_doctrine_change(self):
+        cache, redis, llm = ResponseCache(ttl=60, maxsize=8), DictRedis(), StubLLM()
+        await ask(cache, redis, llm, "daily report")
+        assert (await ask(cache, redis, llm, "daily report", use_cache=False))[1] == BYPASS
+        assert (await ask(cache, redis, llm, "daily report", doctrine="v2"))[1] == MISS
+        assert llm.calls == 3
+        assert cache.stats()["bypassed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_runs_not_cached(self):
+        cache, redis = ResponseCache(ttl=60, maxsize=8), DictRedis()
+
+        async def fail():
+            raise RuntimeError("rate limited")
+
+        with pytest.raises(RuntimeError):
+            await cache.run(redis, "k", fail)
+        assert redis.data == {}
+        assert len(cache.local) == 0
+
+
+@pytest.mark.skipif(not os.getenv("REDIS_URL"), reason="needs a local Redis (REDIS_URL)")
+class TestResponseCacheWithRedis:
+    @pytest.mark.asyncio
+    async def test_round_trip_and_ttl(self):
+        import redis.asyncio as aioredis
+
+        redis = aioredis.from_url(os.environ["REDIS_URL"], decode_responses=True)
+        cache = ResponseCache(ttl=60, maxsize=8, prefix=f"test:llm_response_cache:{uuid.uuid4().hex}:")
+        llm = StubLLM()
+        try:
+            await ask(cache, redis, llm, "daily report")
+            keys = [key async for key in redis.scan_iter(match=cache.prefix + "*")]
+            assert len(keys) == 1
+            assert 0 < await redis.ttl(keys[0]) <= 60
+            fresh = ResponseCache(ttl=60, maxsize=8, prefix=cache.prefix)
+            assert (await ask(fresh, redis, llm, "daily report"))[1] == HIT
+            await redis.delete(*keys)
+        finally:
+            await redis.aclose()
@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+import pytest
+from agno_service.workspace.risk_management import RiskManagementFramework, RiskLevel
+from agno_service.workspace.risk_rules import DEFAULT_KEYWORD_GROUPS
+
+
+def random_tasks(n, seed=11):
+    rng = random.Random(seed)
+    vocabulary = [kw for group in DEFAULT_KEYWORD_GROUPS for kw in group.keywords]
+    vocabulary += ["read", "file", "report", "_", " ", "Edward", "TRANSFER", "x"]
+    tasks = []
+    for _ in range(n):
+        action = "".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 5)))
+        context = {"amount": rng.choice([0, 50, 100, 101, 1000, 5000, 10000, 50000])} if rng.random() < 0.7 else {}
+        tasks.append({"action": action, "context": context})
+    return tasks
+
+
+class TestRiskBatch:
+    @pytest.fixture
+    def risk_framework(self):
+        return RiskManagementFramework("TEST_AGENT")
+
+    @pytest.mark.asyncio
+    async def test_identical_to_scalar_path(self, risk_framework):
+        tasks = random_tasks(3000)
+        batch = risk_framework.assess_risk_batch(tasks)
+        assert len(batch) == len(tasks)
+
+        for index, task in enumerate(tasks):
+            expected = await risk_framework.assess_risk(task)
+            assert batch.risk_levels[index] == expected.risk_level.value
+            assert batch.risk_scores[index] == expected.risk_score
+            assert batch.requires_human_approval[index] == expected.requires_human_approval
+            assert batch.assessment(index).model_dump(exclude={"assessment_timestamp"}) == \
+                expected.to_model().model_dump(exclude={"assessment_timestamp"})
+
+    def test_level_thresholds_are_inclusive(self, risk_framework):
+        batch = risk_framework.assess_risk_batch([
+            {"action": "transfer", "context": {"amount": 50000}},       # 5.0
+            {"action": "transfer", "context": {"amount": 50001}},       # 5.0
+            {"action": "delete", "context": {}},                        # 2.0
+            {"action": "sudo delete", "context": {}},                   # 5.0
+            {"action": "sudo admin delete", "context": {}},             # 8.0
+        ])
+        assert list(batch.risk_levels) == [
+            RiskLevel.MEDIUM.value, RiskLevel.MEDIUM.value, RiskLevel.LOW.value,
+            RiskLevel.MEDIUM.value, RiskLevel.HIGH.value,
+        ]
+
+    def test_empty_batch(self, risk_framework):
+        batch = risk_framework.assess_risk_batch([])
+        assert len(batch) == 0
+        assert batch.to_assessments() == []
+
+    def test_batch_does_not_touch_history(self, risk_framework):
+        risk_framework.assess_risk_batch(random_tasks(10))
+        assert len(risk_framework.risk_history) == 0
+
+    def test_columns_are_arrays(self, risk_framework):
+        batch = risk_framework.assess_risk_batch(random_tasks(50))
+        assert batch.risk_levels.dtype == np.uint8
+        assert batch.category_scores.shape == (50, 5)
@@ -0,0 +1,81 @@
+import io
+import json
+
+import pytest
+from agno_service.workspace.risk_event_log import RiskEventLogger, parse_sample_rates
+from agno_service.workspace.risk_management import RiskManagementFramework
+
+
+async def assess(action):
+    return await RiskManagementFramework("TEST_AGENT").assess_risk({"action": action, "context": {}})
+
+
+class TestRiskEventLogger:
+    @pytest.mark.asyncio
+    async def test_batches_ndjson(self):
+        stream = io.StringIO()
+        event_log = RiskEventLogger(stream=stream, batch_size=4, flush_interval=0.01)
+        records = [await assess("sudo delete admin token") for _ in range(10)]
+        for record in records:
+            assert event_log.submit(record)
+        event_log.stop()
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 10
+        event = json.loads(lines[0])
+        assert event["event"] == "risk_assessment"
+        assert event["assessed_by"] == "TEST_AGENT"
+        assert event["risk_level"] == records[0].risk_level.value
+        assert event_log.written == 10
+        assert event_log.batches >= 3
+
+    @pytest.mark.asyncio
+    async def test_record_changed_after_submit(self):
+        stream = io.StringIO()
+        event_log = RiskEventLogger(stream=stream, flush_interval=0.01)
+        record = await assess("sudo delete admin token")
+        cons = list(record.cons)
+        assert event_log.submit(record)
+        record.cons.append("Added by the caller")
+        record.mitigation_strategies.clear()
+        event_log.stop()
+        event = json.loads(stream.getvalue())
+        assert event["cons"] == cons
+        assert event["mitigation_strategies"]
+
+    @pytest.mark.asyncio
+    async def test_sampling_keeps_high_risk(self):
+        stream = io.StringIO()
+        event_log = RiskEventLogger(stream=stream, sample_rates=parse_sample_rates("LOW=0"), rng=lambda: 0.5)
+        assert not event_log.submit(await assess("read_file"))
+        assert event_log.submit(await assess("share_family_photos"))
+        event_log.stop()
+        assert event_log.sampled_out == 1
+        assert len(stream.getvalue().splitlines()) == 1
+
+    @pytest.mark.asyncio
+    async def test_overflow_is_dropped_not_blocking(self):
+        event_log = RiskEventLogger(stream=io.StringIO(), queue_size=2)
+        event_log._thread = object()  # keep the writer from draining the queue
+        record = await assess("share_family_photos")
+        results = [event_log.submit(record) for _ in range(5)]
+        assert results == [True, True, False, False, False]
+        assert event_log.dropped == 3
+
+    def test_parse_sample_rates(self):
+        rates = parse_sample_rates("low=0.05, MEDIUM=2")
+        assert rates["LOW"] == 0.05
+        assert rates["MEDIUM"] == 1.0
+        assert rates["HIGH"] == 1.0
+        with pytest.raises(ValueError):
+            parse_sample_rates("SEVERE=1")
+
+    @pytest.mark.parametrize("spec", ["HIGH=0.5", "critical=0", "EXTREME=0.99"])
+    def test_high_risk_levels_cannot_be_sampled(self, spec):
+        with pytest.raises(ValueError):
+            parse_sample_rates(spec)
+
+    def test_high_risk_levels_always_logged(self):
+        event_log = RiskEventLogger(stream=io.StringIO(), sample_rates={"LOW": 0.0, "HIGH": 0.0, "EXTREME": 0.1})
+        assert event_log.sample_rates["LOW"] == 0.0
+        assert all(event_log.sample_rates[level] == 1.0 for level in ("HIGH", "CRITICAL", "EXTREME"))
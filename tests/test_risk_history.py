@@ -0,0 +1,82 @@
+import random
+
+import numpy as np
+import pytest
+from agno_service.workspace.risk_history import BYTES_PER_ENTRY, RiskHistory
+from agno_service.workspace.risk_management import RiskManagementFramework, RiskCategory
+
+ACTIONS = [
+    "read_file",
+    "transfer_funds",
+    "share_family_photos",
+    "sudo restart api gateway",
+    "bulk delete of stale admin tokens",
+    "publish quarterly report",
+]
+
+
+class TestRiskHistory:
+    @pytest.fixture
+    def risk_framework(self):
+        return RiskManagementFramework("TEST_AGENT", history_capacity=8)
+
+    @pytest.mark.asyncio
+    async def test_capacity_is_bounded(self, risk_framework):
+        for i in range(20):
+            await risk_framework.assess_risk({"action": ACTIONS[i % len(ACTIONS)], "context": {}})
+        assert len(risk_framework.risk_history) == 8
+        assert risk_framework.risk_history.total_recorded == 20
+
+    @pytest.mark.asyncio
+    async def test_recent_rebuilds_exact_assessments(self, risk_framework):
+        originals = []
+        for i in range(12):
+            originals.append(await risk_framework.assess_risk({
+                "action": ACTIONS[i % len(ACTIONS)],
+                "context": {"amount": 5000 * i}
+            }))
+
+        rebuilt = risk_framework.risk_history.recent(5)
+        assert [a.model_dump() for a in rebuilt] == [a.to_model().model_dump() for a in originals[-5:]]
+        assert len(risk_framework.risk_history.recent()) == 8
+
+    @pytest.mark.asyncio
+    async def test_running_counters(self, risk_framework):
+        await risk_framework.assess_risk({"action": "read_file", "context": {}})
+        await risk_framework.assess_risk({"action": "share_family_photos", "context": {}})
+        stats = risk_framework.risk_history.stats()
+        assert stats["level_counts"]["LOW"] == 1
+        assert stats["level_counts"]["CRITICAL"] == 1
+        assert stats["category_counts"][RiskCategory.PRIVACY.value] == 1
+        assert stats["category_counts"][RiskCategory.REPUTATIONAL.value] == 1
+
+    @pytest.mark.asyncio
+    async def test_window_percentiles_match_numpy(self):
+        framework = RiskManagementFramework("TEST_AGENT", history_capacity=50)
+        rng = random.Random(3)
+        scores = []
+        for _ in range(130):
+            assessment = await framework.assess_risk({
+                "action": " ".join(rng.sample(ACTIONS, 2)),
+                "context": {"amount": rng.choice([0, 500, 5000])}
+            })
+            scores.append(assessment.risk_score)
+
+        window = np.array(scores[-50:])
+        for q in (10, 50, 90, 99, 100):
+            expected = np.percentile(window, q, method="inverted_cdf")
+            assert framework.risk_history.percentile(q) == pytest.approx(expected)
+
+    def test_empty_history(self, risk_framework):
+        assert risk_framework.risk_history.percentile(50) is None
+        assert risk_framework.risk_history.recent(3) == []
+
+    def test_memory_per_entry(self):
+        assert BYTES_PER_ENTRY == 72
+        history = RiskHistory(RiskManagementFramework("TEST_AGENT"), capacity=1000)
+        assert history.nbytes == 1000 * BYTES_PER_ENTRY
+
+    @pytest.mark.parametrize("capacity", [0, -1])
+    def test_invalid_capacity(self, capacity):
+        with pytest.raises(ValueError):
+            RiskHistory(RiskManagementFramework("TEST_AGENT"), capacity=capacity)
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+from agno_service.workspace.risk_rules import (
+    DEFAULT_KEYWORD_GROUPS,
+    KeywordGroup,
+    KeywordMatcher,
+)
+from agno_service.workspace.risk_management import RiskManagementFramework, RiskLevel
+
+
+def naive_contributions(groups, action_lower):
+    """Reference semantics: one ``in`` test per keyword"""
+    contributions = {}
+    for group in groups:
+        count = sum(1 for keyword in group.keywords if keyword in action_lower)
+        if count:
+            contributions[group.name] = group.weight * count if group.per_keyword else group.weight
+    return contributions
+
+
+class TestKeywordMatcher:
+    @pytest.fixture
+    def matcher(self):
+        return KeywordMatcher(DEFAULT_KEYWORD_GROUPS)
+
+    def test_matches_naive_scan_on_random_actions(self, matcher):
+        rng = random.Random(7)
+        vocabulary = [kw for group in DEFAULT_KEYWORD_GROUPS for kw in group.keywords]
+        vocabulary += ["read", "file", "report", "_", " ", "x", "data", "t", "ad"]
+        for _ in range(2000):
+            action = "".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 6)))
+            assert dict(matcher.match(action)) == naive_contributions(DEFAULT_KEYWORD_GROUPS, action)
+
+    def test_overlapping_keywords(self, matcher):
+        # "root" and "token" share the "t"
+        assert matcher.find_keywords("rootoken") == {"root", "token"}
+
+    def test_keyword_inside_longer_keyword(self, matcher):
+        assert matcher.find_keywords("investment") == {"invest", "investment"}
+        hits = matcher.match("investment")
+        assert "financial_trigger" in hits
+        assert hits["financial_high_risk"] == 2.0
+
+    def test_per_keyword_weight(self, matcher):
+        hits = matcher.match("sudo admin password reset")
+        assert hits["security_credentials"] == 9.0
+
+    def test_custom_groups(self):
+        matcher = KeywordMatcher([KeywordGroup("test", ("a.b", "c"), 1.0)])
+        assert dict(matcher.match("xa.by")) == {"test": 1.0}
+        assert dict(matcher.match("xaby")) == {}
+
+    def test_no_keywords_match_nothing(self):
+        matcher = KeywordMatcher([])
+        assert matcher.find_keywords("transfer funds") == frozenset()
+        assert dict(matcher.match("transfer funds")) == {}
+
+
+class TestCompiledAssessment:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("action,context,score,level", [
+        ("read_file", {}, 0.0, RiskLevel.LOW),
+        ("transfer_funds", {"amount": 50000}, 5.0, RiskLevel.MEDIUM),
+        ("share_family_photos", {}, 10.0, RiskLevel.CRITICAL),
+        ("wire crypto investment to external account", {"amount": 500}, 8.5, RiskLevel.CRITICAL),
+        ("bulk delete of stale admin tokens", {}, 9.5, RiskLevel.CRITICAL),
+    ])
+    async def test_scores_unchanged(self, action, context, score, level):
+        assessment = await RiskManagementFramework("TEST_AGENT").assess_risk(
+            {"action": action, "context": context}
+        )
+        assert assessment.risk_score == score
+        assert assessment.risk_level == level
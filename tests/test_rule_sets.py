@@ -0,0 +1,224 @@
+import json
+
+import pytest
+from agno_service.workspace.board_evaluation import evaluate_board
+from agno_service.workspace.risk_management import ASSESSMENT_CACHE, RiskLevel, RiskManagementFramework
+from agno_service.workspace.risk_rules import (
+    BUILTIN_RULE_VERSION,
+    DEFAULT_RULE_SET,
+    RuleRegistry,
+    RuleSet,
+)
+from agno_service.workspace.rule_loader import RuleReloader, parse_rule_set
+
+
+def retuned(version, reputational_weight):
+    data = DEFAULT_RULE_SET.to_dict()
+    data["version"] = version
+    for group in data["keyword_groups"]:
+        if group["name"] == "reputational":
+            group["weight"] = reputational_weight
+    return data
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    ASSESSMENT_CACHE.clear()
+    yield
+    ASSESSMENT_CACHE.clear()
+
+
+class TestRuleSet:
+    def test_round_trip_matches_builtin(self):
+        rules = RuleSet.from_dict(DEFAULT_RULE_SET.to_dict())
+        assert rules.version == BUILTIN_RULE_VERSION
+        assert rules.fingerprint == DEFAULT_RULE_SET.fingerprint
+
+    def test_missing_sections_use_builtin_rules(self):
+        rules = RuleSet.from_dict({"version": "v2"})
+        assert rules.matcher.fingerprint == DEFAULT_RULE_SET.matcher.fingerprint
+        assert rules.amount_tiers == DEFAULT_RULE_SET.amount_tiers
+
+    @pytest.mark.parametrize("data", [
+        {"keyword_groups": []},
+        {"version": "v2", "keyword_groups": [{"name": "privacy", "weight": 8.0}]},
+        {"version": "v2", "keyword_groups": [{"name": "privacy", "keywords": [], "weight": 8.0}]},
+        {"version": "v2", "keyword_groups": []},
+        {"version": "v2", "financial_amount_tiers": [[100]]},
+        {"version": "v2", "financial_amount_tiers": [[None, 1.0]]},
+        {"version": "v2", "financial_amount_tiers": [["lots", 1.0]]},
+    ])
+    def test_malformed_rule_sets_rejected(self, data):
+        with pytest.raises(ValueError):
+            RuleSet.from_dict(data)
+
+
+class TestRuleRegistry:
+    @pytest.mark.asyncio
+    async def test_swap_reaches_existing_frameworks(self):
+        registry = RuleRegistry()
+        members = [RiskManagementFramework(name, registry=registry) for name in ("CEO_Visionary", "CSO_Sentinel")]
+        task = {"action": "publish report", "context": {}}
+
+        before = [await member.assess_risk(task) for member in members]
+        registry.activate(RuleSet.from_dict(retuned("v2", 1.0)))
+        after = [await member.assess_risk(task) for member in members]
+
+        assert [(a.risk_score, a.rule_version) for a in before] == [(4.0, BUILTIN_RULE_VERSION)] * 2
+        assert [(a.risk_score, a.rule_version) for a in after] == [(1.0, "v2")] * 2
+        assert after[0].to_model().rule_version == "v2"
+        assert after[0].to_dict()["rule_version"] == "v2"
+
+    @pytest.mark.asyncio
+    async def test_history_keeps_version_per_entry(self):
+        registry = RuleRegistry()
+        framework = RiskManagementFramework("TEST_AGENT", registry=registry)
+        await framework.assess_risk({"action": "publish report", "context": {}})
+        registry.activate(RuleSet.from_dict(retuned("v2", 1.0)))
+        await framework.assess_risk({"action": "publish report", "context": {}})
+
+        assert [a.rule_version for a in framework.risk_history.recent()] == [BUILTIN_RULE_VERSION, "v2"]
+        assert framework.risk_history.stats()["rule_version_counts"] == {BUILTIN_RULE_VERSION: 1, "v2": 1}
+
+    @pytest.mark.asyncio
+    async def test_shadow_records_disagreements(self):
+        registry = RuleRegistry()
+        registry.set_shadow(RuleSet.from_dict(retuned("candidate", 9.0)))
+        framework = RiskManagementFramework("TEST_AGENT", registry=registry)
+
+        task = {"action": "publish report", "context": {}}
+        assessment = await framework.assess_risk(task)
+        # Members' own assessments are not compared; the board compares once per decision
+        assert registry.stats()["shadow"]["compared"] == 0
+        framework.shadow_compare(task, assessment)
+        task = {"action": "read_file", "context": {}}
+        framework.shadow_compare(task, await framework.assess_risk(task))
+
+        # Shadow scoring never changes what callers get
+        assert (assessment.risk_level, assessment.rule_version) == (RiskLevel.MEDIUM, BUILTIN_RULE_VERSION)
+        stats = registry.stats()["shadow"]
+        assert stats["compared"] == 2
+        assert stats["level_disagreements"] == 1
+        assert stats["disagreement_rate"] == 0.5
+        assert stats["vote_flips"] == 1
+        assert stats["transitions"] == {"MEDIUM->CRITICAL": 1}
+
+    @pytest.mark.asyncio
+    async def test_shadow_compared_once_per_board_decision(self):
+        registry = RuleRegistry()
+        registry.set_shadow(RuleSet.from_dict(retuned("candidate", 9.0)))
+        framework = RiskManagementFramework("CEO_Visionary", registry=registry)
+        evaluation = evaluate_board(framework, {"action": "publish report", "context": {}})
+        framework.shadow_compare({"action": "publish report", "context": {}}, evaluation.assessments[0])
+        assert registry.stats()["shadow"]["compared"] == 1
+
+    def test_shadow_compare_without_candidate(self):
+        framework = RiskManagementFramework("TEST_AGENT", registry=RuleRegistry())
+        task = {"action": "publish report", "context": {}}
+        framework.shadow_compare(task, evaluate_board(framework, task).assessments[0])
+        assert framework.registry.stats()["shadow"] is None
+
+    def test_batch_uses_active_version(self):
+        registry = RuleRegistry(RuleSet.from_dict(retuned("v3", 1.0)))
+        batch = RiskManagementFramework("TEST_AGENT", registry=registry).assess_risk_batch(
+            [{"action": "publish report", "context": {}}]
+        )
+        assert batch.rules.version == "v3"
+        assert batch.assessment(0).rule_version == "v3"
+        assert batch.risk_scores[0] == 1.0
+
+
+class TestRuleReloader:
+    @pytest.mark.asyncio
+    async def test_file_reload_swaps_atomically(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps(retuned("v2", 1.0)))
+        registry = RuleRegistry()
+        reloader = RuleReloader(registry, path=str(path))
+
+        assert await reloader.reload() is True
+        assert registry.active.version == "v2"
+        # Unchanged source: nothing recompiled or swapped
+        assert await reloader.reload() is False
+        assert registry.swaps == 1
+
+    @pytest.mark.asyncio
+    async def test_bad_rules_keep_current_set(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text("{not json")
+        registry = RuleRegistry()
+        reloader = RuleReloader(registry, path=str(path))
+
+        assert await reloader.reload() is False
+        assert registry.active is DEFAULT_RULE_SET
+        assert reloader.errors == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("data", [
+        {"version": "v3", "keyword_groups": []},
+        {"version": "v3", "financial_amount_tiers": [[None, 1.0]]},
+    ])
+    async def test_invalid_reload_keeps_previous_rules(self, tmp_path, data):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps(retuned("v2", 1.0)))
+        registry = RuleRegistry()
+        reloader = RuleReloader(registry, path=str(path))
+        await reloader.reload()
+        active = registry.active
+
+        path.write_text(json.dumps(data))
+        assert await reloader.reload() is False
+        assert registry.active is active
+        assert reloader.errors == 1
+        framework = RiskManagementFramework("CEO_Visionary", registry=registry)
+        assessment = await framework.assess_risk({"action": "publish report", "context": {}})
+        assert assessment.rule_version == "v2"
+
+    @pytest.mark.asyncio
+    async def test_reused_version_rejected(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps(retuned("v2", 1.0)))
+        registry = RuleRegistry()
+        reloader = RuleReloader(registry, path=str(path))
+        await reloader.reload()
+
+        path.write_text(json.dumps(retuned("v2", 2.0)) + " ")
+        registry.activate(DEFAULT_RULE_SET)
+        assert await reloader.reload() is False
+        assert registry.active is DEFAULT_RULE_SET
+        assert "reused" in reloader.last_error
+
+    @pytest.mark.asyncio
+    async def test_edit_to_active_version_rejected(self, tmp_path):
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps(retuned("v2", 1.0)))
+        registry = RuleRegistry()
+        reloader = RuleReloader(registry, path=str(path))
+        await reloader.reload()
+        active = registry.active
+
+        path.write_text(json.dumps(retuned("v2", 2.0)) + " ")
+        assert await reloader.reload() is False
+        assert registry.active is active
+        assert reloader.errors == 1
+        assert "reused" in reloader.last_error
+
+    @pytest.mark.asyncio
+    async def test_shadow_source(self, tmp_path):
+        path = tmp_path / "candidate.json"
+        path.write_text(json.dumps(retuned("candidate", 9.0)))
+        registry = RuleRegistry()
+        reloader = RuleReloader(registry, shadow_path=str(path), shadow_sample_rate=0.5)
+
+        await reloader.reload()
+        assert registry.active is DEFAULT_RULE_SET
+        assert registry.shadow.version == "candidate"
+        assert registry.shadow_sample_rate == 0.5
+
+        path.unlink()
+        await reloader.reload()
+        assert registry.shadow is None
+
+    def test_parse_rule_set_rejects_invalid_json(self):
+        with pytest.raises(ValueError):
+            parse_rule_set("[1, 2")
@@ -0,0 +1,171 @@
+import asyncio
+import contextlib
+import time
+
+import pytest
+from agno_service.workspace.session_cache import SessionCache, SessionCachedStorage
+
+
+class Row:
+    def __init__(self, run_id, name, history):
+        self.run_id = run_id
+        self.name = name
+        self.memory = {"chat_history": list(history)}
+
+
+class DictStorage:
+    """Shaped like PgAssistantStorage: upsert reads the row back"""
+
+    def __init__(self, rows=None):
+        self.rows = rows if rows is not None else {}
+        self.reads = 0
+        self.writes = 0
+        self.fail_writes = False
+
+    def read(self, run_id):
+        self.reads += 1
+        row = self.rows.get(run_id)
+        return Row(row.run_id, row.name, row.memory["chat_history"]) if row else None
+
+    def upsert(self, row):
+        if self.fail_writes:
+            raise ConnectionError("database unavailable")
+        self.writes += 1
+        self.rows[row.run_id] = Row(row.run_id, row.name, row.memory["chat_history"])
+        return self.read(run_id=row.run_id)
+
+    def delete(self):
+        self.rows.clear()
+
+
+class CachedDictStorage(SessionCachedStorage, DictStorage):
+    pass
+
+
+def member_run(storage, run_id, name, message):
+    """What Assistant.run does with its storage"""
+    row = storage.read(run_id) or Row(run_id, name, [])
+    row.memory["chat_history"].append(message)
+    return storage.upsert(row)
+
+
+class FakeRedis:
+    """Pubsub shared by several workers"""
+
+    def __init__(self):
+        self.subscribers = []
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def publish(self, channel, message):
+        for subscriber in self.subscribers:
+            subscriber.messages.put_nowait({"type": "message", "channel": channel, "data": message})
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.messages = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.redis.subscribers.append(self)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def reset(self):
+        if self in self.redis.subscribers:
+            self.redis.subscribers.remove(self)
+
+
+async def until(condition, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.005)
+
+
+@contextlib.asynccontextmanager
+async def worker(redis, db):
+    """One service worker: its own session cache over the shared database"""
+    cache = SessionCache(maxsize=16, ttl=60)
+    cache.attach(redis, asyncio.get_running_loop())
+    task = asyncio.create_task(cache.run(redis))
+    try:
+        await until(lambda: cache.invalidations == 1)
+        yield CachedDictStorage(db.rows, session_cache=cache)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+class TestSessionCache:
+    def test_runs_after_the_first_skip_the_database_reads(self):
+        db = DictStorage()
+        storage = CachedDictStorage(db.rows, session_cache=SessionCache(maxsize=16, ttl=60))
+        for turn in range(5):
+            member_run(storage, "run-ceo", "CEO_Visionary", f"turn {turn}")
+        # One read for the first run; upserts read back from the cache
+        assert storage.reads == 1
+        assert storage.writes == 5
+        assert db.rows["run-ceo"].memory["chat_history"] == [f"turn {n}" for n in range(5)]
+        assert storage.session_cache.stats()["db_reads"] == 1
+
+    def test_cached_rows_are_copies(self):
+        storage = CachedDictStorage(session_cache=SessionCache(maxsize=16, ttl=60))
+        member_run(storage, "run-cto", "CTO_Architect", "hello")
+        row = storage.read("run-cto")
+        row.memory["chat_history"].append("not saved")
+        assert storage.read("run-cto").memory["chat_history"] == ["hello"]
+
+    def test_failed_write_drops_the_cached_row(self):
+        storage = CachedDictStorage(session_cache=SessionCache(maxsize=16, ttl=60))
+        member_run(storage, "run-cso", "CSO_Sentinel", "saved")
+        storage.fail_writes = True
+        with pytest.raises(ConnectionError):
+            member_run(storage, "run-cso", "CSO_Sentinel", "lost")
+        storage.fail_writes = False
+        assert storage.read("run-cso").memory["chat_history"] == ["saved"]
+
+    def test_read_racing_a_write_is_not_cached(self):
+        cache = SessionCache(maxsize=16, ttl=60)
+        marker = cache.begin_read()
+        cache.written("run-cro", Row("run-cro", "CRO_Guardian", ["new"]))
+        cache.fill("run-cro", Row("run-cro", "CRO_Guardian", ["old"]), marker)
+        assert cache.get("run-cro").memory["chat_history"] == ["new"]
+
+    def test_bounded(self):
+        storage = CachedDictStorage(session_cache=SessionCache(maxsize=2, ttl=60))
+        for name in ("a", "b", "c"):
+            member_run(storage, f"run-{name}", name, "hi")
+        assert len(storage.session_cache.rows) == 2
+        assert storage.session_cache.get("run-a") is None
+
+
+class TestInvalidation:
+    @pytest.mark.asyncio
+    async def test_write_on_one_worker_invalidates_the_other(self):
+        redis, db = FakeRedis(), DictStorage()
+        async with worker(redis, db) as first, worker(redis, db) as second:
+            member_run(first, "run-ceo", "CEO_Visionary", "from first")
+            await until(lambda: second.session_cache.invalidations == 2)
+            assert second.read("run-ceo").memory["chat_history"] == ["from first"]
+
+            member_run(first, "run-ceo", "CEO_Visionary", "again")
+            await until(lambda: second.session_cache.invalidations == 3)
+            assert second.read("run-ceo").memory["chat_history"] == ["from first", "again"]
+            # Its own announcements do not evict the writer's copy
+            assert first.session_cache.invalidations == 1
+
+    @pytest.mark.asyncio
+    async def test_write_from_worker_thread_is_announced(self):
+        redis, db = FakeRedis(), DictStorage()
+        async with worker(redis, db) as first, worker(redis, db) as second:
+            second.read("run-cdo")
+            await asyncio.to_thread(member_run, first, "run-cdo", "CDO_Alchemist", "threaded")
+            await until(lambda: second.session_cache.invalidations == 2)
+            assert second.read("run-cdo").memory["chat_history"] == ["threaded"]
@@ -0,0 +1,259 @@
+import threading
+import time
+
+from agno_service.workspace.session_cache import SessionCache, SessionCachedStorage
+from agno_service.workspace.storage_writer import WriteBehindBuffer, WriteBehindStorage
+
+
+class Row:
+    def __init__(self, run_id, history):
+        self.run_id = run_id
+        self.memory = {"chat_history": list(history)}
+
+
+class DictStorage:
+    """Shaped like PgAssistantStorage: one transaction per upsert, read back after"""
+
+    def __init__(self):
+        self.rows = {}
+        self.transactions = 0
+        self.fail = False
+        # Run IDs whose rows the database rejects
+        self.reject = set()
+
+    def read(self, run_id):
+        row = self.rows.get(run_id)
+        return Row(run_id, row.memory["chat_history"]) if row else None
+
+    def upsert(self, row):
+        self.write_batch([row])
+        return self.read(row.run_id)
+
+    def write_batch(self, rows):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        if any(row.run_id in self.reject for row in rows):
+            raise ValueError("invalid input syntax for type json")
+        self.transactions += 1
+        for row in rows:
+            self.rows[row.run_id] = Row(row.run_id, row.memory["chat_history"])
+
+
+class WriteBehindDictStorage(WriteBehindStorage, DictStorage):
+    def write_batch(self, rows):
+        DictStorage.write_batch(self, rows)
+
+
+class AnnouncingCache(SessionCache):
+    def __init__(self):
+        super().__init__(maxsize=16, ttl=60)
+        self.announced = []
+
+    def announce(self, run_id):
+        self.announced.append(run_id)
+
+
+class CachedWriteBehindStorage(SessionCachedStorage, WriteBehindDictStorage):
+    pass
+
+
+def until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.005)
+
+
+class TestWriteBehindStorage:
+    def test_repeated_updates_merge_into_one_write(self):
+        storage = WriteBehindDictStorage(write_behind=True)
+        storage.write_behind.flush_interval = 60
+        row = Row("run-ceo", [])
+        for turn in range(5):
+            row.memory["chat_history"].append(f"turn {turn}")
+            storage.upsert(row)
+        assert storage.transactions == 0
+        # Pending state is what the next run reads
+        assert storage.read("run-ceo").memory["chat_history"] == [f"turn {n}" for n in range(5)]
+
+        assert storage.write_behind.flush() == 1
+        assert storage.transactions == 1
+        assert storage.rows["run-ceo"].memory["chat_history"] == [f"turn {n}" for n in range(5)]
+        stats = storage.write_behind.stats()
+        assert (stats["updates"], stats["merged"], stats["rows_written"]) == (5, 4, 1)
+        storage.write_behind.stop()
+
+    def test_batch_size_triggers_flush(self):
+        storage = WriteBehindDictStorage(write_behind=True)
+        storage.write_behind.flush_interval = 60
+        storage.write_behind.batch_size = 11
+        for seat in range(11):
+            storage.upsert(Row(f"run-{seat}", ["hi"]))
+        until(lambda: len(storage.rows) == 11)
+        assert storage.transactions == 1
+        storage.write_behind.stop()
+
+    def test_timer_flushes(self):
+        storage = WriteBehindDictStorage(write_behind=True)
+        storage.write_behind.flush_interval = 0.01
+        storage.upsert(Row("run-cto", ["hi"]))
+        until(lambda: "run-cto" in storage.rows)
+        storage.write_behind.stop()
+
+    def test_failed_flush_is_retried_and_newer_update_wins(self):
+        storage = WriteBehindDictStorage(write_behind=True)
+        storage.write_behind.flush_interval = 60
+        storage.upsert(Row("run-cso", ["first"]))
+        storage.fail = True
+        assert storage.write_behind.flush() == 0
+        assert storage.write_behind.write_errors == 1
+        storage.upsert(Row("run-cso", ["first", "second"]))
+        storage.fail = False
+        storage.write_behind.stop()
+        assert storage.rows["run-cso"].memory["chat_history"] == ["first", "second"]
+        assert storage.write_behind.pending == 0
+
+    def test_rejected_row_isolated_then_dropped(self):
+        storage = WriteBehindDictStorage(write_behind=True)
+        storage.write_behind.flush_interval = 60
+        storage.write_behind.max_retries = 2
+        for seat in ("CEO", "CRO", "CQO"):
+            storage.upsert(Row(f"run-{seat}", ["hi"]))
+        storage.reject = {"run-CRO"}
+
+        # The batch fails, then every row but the bad one is written on its own
+        assert storage.write_behind.flush() == 2
+        assert set(storage.rows) == {"run-CEO", "run-CQO"}
+        assert storage.write_behind.pending == 1
+        assert storage.write_behind.flush() == 0
+        assert storage.write_behind.pending == 0
+        stats = storage.write_behind.stats()
+        assert (stats["dropped"], stats["write_errors"]) == (1, 2)
+        storage.write_behind.stop()
+
+    def test_unreachable_database_never_drops(self):
+        storage = WriteBehindDictStorage(write_behind=True)
+        storage.write_behind.flush_interval = 60
+        storage.write_behind.max_retries = 1
+        storage.upsert(Row("run-cso", ["hi"]))
+        storage.upsert(Row("run-cro", ["hi"]))
+        storage.fail = True
+        for _ in range(3):
+            assert storage.write_behind.flush() == 0
+        assert storage.transactions == 0
+        assert storage.write_behind.pending == 2
+        storage.fail = False
+        storage.write_behind.stop()
+        assert set(storage.rows) == {"run-cso", "run-cro"}
+
+    def test_full_buffer_writes_through(self):
+        storage = WriteBehindDictStorage(write_behind=True)
+        storage.write_behind.flush_interval = 60
+        storage.write_behind.max_pending = 2
+        for seat in ("CEO", "CRO"):
+            storage.upsert(Row(f"run-{seat}", ["hi"]))
+        # Updates to pending runs still merge
+        storage.upsert(Row("run-CEO", ["hi", "again"]))
+        assert storage.transactions == 0
+        storage.upsert(Row("run-CQO", ["hi"]))
+        assert storage.transactions == 1
+        assert "run-CQO" in storage.rows
+        assert storage.write_behind.stats()["overflows"] == 1
+        storage.write_behind.stop()
+
+    def test_stop_flushes_pending_rows(self):
+        storage = WriteBehindDictStorage(write_behind=True)
+        storage.write_behind.flush_interval = 60
+        for seat in ("CEO", "CRO", "CQO"):
+            storage.upsert(Row(f"run-{seat}", ["hi"]))
+        storage.write_behind.stop()
+        assert set(storage.rows) == {"run-CEO", "run-CRO", "run-CQO"}
+        assert storage.transactions == 1
+
+    def test_disabled_writes_through(self):
+        storage = WriteBehindDictStorage(write_behind=False)
+        storage.upsert(Row("run-cdo", ["hi"]))
+        assert storage.transactions == 1
+        assert storage.write_behind.pending == 0
+
+    def test_concurrent_writers(self):
+        storage = WriteBehindDictStorage(write_behind=True)
+        storage.write_behind.flush_interval = 0.001
+
+        def member(seat):
+            row = Row(f"run-{seat}", [])
+            for turn in range(50):
+                row.memory["chat_history"].append(turn)
+                storage.upsert(row)
+
+        threads = [threading.Thread(target=member, args=(seat,)) for seat in range(11)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        storage.write_behind.stop()
+        assert all(len(row.memory["chat_history"]) == 50 for row in storage.rows.values())
+        assert len(storage.rows) == 11
+
+
+class TestWithSessionCache:
+    def test_announced_after_flush(self):
+        cache = AnnouncingCache()
+        storage = CachedWriteBehindStorage(session_cache=cache, write_behind=True)
+        storage.write_behind.flush_interval = 60
+        storage.upsert(Row("run-ceo", ["hi"]))
+        storage.upsert(Row("run-ceo", ["hi", "again"]))
+        assert cache.announced == []
+        storage.write_behind.stop()
+        assert cache.announced == ["run-ceo"]
+        assert storage.read("run-ceo").memory["chat_history"] == ["hi", "again"]
+
+    def test_dropped_row_leaves_the_cache(self):
+        cache = AnnouncingCache()
+        storage = CachedWriteBehindStorage(session_cache=cache, write_behind=True)
+        storage.write_behind.flush_interval = 60
+        storage.write_behind.max_retries = 1
+        storage.upsert(Row("run-ceo", ["hi"]))
+        storage.reject = {"run-ceo"}
+        storage.write_behind.flush()
+        assert cache.get("run-ceo") is None
+        assert storage.read("run-ceo") is None
+        assert cache.announced == []
+        storage.write_behind.stop()
+
+    def test_overflow_write_is_announced(self):
+        cache = AnnouncingCache()
+        storage = CachedWriteBehindStorage(session_cache=cache, write_behind=True)
+        storage.write_behind.flush_interval = 60
+        storage.write_behind.max_pending = 1
+        storage.upsert(Row("run-ceo", ["hi"]))
+        storage.upsert(Row("run-cro", ["hi"]))
+        assert cache.announced == ["run-cro"]
+        storage.write_behind.stop()
+
+    def test_write_through_announces_immediately(self):
+        cache = AnnouncingCache()
+        storage = CachedWriteBehindStorage(session_cache=cache, write_behind=False)
+        storage.upsert(Row("run-ceo", ["hi"]))
+        assert cache.announced == ["run-ceo"]
+
+
+class TestBuffer:
+    def test_rows_being_written_are_still_readable(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_write(rows):
+            started.set()
+            release.wait(1)
+
+        buffer = WriteBehindBuffer(slow_write, flush_interval=60)
+        buffer.put(Row("run-cxo", ["hi"]))
+        flusher = threading.Thread(target=buffer.flush)
+        flusher.start()
+        started.wait(1)
+        assert buffer.pending == 0
+        assert buffer.get("run-cxo").memory["chat_history"] == ["hi"]
+        release.set()
+        flusher.join()
+        assert buffer.get("run-cxo") is None
+        buffer.stop()
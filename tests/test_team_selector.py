@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from agno_service.workspace.risk_management import RiskCategory
+from agno_service.workspace.team_selector import TeamCache, TeamSelector, smallest_cover, task_requirements
+
+
+class TestTeamSelector:
+    def test_category_members(self):
+        selector = TeamSelector()
+        assert selector.select([RiskCategory.FINANCIAL]) == ("CEO", "CRO")
+        assert selector.select([RiskCategory.TECHNICAL]) == ("CTO", "CSO")
+        assert selector.select([]) == ()
+
+    def test_smallest_qualifying_set(self):
+        selector = TeamSelector()
+        # CSO covers security and one privacy requirement at once
+        assert selector.select([RiskCategory.SECURITY, RiskCategory.PRIVACY]) == ("CSO", "CDO")
+        # CRO covers the financial and privacy requirements it shares
+        assert selector.select([RiskCategory.FINANCIAL, RiskCategory.PRIVACY]) == ("CEO", "CDO", "CRO")
+        assert smallest_cover(frozenset({("CEO", "CPHO"), ("CPHO",)})) == ("CPHO",)
+
+    def test_task_metadata(self):
+        assert task_requirements({"action": "transfer_funds", "context": {"recipient": "external"}}) == (("CCDO",),)
+        assert task_requirements({"requires_verification": True, "members": ["CTO", "CFO"]}) == (("CTO",), ("CQO",))
+        selector = TeamSelector()
+        assert selector.select([RiskCategory.FINANCIAL], {"context": {"recipient": "external"}}) == ("CEO", "CRO", "CCDO")
+
+    def test_metrics_by_team_size(self):
+        selector = TeamSelector()
+        selector.record(("CEO", "CRO"), 1.0, "miss", prompt_tokens=900)
+        selector.record(("CEO", "CRO"), 0.0, "hit")
+        selector.record(("CSO",), 0.5, "miss", prompt_tokens=450)
+        stats = selector.stats()
+        assert stats["runs"] == 3
+        assert stats["mean_team_size"] == 5 / 3
+        assert stats["mean_prompt_tokens"] == 450
+        assert stats["by_size"]["2 members"]["count"] == 2
+        assert stats["teams"] == {"CEO+CRO": 2, "CSO": 1}
+
+
+class TestTeamCache:
+    @pytest.mark.asyncio
+    async def test_one_team_per_member_set(self):
+        builds = []
+
+        async def build(members):
+            builds.append(members)
+            await asyncio.sleep(0.01)
+            return {"agents": members}
+
+        cache = TeamCache(build, maxsize=2)
+        teams = await asyncio.gather(*(cache.get(["CEO", "CRO"]) for _ in range(5)))
+        assert builds == [("CEO", "CRO")]
+        assert all(team is teams[0] for team in teams)
+
+        await cache.get(["CSO"])
+        await cache.get(["CTO", "CSO"])
+        assert len(cache) == 2
+        await cache.get(["CEO", "CRO"])
+        assert builds[-1] == ("CEO", "CRO")
+        assert cache.stats()["builds"] == 4